@@ -7,6 +7,7 @@ import sys
 from dotenv import load_dotenv
 from app.db.base import Base
 from app.db import models
+from app.db.migrations import PROGRESS_TABLE, apply_timeouts
 
 
 load_dotenv()
@@ -35,6 +36,12 @@ else:
 # target_metadata = mymodel.Base.metadata
 target_metadata = Base.metadata
 
+
+def include_name(name, type_, parent_names):
+    # La tabla de progreso de los backfills no forma parte del modelo: autogenerate la ignora
+    return not (type_ == "table" and name == PROGRESS_TABLE)
+
+
 # other values from the config, defined by the needs of env.py,
 # can be acquired:
 # my_important_option = config.get_main_option("my_important_option")
@@ -57,6 +64,8 @@ def run_migrations_offline() -> None:
     context.configure(
         url=url,
         target_metadata=target_metadata,
+        include_name=include_name,
+        transaction_per_migration=True,
         literal_binds=True,
         dialect_opts={"paramstyle": "named"},
     )
@@ -79,8 +88,17 @@ def run_migrations_online() -> None:
     )
 
     with connectable.connect() as connection:
+        # lock_timeout/statement_timeout de sesión: un DDL que no obtiene su lock falla
+        # en segundos en lugar de bloquear todo el tráfico detrás de él
+        apply_timeouts(connection)
+        connection.commit()
         context.configure(
-            connection=connection, target_metadata=target_metadata
+            connection=connection,
+            target_metadata=target_metadata,
+            include_name=include_name,
+            # Los bloques autocommit (índices concurrentes, backfills) confirman lo anterior:
+            # una transacción por migración mantiene cada paso consistente
+            transaction_per_migration=True,
         )
 
         with context.begin_transaction():
@@ -0,0 +1,32 @@
+"""Index for oldest-first listings by author
+
+Revision ID: 5e2a9c7b1d30
+Revises: d83f61b0a2c5
+Create Date: 2026-10-19 14:02:11.508317
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+from app.db.migrations import create_index_concurrently, drop_index_concurrently
+
+
+# revision identifiers, used by Alembic.
+revision: str = '5e2a9c7b1d30'
+down_revision: Union[str, None] = 'd83f61b0a2c5'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    # `published_at ASC` deja los borradores al final en PostgreSQL: no es el
+    # inverso de los índices `DESC NULLS LAST`, así que necesita el suyo.
+    create_index_concurrently(
+        'ix_articles_author_published_at_id_asc', 'articles', ['author', 'published_at', 'id']
+    )
+
+
+def downgrade() -> None:
+    drop_index_concurrently('ix_articles_author_published_at_id_asc', 'articles')
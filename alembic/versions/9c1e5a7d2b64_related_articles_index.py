@@ -0,0 +1,44 @@
+"""Related articles index
+
+Revision ID: 9c1e5a7d2b64
+Revises: 4b7d00a73940
+Create Date: 2026-10-19 09:12:37.518204
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+from app.db.migrations import create_index_concurrently, drop_index_concurrently
+
+
+# revision identifiers, used by Alembic.
+revision: str = '9c1e5a7d2b64'
+down_revision: Union[str, None] = '4b7d00a73940'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_table('article_tags',
+    sa.Column('tag', sa.String(length=255), nullable=False),
+    sa.Column('article_id', sa.Integer(), nullable=False),
+    sa.PrimaryKeyConstraint('tag', 'article_id')
+    )
+    create_index_concurrently('ix_article_tags_article_id', 'article_tags', ['article_id'])
+    op.create_table('article_related',
+    sa.Column('article_id', sa.Integer(), nullable=False),
+    sa.Column('related_id', sa.Integer(), nullable=False),
+    sa.Column('score', sa.Float(), nullable=False),
+    sa.PrimaryKeyConstraint('article_id', 'related_id')
+    )
+    create_index_concurrently('ix_article_related_related_id', 'article_related', ['related_id'])
+    # Las listas se calculan después con `python -m app.repositories.related_repository rebuild`
+
+
+def downgrade() -> None:
+    drop_index_concurrently('ix_article_related_related_id', 'article_related')
+    op.drop_table('article_related')
+    drop_index_concurrently('ix_article_tags_article_id', 'article_tags')
+    op.drop_table('article_tags')
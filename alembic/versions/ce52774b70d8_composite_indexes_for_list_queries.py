@@ -0,0 +1,54 @@
+"""Composite and partial indexes for list queries
+
+Revision ID: ce52774b70d8
+Revises: f7ece1ec70a6
+Create Date: 2026-10-19 04:55:12.318204
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+from app.db.migrations import create_index_concurrently, drop_index_concurrently
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'ce52774b70d8'
+down_revision: Union[str, None] = 'f7ece1ec70a6'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    # CREATE/DROP INDEX CONCURRENTLY se ejecuta fuera de la transacción y no
+    # bloquea las escrituras sobre `articles` mientras se construye el índice.
+    create_index_concurrently(
+        'ix_articles_author_published_at_id',
+        'articles',
+        ['author', sa.text('published_at DESC NULLS LAST'), sa.text('id DESC')],
+    )
+    create_index_concurrently(
+        'ix_articles_published_at_id',
+        'articles',
+        [sa.text('published_at DESC NULLS LAST'), sa.text('id DESC')],
+    )
+    create_index_concurrently(
+        'ix_articles_published_at_id_published',
+        'articles',
+        [sa.text('published_at DESC NULLS LAST'), sa.text('id DESC')],
+        postgresql_where=sa.text('published_at IS NOT NULL'),
+    )
+    # Redundantes: la PK ya indexa `id` y los índices compuestos cubren los prefijos
+    drop_index_concurrently('ix_articles_id', 'articles')
+    drop_index_concurrently('ix_articles_author', 'articles')
+    drop_index_concurrently('ix_articles_published_at', 'articles')
+
+
+def downgrade() -> None:
+    create_index_concurrently('ix_articles_published_at', 'articles', ['published_at'])
+    create_index_concurrently('ix_articles_author', 'articles', ['author'])
+    create_index_concurrently('ix_articles_id', 'articles', ['id'])
+    drop_index_concurrently('ix_articles_published_at_id_published', 'articles')
+    drop_index_concurrently('ix_articles_published_at_id', 'articles')
+    drop_index_concurrently('ix_articles_author_published_at_id', 'articles')
@@ -0,0 +1,42 @@
+"""Near-duplicate MinHash index
+
+Revision ID: d83f61b0a2c5
+Revises: 9c1e5a7d2b64
+Create Date: 2026-10-19 11:03:52.641870
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+from app.db.migrations import create_index_concurrently, drop_index_concurrently
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'd83f61b0a2c5'
+down_revision: Union[str, None] = '9c1e5a7d2b64'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_table('article_minhash',
+    sa.Column('article_id', sa.Integer(), nullable=False),
+    sa.Column('signature', sa.LargeBinary(), nullable=False),
+    sa.PrimaryKeyConstraint('article_id')
+    )
+    op.create_table('article_lsh_buckets',
+    sa.Column('band', sa.SmallInteger(), nullable=False),
+    sa.Column('bucket', sa.BigInteger(), nullable=False),
+    sa.Column('article_id', sa.Integer(), nullable=False),
+    sa.PrimaryKeyConstraint('band', 'bucket', 'article_id')
+    )
+    create_index_concurrently('ix_article_lsh_buckets_article_id', 'article_lsh_buckets', ['article_id'])
+    # Las firmas de los artículos existentes se calculan con `python -m app.repositories.duplicate_repository rebuild`
+
+
+def downgrade() -> None:
+    drop_index_concurrently('ix_article_lsh_buckets_article_id', 'article_lsh_buckets')
+    op.drop_table('article_lsh_buckets')
+    op.drop_table('article_minhash')
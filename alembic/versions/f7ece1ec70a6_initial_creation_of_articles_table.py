@@ -10,6 +10,8 @@ from typing import Sequence, Union
 from alembic import op
 import sqlalchemy as sa
 
+from app.db.migrations import create_index_concurrently, drop_index_concurrently
+
 
 # revision identifiers, used by Alembic.
 revision: str = 'f7ece1ec70a6'
@@ -32,16 +34,16 @@ def upgrade() -> None:
     sa.PrimaryKeyConstraint('id'),
     sa.UniqueConstraint('title', 'author', name='uix_title_author')
     )
-    op.create_index('ix_articles_author', 'articles', ['author'], unique=False)
-    op.create_index(op.f('ix_articles_id'), 'articles', ['id'], unique=False)
-    op.create_index('ix_articles_published_at', 'articles', ['published_at'], unique=False)
     # ### end Alembic commands ###
+    create_index_concurrently('ix_articles_author', 'articles', ['author'])
+    create_index_concurrently(op.f('ix_articles_id'), 'articles', ['id'])
+    create_index_concurrently('ix_articles_published_at', 'articles', ['published_at'])
 
 
 def downgrade() -> None:
+    drop_index_concurrently('ix_articles_published_at', 'articles')
+    drop_index_concurrently(op.f('ix_articles_id'), 'articles')
+    drop_index_concurrently('ix_articles_author', 'articles')
     # ### commands auto generated by Alembic - please adjust! ###
-    op.drop_index('ix_articles_published_at', table_name='articles')
-    op.drop_index(op.f('ix_articles_id'), table_name='articles')
-    op.drop_index('ix_articles_author', table_name='articles')
     op.drop_table('articles')
     # ### end Alembic commands ###
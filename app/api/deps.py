@@ -1,3 +1,4 @@
+import logging
 from typing import Generator
 from fastapi import Depends, HTTPException, status, Header, Request
 from fastapi.responses import JSONResponse
@@ -5,8 +6,13 @@ from sqlalchemy.orm import Session
 from redis.exceptions import RedisError
 
 from app.db.session import SessionLocal
+from app.db.routing import reader_session
 from app.core.config import settings
-from app.cache.redis_wrapper import redis_client # Usamos el cliente ya configurado
+from app.core.logging_config import sampled
+from app.core.metrics import RATE_LIMIT_REJECTIONS
+from app.cache import redis_wrapper # Usamos el cliente ya configurado
+
+logger = logging.getLogger(__name__)
 
 def get_db() -> Generator[Session, None, None]:
     """
@@ -25,6 +31,25 @@ def get_db() -> Generator[Session, None, None]:
         db.close()
 
 
+def get_read_db() -> Generator[Session, None, None]:
+    """
+    Proporciona una sesión de solo lectura para las rutas GET.
+
+    La sesión apunta a la réplica de lectura si está configurada
+    (`DATABASE_REPLICA_URL`), salvo que el cliente haya escrito recientemente y
+    la réplica todavía no refleje su escritura: en ese caso se usa el primario
+    (consistencia read-your-writes, ver `app.db.routing`).
+
+    Yields:
+        Session: Una sesión activa de SQLAlchemy para lecturas.
+    """
+    db = reader_session()
+    try:
+        yield db
+    finally:
+        db.close()
+
+
 def require_api_key(x_api_key: str | None = Header(None, alias="X-API-Key")):
     """
     Valida la API key proporcionada en la cabecera de la petición.
@@ -63,12 +88,13 @@ async def rate_limiter(request: Request, call_next):
 
     try:
         # Usamos una pipeline para asegurar que INCR y EXPIRE sean atómicos
-        p = redis_client.pipeline()
+        p = redis_wrapper.client_for(key).pipeline()
         p.incr(key)
         p.expire(key, settings.RATE_LIMIT_WINDOW)
         request_count = p.execute()[0]
 
         if request_count > settings.RATE_LIMIT_MAX_REQUESTS:
+            RATE_LIMIT_REJECTIONS.inc()
             # SOLUCIÓN: Devolver una JSONResponse en lugar de lanzar una excepción
             return JSONResponse(
                 status_code=status.HTTP_429_TOO_MANY_REQUESTS,
@@ -76,9 +102,10 @@ async def rate_limiter(request: Request, call_next):
             )
 
     except RedisError:
-        # Si Redis falla, simplemente registramos el error y continuamos
-        # sin aplicar el rate limiting.
-        print("RedisError: Skipping rate limiting.")
+        # Si Redis falla, registramos el error (muestreado, ya que se repite en
+        # cada petición mientras dure la caída) y continuamos sin rate limiting.
+        if sampled(settings.LOG_HOT_PATH_SAMPLE_RATE):
+            logger.warning("Redis unavailable, skipping rate limiting", exc_info=True)
 
     # Si todo está bien, pasamos la petición al siguiente manejador
     response = await call_next(request)
@@ -0,0 +1,30 @@
+from fastapi import APIRouter, Depends, Query
+from sqlalchemy.orm import Session
+from app.api import deps
+from app.core.config import settings
+from app.services.article_service import ArticleService
+
+router = APIRouter(prefix="/admin", tags=["Admin"])
+
+
+@router.post("/cache/warm", summary="Prewarm the article cache")
+def warm_cache(
+    top_n: int = Query(settings.HOT_KEY_TOP_N, ge=1, le=10000, description="Number of hottest articles to load"),
+    db: Session = Depends(deps.get_read_db),
+):
+    """
+    Load the hottest articles into the Redis cache.
+
+    The articles are ranked by the sampled access counts collected in
+    `ArticleService.get_article` and loaded with a single database query and
+    a single Redis pipeline.
+
+    Args:
+        top_n (int): Number of hottest articles to load.
+        db (Session): Read session dependency.
+
+    Returns:
+        dict: The number of articles written to the cache.
+    """
+    service = ArticleService(db)
+    return {"warmed": service.warm_cache(top_n)}
@@ -1,15 +1,27 @@
 from fastapi import APIRouter, Depends, Query, status, Response, HTTPException
 from sqlalchemy.orm import Session
+from datetime import datetime
 from typing import List, Optional
 from app.api import deps
 from app.services.article_service import ArticleService
 from app.repositories.article_repository import ArticleRepository
-from app.schemas.article_schema import ArticleCreate, ArticleUpdate, ArticleOut
+from app.repositories.facet_repository import FACET_FIELDS
+from app.core.config import settings
+from app.schemas.article_schema import (
+    ArticleBulkImport,
+    ArticleCreate,
+    ArticleCreated,
+    ArticleFacets,
+    ArticleOut,
+    ArticleUpdate,
+    BulkImportResult,
+    RelatedArticle,
+)
 
 router = APIRouter(prefix="/articles", tags=["Articles"])
 
 
-@router.post("/", response_model=ArticleOut, status_code=status.HTTP_201_CREATED, summary="Create a new article")
+@router.post("/", response_model=ArticleCreated, status_code=status.HTTP_201_CREATED, summary="Create a new article")
 def create_article(payload: ArticleCreate, db: Session = Depends(deps.get_db)):
     """
     Create a new article.
@@ -17,20 +29,125 @@ def create_article(payload: ArticleCreate, db: Session = Depends(deps.get_db)):
     This endpoint:
       - Validates the input payload.
       - Ensures that the combination of `title` and `author` is unique.
+      - Looks for near duplicates (MinHash/LSH over title and body). Depending
+        on `DUPLICATE_CHECK_MODE` they are listed in `near_duplicates` (`warn`)
+        or the article is refused with a 409 listing them (`reject`).
 
     Args:
         payload (ArticleCreate): Article data for creation.
         db (Session): SQLAlchemy database session dependency.
 
     Returns:
-        ArticleOut: The newly created article.
+        ArticleCreated: The newly created article and its near duplicates.
     """
     service = ArticleService(db)
     return service.create_article(payload)
 
 
+@router.post("/bulk", response_model=BulkImportResult, summary="Import many articles")
+def import_articles(payload: ArticleBulkImport, db: Session = Depends(deps.get_db)):
+    """
+    Import up to 1000 articles in a single transaction.
+
+    Each article is checked like in `POST /articles`, including against the
+    articles earlier in the same request. Duplicates (and, in `reject` mode,
+    near duplicates) are skipped and reported instead of failing the import.
+
+    Args:
+        payload (ArticleBulkImport): The articles to import.
+        db (Session): SQLAlchemy database session dependency.
+
+    Returns:
+        BulkImportResult: Created articles and skipped ones with the reason.
+    """
+    service = ArticleService(db)
+    return service.import_articles(payload.articles)
+
+
+@router.get("/search", response_model=List[ArticleOut], summary="Search articles")
+def search_articles(
+    q: str = Query(..., min_length=2, description="Text to search in title or body"),
+    db: Session = Depends(deps.get_read_db)
+):
+    """
+    PLUS: Basic article search endpoint.
+
+    Performs a case-insensitive search (`ILIKE`) in both the `title` and `body`
+    fields of the articles.
+
+    Args:
+        q (str): The text query to search for.
+        db (Session): The database session dependency.
+
+    Returns:
+        List[ArticleOut]: A list of articles matching the search query.
+
+    Raises:
+        HTTPException: If no articles match the given search query.
+    """
+    repo = ArticleRepository()
+    results = db.query(repo.model).filter(
+        (repo.model.title.ilike(f"%{q}%")) | (repo.model.body.ilike(f"%{q}%"))
+    ).all()
+
+    if not results:
+        raise HTTPException(status_code=404, detail="No articles found matching the query.")
+
+    return results
+
+
+@router.get("/facets", response_model=ArticleFacets, summary="Facet counts per tag and author")
+def article_facets(
+    db: Session = Depends(deps.get_read_db),
+    fields: str = Query("tags,author", description="Comma-separated facet fields: tags, author"),
+    size: int = Query(20, ge=1, le=1000, description="Maximum values returned per facet"),
+    tag: Optional[str] = Query(None, description="Filter by tag"),
+    author: Optional[str] = Query(None, description="Filter by author"),
+    published_after: Optional[datetime] = Query(None, description="Only articles published at or after this date"),
+    published_before: Optional[datetime] = Query(None, description="Only articles published before this date"),
+):
+    """
+    Count the articles per tag and per author, with the list filters applied.
+
+    Unfiltered and author-filtered counts are read from counters maintained
+    on every write; other filters are aggregated on demand.
+
+    Args:
+        db (Session): Read session dependency.
+        fields (str): Facet fields to compute, comma-separated.
+        size (int): Maximum number of values per facet, most frequent first.
+        tag (Optional[str]): Filter by tag.
+        author (Optional[str]): Filter by author name.
+        published_after (Optional[datetime]): Lower bound (inclusive) of `published_at`.
+        published_before (Optional[datetime]): Upper bound (exclusive) of `published_at`.
+
+    Returns:
+        ArticleFacets: Total matching articles and the counts per facet value.
+
+    Raises:
+        HTTPException: If an unknown facet field is requested.
+    """
+    requested = [field.strip() for field in fields.split(",") if field.strip()]
+    unknown = sorted(set(requested) - set(FACET_FIELDS))
+    if not requested or unknown:
+        raise HTTPException(
+            status_code=status.HTTP_422_UNPROCESSABLE_ENTITY,
+            detail=f"Unsupported facet fields: {', '.join(unknown) or fields!r}. Allowed: {', '.join(FACET_FIELDS)}.",
+        )
+    total, facets, source = ArticleRepository().facet_counts(
+        db,
+        fields=list(dict.fromkeys(requested)),
+        size=size,
+        tag=tag,
+        author=author,
+        published_after=published_after,
+        published_before=published_before,
+    )
+    return ArticleFacets(total=total, facets=facets, source=source)
+
+
 @router.get("/{article_id}", response_model=ArticleOut, summary="Get an article by ID")
-def get_article(article_id: int, db: Session = Depends(deps.get_db)):
+def get_article(article_id: int, db: Session = Depends(deps.get_read_db)):
     """
     Retrieve a single article by its ID.
 
@@ -40,7 +157,7 @@ def get_article(article_id: int, db: Session = Depends(deps.get_db)):
 
     Args:
         article_id (int): Unique identifier of the article.
-        db (Session): SQLAlchemy database session dependency.
+        db (Session): Read session (replica unless the client must read its own writes).
 
     Returns:
         ArticleOut: The requested article data.
@@ -52,6 +169,35 @@ def get_article(article_id: int, db: Session = Depends(deps.get_db)):
     return service.get_article(article_id)
 
 
+@router.get("/{article_id}/related", response_model=List[RelatedArticle], summary="Get related articles")
+def related_articles(
+    article_id: int,
+    k: int = Query(5, ge=1, le=settings.RELATED_INDEX_SIZE, description="Number of related articles"),
+    db: Session = Depends(deps.get_read_db),
+):
+    """
+    Retrieve the articles most related to a given article.
+
+    Related articles are ranked by tag overlap (Jaccard similarity) with a
+    boost for the same author. They are read from an index precomputed on
+    every write and cached per article, so latency does not depend on the
+    number of articles.
+
+    Args:
+        article_id (int): Unique identifier of the article.
+        k (int): Number of related articles to return.
+        db (Session): Read session dependency.
+
+    Returns:
+        List[RelatedArticle]: Related articles, most related first.
+
+    Raises:
+        HTTPException: If the article does not exist.
+    """
+    service = ArticleService(db)
+    return service.get_related(article_id, k)
+
+
 @router.put("/{article_id}", response_model=ArticleOut, summary="Update an article")
 def update_article(article_id: int, payload: ArticleUpdate, db: Session = Depends(deps.get_db)):
     """
@@ -75,46 +221,15 @@ def update_article(article_id: int, payload: ArticleUpdate, db: Session = Depend
     service = ArticleService(db)
     return service.update_article(article_id, payload)
 
-@router.get("/search", response_model=List[ArticleOut], summary="Search articles")
-def search_articles(
-    q: str = Query(..., min_length=2, description="Text to search in title or body"),
-    db: Session = Depends(deps.get_db)
-):
-    """
-    PLUS: Basic article search endpoint.
-
-    Performs a case-insensitive search (`ILIKE`) in both the `title` and `body`
-    fields of the articles.
-
-    Args:
-        q (str): The text query to search for.
-        db (Session): The database session dependency.
-
-    Returns:
-        List[ArticleOut]: A list of articles matching the search query.
-
-    Raises:
-        HTTPException: If no articles match the given search query.
-    """
-    repo = ArticleRepository()
-    results = db.query(repo.model).filter(
-        (repo.model.title.ilike(f"%{q}%")) | (repo.model.body.ilike(f"%{q}%"))
-    ).all()
-
-    if not results:
-        raise HTTPException(status_code=404, detail="No articles found matching the query.")
-
-    return results
-
-
-
 @router.get("/", response_model=List[ArticleOut], summary="List all articles")
 def list_articles(
-    db: Session = Depends(deps.get_db),
+    db: Session = Depends(deps.get_read_db),
     skip: int = Query(0, ge=0),
     limit: int = Query(20, ge=1, le=100),
     tag: Optional[str] = Query(None, description="Filter by tag"),
     author: Optional[str] = Query(None, description="Filter by author"),
+    published_after: Optional[datetime] = Query(None, description="Only articles published at or after this date"),
+    published_before: Optional[datetime] = Query(None, description="Only articles published before this date"),
     sort_order: str = Query("desc", pattern="^(asc|desc)$")
 ):
     """
@@ -122,7 +237,7 @@ def list_articles(
 
     This endpoint provides:
       - **Pagination** via `skip` and `limit`.
-      - **Filtering** by `tag` and `author`.
+      - **Filtering** by `tag`, `author` and publication date range.
       - **Sorting** by `published_at` in ascending or descending order.
 
     Args:
@@ -131,6 +246,8 @@ def list_articles(
         limit (int): Maximum number of records to return (default: 20).
         tag (Optional[str]): Filter results by tag.
         author (Optional[str]): Filter results by author name.
+        published_after (Optional[datetime]): Lower bound (inclusive) of `published_at`.
+        published_before (Optional[datetime]): Upper bound (exclusive) of `published_at`.
         sort_order (str): Sorting order, either "asc" or "desc".
 
     Returns:
@@ -138,7 +255,14 @@ def list_articles(
     """
     repo = ArticleRepository()
     articles, _ = repo.list(
-        db, skip=skip, limit=limit, tag=tag, author=author, sort_order=sort_order
+        db,
+        skip=skip,
+        limit=limit,
+        tag=tag,
+        author=author,
+        sort_order=sort_order,
+        published_after=published_after,
+        published_before=published_before,
     )
     return articles or []  # nunca lanzar 404, devuelve lista vacía si no hay artículos
 
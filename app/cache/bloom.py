@@ -0,0 +1,308 @@
+import argparse
+import hashlib
+import logging
+import math
+import threading
+from datetime import datetime, timedelta, timezone
+from typing import Iterable, List, Optional, Tuple
+
+from redis import Redis, RedisError
+from sqlalchemy import select
+from sqlalchemy.orm import Session
+
+from app.cache.redis_wrapper import get_redis_client
+from app.core.config import settings
+from app.core.metrics import CACHE_ERRORS
+from app.core.tracing import trace_methods
+from app.db.models import Article
+
+"""
+Existence Bloom filter of article ids.
+
+Crawlers and broken clients walk long ranges of ids that never existed. The
+negative cache entries of `CacheWrapper` only help once an id has been looked
+up; this filter answers "certainly absent" for any id before it reaches the
+database.
+
+The filter is a bitmap of `m` bits in Redis, shared by every worker, sized
+for `BLOOM_FILTER_CAPACITY` ids at a false-positive rate of
+`BLOOM_FILTER_ERROR_RATE`. Each id sets `k` bits derived by double hashing a
+blake2b digest. The keys are versioned by `m` and `k`
+(`{article:bloom}:<m>:<k>`), so changing the capacity or the error rate
+starts a new filter instead of reading the old bitmap with other positions.
+A lookup is one pipeline of `GETBIT` commands:
+
+    - any bit unset: the id certainly does not exist (404 without SQL);
+    - all bits set: the id probably exists and the database decides.
+
+Bit `m` is a "built" flag set only by a full rebuild, so a filter that is
+missing, evicted or only partially written is never trusted: lookups then
+report every id as possibly present, and Redis errors do the same.
+
+A rebuild also stores the highest id it loaded (`...:max_id`), and any
+larger id is reported as possibly present. Ids come from a sequence, so
+articles inserted after the rebuild by any path (the API, `datagen`, bulk
+SQL, backfills) are never rejected, even if they were not added. Creates
+through the API still add their id right after the commit; if that fails the
+filter is deleted, and lookups fail open until the next rebuild. Deletes
+cannot clear bits; a deleted id costs one query and is then served by the
+negative cache until the next rebuild drops it. Rebuilds write the bitmap
+into `...:next`, swap it in with `RENAME` together with its `max_id`, and
+re-add the articles created while they ran. They run every
+`BLOOM_FILTER_REBUILD_INTERVAL_SECONDS` and at startup, in one worker at a
+time (a `SET NX` lock, also when the filter is missing), and on demand:
+
+    python -m app.cache.bloom rebuild
+"""
+
+logger = logging.getLogger(__name__)
+
+# Margen para las altas cuya transacción empezó antes de la reconstrucción y para el desfase de relojes
+_REBUILD_OVERLAP = timedelta(minutes=5)
+
+
+def bloom_parameters(capacity: int, error_rate: float) -> Tuple[int, int]:
+    """Bits `m` and hash functions `k` of a filter holding `capacity` ids at `error_rate`."""
+    bits = math.ceil(-capacity * math.log(error_rate) / (math.log(2) ** 2))
+    hashes = max(1, round(bits / capacity * math.log(2)))
+    return bits, hashes
+
+
+def bit_positions(article_id: int, bits: int, hashes: int) -> List[int]:
+    """The `hashes` bit offsets of `article_id` in a filter of `bits` bits."""
+    digest = hashlib.blake2b(str(article_id).encode("ascii"), digest_size=16).digest()
+    h1 = int.from_bytes(digest[:8], "big")
+    h2 = int.from_bytes(digest[8:], "big") | 1
+    return [(h1 + i * h2) % bits for i in range(hashes)]
+
+
+@trace_methods("cache")
+class ArticleBloomFilter:
+    """
+    Redis-backed Bloom filter of existing article ids.
+
+    All keys share the `{article:bloom}` hash tag, so with `REDIS_NODES` the
+    filter and its rebuild keys live on one node.
+    """
+    KEY_PREFIX = "{article:bloom}"
+
+    def __init__(self, capacity: Optional[int] = None, error_rate: Optional[float] = None):
+        self.bits, self.hashes = bloom_parameters(
+            capacity or settings.BLOOM_FILTER_CAPACITY, error_rate or settings.BLOOM_FILTER_ERROR_RATE
+        )
+        self.key = f"{self.KEY_PREFIX}:{self.bits}:{self.hashes}"
+        self.next_key = f"{self.key}:next"
+        self.max_id_key = f"{self.key}:max_id"
+        self.rebuild_lock = f"{self.key}:rebuild"
+
+    @property
+    def built_flag(self) -> int:
+        return self.bits
+
+    def might_contain(self, article_id: int) -> bool:
+        """False only if `article_id` certainly does not exist."""
+        if not settings.BLOOM_FILTER_ENABLED:
+            return True
+        client = get_redis_client(self.key)
+        if not client:
+            CACHE_ERRORS.labels("bloom_check").inc()
+            return True
+        try:
+            pipe = client.pipeline(transaction=False)
+            pipe.get(self.max_id_key)
+            pipe.getbit(self.key, self.built_flag)
+            for position in bit_positions(article_id, self.bits, self.hashes):
+                pipe.getbit(self.key, position)
+            max_id, built, *bits = pipe.execute()
+        except RedisError:
+            CACHE_ERRORS.labels("bloom_check").inc()
+            return True
+        if not built or max_id is None or article_id > int(max_id):
+            return True
+        return all(bits)
+
+    def add(self, article_ids: Iterable[int]) -> None:
+        """
+        Add newly created articles to the filter. If they cannot be added, the
+        filter is deleted so that it stops rejecting ids until it is rebuilt.
+        """
+        if not settings.BLOOM_FILTER_ENABLED:
+            return
+        article_ids = list(article_ids)
+        if not article_ids:
+            return
+        client = get_redis_client(self.key)
+        if not client:
+            CACHE_ERRORS.labels("bloom_add").inc()
+            return
+        try:
+            pipe = client.pipeline(transaction=False)
+            for article_id in article_ids:
+                for position in bit_positions(article_id, self.bits, self.hashes):
+                    pipe.setbit(self.key, position, 1)
+            pipe.execute()
+        except RedisError:
+            CACHE_ERRORS.labels("bloom_add").inc()
+            logger.warning("Bloom filter add failed; dropping the filter until the next rebuild", exc_info=True)
+            self._drop(client)
+
+    def _drop(self, client: Redis) -> None:
+        try:
+            client.delete(self.key, self.max_id_key)
+        except RedisError:
+            CACHE_ERRORS.labels("bloom_add").inc()
+
+    def is_built(self) -> bool:
+        client = get_redis_client(self.key)
+        if not client:
+            return False
+        try:
+            pipe = client.pipeline(transaction=False)
+            pipe.getbit(self.key, self.built_flag)
+            pipe.exists(self.max_id_key)
+            built, has_max_id = pipe.execute()
+        except RedisError:
+            return False
+        return bool(built and has_max_id)
+
+    def rebuild(self, db: Session, batch_size: int = 10000, force: bool = True) -> Optional[int]:
+        """
+        Rebuild the filter from `articles`.
+
+        Args:
+            db (Session): Database session.
+            batch_size (int): Ids read per query.
+            force (bool): Rebuild even if another worker rebuilt the filter
+                (or is rebuilding it) within the last rebuild interval.
+
+        Returns:
+            Optional[int]: Ids added, or None if the rebuild was skipped.
+        """
+        client = get_redis_client(self.key)
+        if not client:
+            CACHE_ERRORS.labels("bloom_rebuild").inc()
+            return None
+        try:
+            locked = client.set(
+                self.rebuild_lock, 1, nx=True, ex=max(1, int(settings.BLOOM_FILTER_REBUILD_INTERVAL_SECONDS))
+            )
+        except RedisError:
+            CACHE_ERRORS.labels("bloom_rebuild").inc()
+            return None
+        if not locked and not force:
+            return None
+
+        started_at = datetime.now(timezone.utc)
+        bitmap = bytearray(self.bits // 8 + 1)
+        added, last_id = 0, 0
+        while True:
+            article_ids = list(db.execute(
+                select(Article.id).where(Article.id > last_id).order_by(Article.id).limit(batch_size)
+            ).scalars())
+            if not article_ids:
+                break
+            for article_id in article_ids:
+                for position in bit_positions(article_id, self.bits, self.hashes):
+                    # Mismo orden de bits que SETBIT: el bit 0 es el más significativo del primer byte
+                    bitmap[position >> 3] |= 0x80 >> (position & 7)
+            added += len(article_ids)
+            last_id = article_ids[-1]
+        bitmap[self.built_flag >> 3] |= 0x80 >> (self.built_flag & 7)
+        db.rollback()
+
+        try:
+            client.set(self.next_key, bytes(bitmap))
+            pipe = client.pipeline(transaction=True)
+            pipe.rename(self.next_key, self.key)
+            pipe.set(self.max_id_key, last_id)
+            pipe.execute()
+        except RedisError:
+            CACHE_ERRORS.labels("bloom_rebuild").inc()
+            logger.warning("Bloom filter rebuild could not be stored", exc_info=True)
+            return None
+
+        # Las altas que escribieron en el filtro anterior durante la reconstrucción se vuelven a añadir
+        self.add(db.execute(
+            select(Article.id).where(Article.created_at >= started_at - _REBUILD_OVERLAP)
+        ).scalars())
+        db.rollback()
+        logger.info("Bloom filter rebuilt with %d article ids", added)
+        return added
+
+
+class BloomFilterRefresher:
+    """
+    Background thread that tries to rebuild the filter at startup and then
+    every `interval` seconds. Across workers, the `SET NX` lock of
+    `ArticleBloomFilter.rebuild` lets one of them do it per interval, even
+    when the filter is missing; `force` is left to the CLI.
+
+    Args:
+        interval (float): Seconds between two rebuild attempts.
+    """
+
+    def __init__(self, interval: float):
+        self.interval = interval
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    def refresh(self) -> Optional[int]:
+        """Rebuild the filter now unless another worker holds the rebuild lock."""
+        from app.db.session import SessionLocal
+
+        bloom = ArticleBloomFilter()
+        db = SessionLocal()
+        try:
+            # Siempre respeta el lock, también sin filtro: los demás workers fallan abiertos hasta que termine
+            return bloom.rebuild(db, force=False)
+        except Exception:
+            logger.exception("Bloom filter rebuild failed")
+            return None
+        finally:
+            db.close()
+
+    def _run(self) -> None:
+        while not self._stop.is_set():
+            self.refresh()
+            self._stop.wait(self.interval)
+
+    def start(self) -> None:
+        """Start the background rebuild thread (no-op if disabled or already running)."""
+        if not settings.BLOOM_FILTER_ENABLED:
+            return
+        if self._thread is not None and self._thread.is_alive():
+            return
+        self._stop.clear()
+        self._thread = threading.Thread(target=self._run, name="bloom-filter-refresher", daemon=True)
+        self._thread.start()
+
+    def stop(self) -> None:
+        """Stop the background rebuild thread."""
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join(timeout=1.0)
+            self._thread = None
+
+
+bloom_refresher = BloomFilterRefresher(settings.BLOOM_FILTER_REBUILD_INTERVAL_SECONDS)
+
+
+def main(argv: Optional[List[str]] = None) -> None:
+    parser = argparse.ArgumentParser(description="Maintain the Redis Bloom filter of existing article ids.")
+    parser.add_argument("command", choices=["rebuild"])
+    parser.parse_args(argv)
+
+    from app.db.session import SessionLocal
+
+    db = SessionLocal()
+    try:
+        added = ArticleBloomFilter().rebuild(db)
+        if added is None:
+            raise SystemExit("Bloom filter rebuild failed: Redis is not available")
+        print(f"Bloom filter rebuilt with {added} article ids")
+    finally:
+        db.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,69 @@
+import bisect
+import hashlib
+from typing import Dict, Generic, Iterable, List, Mapping, Tuple, TypeVar
+
+"""
+Consistent-hash ring with virtual nodes.
+
+Each node is placed on a 64-bit ring at `vnodes` pseudo-random points derived
+from its name; a key belongs to the first point clockwise from its own hash.
+Adding or removing a node therefore only moves the keys of the arcs it gains
+or loses (about 1/N of them), and the virtual nodes keep the share of every
+node close to uniform.
+
+As in Redis Cluster, only the part of a key between the first `{` and the
+following `}` is hashed when present, so related keys can be forced onto the
+same node.
+"""
+
+T = TypeVar("T")
+
+
+def _hash(value: str) -> int:
+    return int.from_bytes(hashlib.md5(value.encode("utf-8")).digest()[:8], "big")
+
+
+def hash_slot_key(key: str) -> str:
+    """Return the part of `key` that is hashed (its `{hash tag}`, if any)."""
+    start = key.find("{")
+    if start != -1:
+        end = key.find("}", start + 1)
+        if end > start + 1:
+            return key[start + 1:end]
+    return key
+
+
+class HashRing(Generic[T]):
+    """
+    Map keys to nodes with consistent hashing.
+
+    Args:
+        nodes (Mapping[str, T]): Node objects by unique name (e.g. Redis clients by URL).
+        vnodes (int): Virtual nodes placed on the ring per node.
+    """
+
+    def __init__(self, nodes: Mapping[str, T], vnodes: int = 160):
+        if not nodes:
+            raise ValueError("HashRing needs at least one node")
+        self.nodes: Dict[str, T] = dict(nodes)
+        points: List[Tuple[int, str]] = sorted(
+            (_hash(f"{name}#{replica}"), name) for name in self.nodes for replica in range(vnodes)
+        )
+        self._hashes = [point for point, _ in points]
+        self._names = [name for _, name in points]
+
+    def node_name(self, key: str) -> str:
+        """Name of the node owning `key`."""
+        index = bisect.bisect(self._hashes, _hash(hash_slot_key(key))) % len(self._hashes)
+        return self._names[index]
+
+    def get(self, key: str) -> T:
+        """Node owning `key`."""
+        return self.nodes[self.node_name(key)]
+
+    def group(self, keys: Iterable[str]) -> Dict[str, List[str]]:
+        """Group `keys` by the name of the node owning them, preserving order."""
+        groups: Dict[str, List[str]] = {}
+        for key in keys:
+            groups.setdefault(self.node_name(key), []).append(key)
+        return groups
@@ -1,22 +1,87 @@
 import json
+import os
+import random
 from redis import Redis, RedisError
-from typing import Optional, Dict, Any
+from typing import Optional, Dict, Any, List
+from app.cache.hash_ring import HashRing
 from app.core.config import settings
+from app.core.metrics import CACHE_HITS, CACHE_MISSES, CACHE_ERRORS, CACHE_NEGATIVE_HITS
+from app.core.profiling import redis_connection_class, serialization_timer
+from app.core.tracing import TracedRedis, trace_methods
 
-# Cliente de Redis inicializado desde la URL de configuración.
-redis_client = Redis.from_url(settings.REDIS_URL, decode_responses=True)
+# Cliente de Redis inicializado desde la URL de configuración en el primer uso.
+redis_client: Optional[Redis] = None
+# Con `REDIS_NODES`, anillo de hashing consistente sobre un cliente por nodo.
+redis_ring: Optional[HashRing[Redis]] = None
+# Devuelto por `CacheWrapper.get` cuando la caché sabe que el artículo no existe.
+MISSING = object()
 
-def get_redis_client() -> Optional[Redis]:
+
+def _new_client(url: str) -> Redis:
+    return TracedRedis.from_url(url, decode_responses=True, connection_class=redis_connection_class(url))
+
+
+def client() -> Redis:
     """
-    Devuelve el cliente Redis si está disponible, de lo contrario None.
+    Devuelve el cliente Redis global, creándolo en la primera llamada.
+    No abre ninguna conexión: el pool conecta en el primer comando.
+    """
+    global redis_client
+    if redis_client is None:
+        redis_client = _new_client(settings.REDIS_URL)
+    return redis_client
+
+
+def ring() -> Optional[HashRing[Redis]]:
+    """
+    Devuelve el anillo de nodos Redis si `REDIS_NODES` está configurado
+    (creándolo en la primera llamada), o None con un único nodo.
+    """
+    global redis_ring
+    if redis_ring is None and settings.REDIS_NODES:
+        urls = [url.strip() for url in settings.REDIS_NODES.split(",") if url.strip()]
+        redis_ring = HashRing({url: _new_client(url) for url in urls}, settings.REDIS_VIRTUAL_NODES)
+    return redis_ring
+
+
+def client_for(key: str) -> Redis:
+    """Devuelve el cliente del nodo Redis responsable de `key`."""
+    nodes = ring()
+    return nodes.get(key) if nodes else client()
+
+
+def all_clients() -> Dict[str, Redis]:
+    """Devuelve todos los clientes Redis configurados, por nombre de nodo."""
+    nodes = ring()
+    return dict(nodes.nodes) if nodes else {settings.REDIS_URL: client()}
+
+
+def _reset_after_fork() -> None:
+    # Cada proceso hijo abre sus propias conexiones; nunca reutiliza las del padre
+    clients = list(redis_ring.nodes.values()) if redis_ring is not None else []
+    if redis_client is not None:
+        clients.append(redis_client)
+    for node in clients:
+        node.connection_pool.reset()
+
+
+os.register_at_fork(after_in_child=_reset_after_fork)
+
+
+def get_redis_client(key: Optional[str] = None) -> Optional[Redis]:
+    """
+    Devuelve el cliente Redis (el del nodo de `key`, si se indica) si está
+    disponible, de lo contrario None. La caída de un nodo solo afecta a sus claves.
     """
     try:
-        redis_client.ping()
-        return redis_client
+        redis = client_for(key) if key is not None else client()
+        redis.ping()
+        return redis
     except RedisError:
         # Redis no disponible
         return None
 
+@trace_methods("cache")
 class CacheWrapper:
     """
     Redis cache client and wrapper for the Article service.
@@ -28,50 +93,281 @@ class CacheWrapper:
 
     Attributes:
         redis_client (Redis):
-            A global Redis client instance initialized using the configured URL.
+            A global Redis client instance initialized from the configured URL
+            on first use (see `client()`).
 
     Classes:
         CacheWrapper:
             Provides simple methods for interacting with Redis, including:
-                - get(article_id): Retrieve a cached article by ID.
+                - get(article_id): Retrieve a cached article by ID (`MISSING`
+                  if a negative entry records that it does not exist).
+                - set_missing(article_id): Store a short-lived negative entry.
+                - exists(article_id): Check whether `get` would answer from
+                  the cache (an article or a negative entry, not a fence).
                 - set(article_id, data): Store an article with a defined TTL.
-                - invalidate(article_id): Remove a cached article by ID.
+                - invalidate(article_id): Remove a cached article by ID (or
+                  fence it, see below).
+                - invalidate_many(article_ids): Remove or fence several
+                  articles, one round trip per node.
+                - set_many(items): Store several articles in one pipeline
+                  (optionally only where no entry exists, like `set`).
+                - track_access(article_id): Sampled access counting for hot keys.
+                - top_hot(n) / is_hot(article_id): Query the hottest articles.
+                - get_related / set_related / invalidate_related: Cached
+                  related-article lists.
+
+    Hot-key tracking:
+        Accesses are sampled (`HOT_KEY_SAMPLE_RATE`) and counted in the
+        `{article:hot}` sorted set. At most once per `HOT_KEY_DECAY_INTERVAL_SECONDS`
+        (coordinated across workers through a `SET NX` marker) all scores are
+        multiplied by `HOT_KEY_DECAY_FACTOR` and negligible ones pruned, so the
+        ranking follows recent traffic. Scores below `HOT_KEY_MIN_SCORE` are pruned.
+
+    Negative entries:
+        A lookup of a nonexistent article stores the JSON `null` under its own
+        `article:{id}` key for `NEGATIVE_CACHE_TTL_SECONDS`, so repeated
+        lookups of the id are answered by the same single `GET` as a hit.
+        Creating the article overwrites or invalidates the entry.
 
+    Fences:
+        With a read replica, a read that misses the cache right after a write
+        may still see the old row. Writes can therefore leave a `fence` entry
+        for the replica lag (`invalidate(..., fence_seconds=...)`), read as a
+        miss, and the read path fills the cache only with `SET NX`
+        (`only_if_absent`, also for the batch fills of `set_many`), so a
+        lagging read never replaces a fence, a negative entry or fresher data.
+
+    Sharding:
+        With `REDIS_NODES`, keys are spread over several Redis nodes by a
+        consistent-hash ring (`app.cache.hash_ring`). Every key is served by
+        its own node, batches are pipelined per node, and an unreachable node
+        only turns its own keys into misses. The hot-key set and its decay
+        marker share the `{article:hot}` hash tag, so they stay on one node.
     """
+    NEGATIVE_ENTRY = "null"
+    FENCE_ENTRY = "fence"
+    HOT_KEYS_KEY = "{article:hot}"
+    HOT_KEYS_DECAY_MARKER = "{article:hot}:decay"
+
     @staticmethod
     def _get_article_key(article_id: int) -> str:
         return f"article:{article_id}"
 
+    @staticmethod
+    def _get_related_key(article_id: int) -> str:
+        return f"article:{article_id}:related"
+
     def get(self, article_id: int) -> Optional[Dict[str, Any]]:
-        client = get_redis_client()
+        key = self._get_article_key(article_id)
+        client = get_redis_client(key)
         if not client:
+            CACHE_ERRORS.labels("get").inc()
             return None
         try:
-            cached_data = client.get(self._get_article_key(article_id))
+            cached_data = client.get(key)
+            if cached_data == self.NEGATIVE_ENTRY:
+                CACHE_NEGATIVE_HITS.inc()
+                return MISSING
+            if cached_data == self.FENCE_ENTRY:
+                CACHE_MISSES.inc()
+                return None
             if cached_data:
-                return json.loads(cached_data)
+                CACHE_HITS.inc()
+                with serialization_timer():
+                    return json.loads(cached_data)
         except RedisError:
+            CACHE_ERRORS.labels("get").inc()
             return None
+        CACHE_MISSES.inc()
         return None
 
-    def set(self, article_id: int, data: Dict[str, Any]) -> None:
-        client = get_redis_client()
+    def exists(self, article_id: int) -> bool:
+        """
+        Whether `get` would answer without the database: a cached article or a
+        negative entry, not a fence. A single command, without the `PING` of
+        `get_redis_client` (used by admission control under load).
+        """
+        key = self._get_article_key(article_id)
+        try:
+            # Los primeros bytes bastan para distinguir la valla de un artículo o una entrada negativa
+            head = client_for(key).getrange(key, 0, len(self.FENCE_ENTRY))
+        except RedisError:
+            return False
+        return bool(head) and head != self.FENCE_ENTRY
+
+    def set(self, article_id: int, data: Dict[str, Any], only_if_absent: bool = False) -> None:
+        key = self._get_article_key(article_id)
+        client = get_redis_client(key)
         if not client:
+            CACHE_ERRORS.labels("set").inc()
             return
+        with serialization_timer():
+            payload = json.dumps(data, default=str)
         try:
             client.set(
-                self._get_article_key(article_id),
-                json.dumps(data, default=str),
-                ex=settings.CACHE_TTL_SECONDS
+                key,
+                payload,
+                ex=settings.CACHE_TTL_SECONDS,
+                nx=only_if_absent,
             )
         except RedisError:
-            pass
+            CACHE_ERRORS.labels("set").inc()
 
-    def invalidate(self, article_id: int) -> None:
-        client = get_redis_client()
+    def set_missing(self, article_id: int, only_if_absent: bool = False, ttl: Optional[int] = None) -> None:
+        key = self._get_article_key(article_id)
+        client = get_redis_client(key)
         if not client:
+            CACHE_ERRORS.labels("set_missing").inc()
             return
         try:
-            client.delete(self._get_article_key(article_id))
+            client.set(key, self.NEGATIVE_ENTRY, ex=ttl or settings.NEGATIVE_CACHE_TTL_SECONDS, nx=only_if_absent)
         except RedisError:
-            pass
\ No newline at end of file
+            CACHE_ERRORS.labels("set_missing").inc()
+
+    def set_many(self, items: Dict[int, Dict[str, Any]], only_if_absent: bool = False) -> None:
+        if not items:
+            return
+        with serialization_timer():
+            payloads = {
+                self._get_article_key(article_id): json.dumps(data, default=str) for article_id, data in items.items()
+            }
+        nodes = ring()
+        groups = nodes.group(payloads) if nodes else {settings.REDIS_URL: list(payloads)}
+        # Una pipeline por nodo; un nodo caído solo pierde su parte del lote
+        for node_keys in groups.values():
+            client = get_redis_client(node_keys[0])
+            if not client:
+                CACHE_ERRORS.labels("set_many").inc()
+                continue
+            try:
+                pipe = client.pipeline(transaction=False)
+                for key in node_keys:
+                    pipe.set(key, payloads[key], ex=settings.CACHE_TTL_SECONDS, nx=only_if_absent)
+                pipe.execute()
+            except RedisError:
+                CACHE_ERRORS.labels("set_many").inc()
+
+    def track_access(self, article_id: int) -> None:
+        if random.random() >= settings.HOT_KEY_SAMPLE_RATE:
+            return
+        client = get_redis_client(self.HOT_KEYS_KEY)
+        if not client:
+            return
+        try:
+            pipe = client.pipeline(transaction=False)
+            pipe.zincrby(self.HOT_KEYS_KEY, 1, str(article_id))
+            pipe.set(self.HOT_KEYS_DECAY_MARKER, 1, nx=True, ex=settings.HOT_KEY_DECAY_INTERVAL_SECONDS)
+            _, decay_due = pipe.execute()
+            if decay_due:
+                self.decay_hot_keys(client)
+        except RedisError:
+            CACHE_ERRORS.labels("track_access").inc()
+
+    def decay_hot_keys(self, client: Redis) -> None:
+        pipe = client.pipeline(transaction=True)
+        pipe.zunionstore(self.HOT_KEYS_KEY, {self.HOT_KEYS_KEY: settings.HOT_KEY_DECAY_FACTOR})
+        pipe.zremrangebyscore(self.HOT_KEYS_KEY, "-inf", f"({settings.HOT_KEY_MIN_SCORE}")
+        pipe.execute()
+
+    def top_hot(self, n: int) -> List[int]:
+        client = get_redis_client(self.HOT_KEYS_KEY)
+        if not client or n <= 0:
+            return []
+        try:
+            return [int(member) for member in client.zrevrange(self.HOT_KEYS_KEY, 0, n - 1)]
+        except RedisError:
+            CACHE_ERRORS.labels("top_hot").inc()
+            return []
+
+    def is_hot(self, article_id: int) -> bool:
+        client = get_redis_client(self.HOT_KEYS_KEY)
+        if not client:
+            return False
+        try:
+            rank = client.zrevrank(self.HOT_KEYS_KEY, str(article_id))
+        except RedisError:
+            return False
+        return rank is not None and rank < settings.HOT_KEY_TOP_N
+
+    def invalidate(self, article_id: int, fence_seconds: int = 0) -> None:
+        key = self._get_article_key(article_id)
+        client = get_redis_client(key)
+        if not client:
+            CACHE_ERRORS.labels("invalidate").inc()
+            return
+        try:
+            if fence_seconds > 0:
+                client.set(key, self.FENCE_ENTRY, ex=fence_seconds)
+            else:
+                client.delete(key)
+        except RedisError:
+            CACHE_ERRORS.labels("invalidate").inc()
+
+    def invalidate_many(self, article_ids: List[int], fence_seconds: int = 0) -> None:
+        keys = [self._get_article_key(article_id) for article_id in article_ids]
+        if not keys:
+            return
+        nodes = ring()
+        groups = nodes.group(keys) if nodes else {settings.REDIS_URL: keys}
+        for node_keys in groups.values():
+            client = get_redis_client(node_keys[0])
+            if not client:
+                CACHE_ERRORS.labels("invalidate_many").inc()
+                continue
+            try:
+                if fence_seconds > 0:
+                    pipe = client.pipeline(transaction=False)
+                    for key in node_keys:
+                        pipe.set(key, self.FENCE_ENTRY, ex=fence_seconds)
+                    pipe.execute()
+                else:
+                    client.delete(*node_keys)
+            except RedisError:
+                CACHE_ERRORS.labels("invalidate_many").inc()
+
+    def get_related(self, article_id: int) -> Optional[List[Dict[str, Any]]]:
+        key = self._get_related_key(article_id)
+        client = get_redis_client(key)
+        if not client:
+            CACHE_ERRORS.labels("get_related").inc()
+            return None
+        try:
+            cached_data = client.get(key)
+        except RedisError:
+            CACHE_ERRORS.labels("get_related").inc()
+            return None
+        if cached_data is None:
+            CACHE_MISSES.inc()
+            return None
+        CACHE_HITS.inc()
+        with serialization_timer():
+            return json.loads(cached_data)
+
+    def set_related(self, article_id: int, items: List[Dict[str, Any]]) -> None:
+        key = self._get_related_key(article_id)
+        client = get_redis_client(key)
+        if not client:
+            CACHE_ERRORS.labels("set_related").inc()
+            return
+        with serialization_timer():
+            payload = json.dumps(items, default=str)
+        try:
+            client.set(key, payload, ex=settings.CACHE_TTL_SECONDS)
+        except RedisError:
+            CACHE_ERRORS.labels("set_related").inc()
+
+    def invalidate_related(self, article_ids: List[int]) -> None:
+        keys = [self._get_related_key(article_id) for article_id in article_ids]
+        if not keys:
+            return
+        nodes = ring()
+        groups = nodes.group(keys) if nodes else {settings.REDIS_URL: keys}
+        for node_keys in groups.values():
+            client = get_redis_client(node_keys[0])
+            if not client:
+                CACHE_ERRORS.labels("invalidate_related").inc()
+                continue
+            try:
+                client.delete(*node_keys)
+            except RedisError:
+                CACHE_ERRORS.labels("invalidate_related").inc()
@@ -0,0 +1,210 @@
+import asyncio
+import time
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from typing import Deque, Dict, Optional
+
+from fastapi import Request, status
+from fastapi.responses import JSONResponse
+
+from app.cache.redis_wrapper import CacheWrapper
+from app.core.config import settings
+from app.core.metrics import ADMISSION_LIMIT, ADMISSION_REJECTIONS, match_route
+
+"""
+Admission control and load shedding.
+
+When PostgreSQL slows down, sync routes pile up on the threadpool waiting for a
+pool connection and latency grows without bound. Each route is therefore
+guarded by an `AdaptiveLimiter`: a concurrency limit, a bounded FIFO wait queue
+with a deadline, and an AIMD controller that grows the limit while observed
+latency stays under `ADMISSION_TARGET_LATENCY_MS` and shrinks it
+multiplicatively when it does not. Requests that cannot be admitted in time
+receive an immediate `503` with a `Retry-After` header, which keeps tail
+latency bounded under overload.
+
+Article reads that can be answered from `CacheWrapper` (a cached article or a
+negative entry, not a write fence) never touch the database, so they bypass
+the limiter when it is saturated. That check uses the synchronous Redis
+client on a small dedicated executor: the shared threadpool is the resource
+that is saturated at that moment.
+
+Attributes:
+    EXEMPT_PATHS (set): Paths never subject to admission control.
+"""
+
+EXEMPT_PATHS = {"/health", "/metrics"}
+
+
+class AdaptiveLimiter:
+    """
+    Concurrency limiter with a bounded wait queue and an AIMD limit.
+
+    All methods must be called from the event loop thread.
+
+    Args:
+        name (str): Route template the limiter protects (used in metrics).
+        initial_limit (int): Starting concurrency limit.
+        min_limit (int): Lower bound of the adaptive limit.
+        max_limit (int): Upper bound of the adaptive limit.
+        queue_size (int): Maximum number of requests waiting for a slot.
+        queue_timeout (float): Seconds a request may wait for a slot.
+        target_latency (float): Latency in seconds above which the limit shrinks.
+        backoff_ratio (float): Multiplicative decrease factor.
+    """
+
+    def __init__(
+        self,
+        name: str,
+        initial_limit: int,
+        min_limit: int,
+        max_limit: int,
+        queue_size: int,
+        queue_timeout: float,
+        target_latency: float,
+        backoff_ratio: float,
+    ):
+        self.name = name
+        self.limit = float(initial_limit)
+        self.min_limit = min_limit
+        self.max_limit = max_limit
+        self.queue_size = queue_size
+        self.queue_timeout = queue_timeout
+        self.target_latency = target_latency
+        self.backoff_ratio = backoff_ratio
+        self.in_flight = 0
+        self._waiters: Deque[asyncio.Future] = deque()
+        ADMISSION_LIMIT.labels(name).set(self.limit)
+
+    @property
+    def saturated(self) -> bool:
+        return self.in_flight >= int(self.limit)
+
+    async def acquire(self) -> Optional[str]:
+        """
+        Wait for a slot. Returns None once admitted, or the rejection reason
+        (`queue_full` or `timeout`).
+        """
+        if not self.saturated and not self._waiters:
+            self.in_flight += 1
+            return None
+        if len(self._waiters) >= self.queue_size:
+            return "queue_full"
+
+        waiter = asyncio.get_running_loop().create_future()
+        self._waiters.append(waiter)
+        try:
+            await asyncio.wait_for(asyncio.shield(waiter), timeout=self.queue_timeout)
+            return None
+        except asyncio.TimeoutError:
+            self._abandon(waiter)
+            return "timeout"
+        except asyncio.CancelledError:
+            # El cliente se desconectó mientras esperaba
+            self._abandon(waiter)
+            raise
+        finally:
+            if waiter in self._waiters:
+                self._waiters.remove(waiter)
+
+    def _abandon(self, waiter: asyncio.Future) -> None:
+        if waiter.done() and not waiter.cancelled():
+            # El slot llegó justo cuando la espera terminaba: se devuelve a la cola
+            self.release(None)
+        else:
+            waiter.cancel()
+
+    def release(self, latency: Optional[float]) -> None:
+        """
+        Free a slot, update the limit with the observed latency (if any) and
+        hand free slots to queued requests in FIFO order.
+        """
+        self.in_flight -= 1
+        if latency is not None:
+            if latency > self.target_latency:
+                self.limit = max(self.min_limit, self.limit * self.backoff_ratio)
+            else:
+                self.limit = min(self.max_limit, self.limit + 1 / self.limit)
+            ADMISSION_LIMIT.labels(self.name).set(self.limit)
+        while self._waiters and not self.saturated:
+            waiter = self._waiters.popleft()
+            if not waiter.done():
+                self.in_flight += 1
+                waiter.set_result(None)
+
+
+_limiters: Dict[str, AdaptiveLimiter] = {}
+
+
+def get_limiter(route: str) -> AdaptiveLimiter:
+    """Return the limiter of a route, creating it from the settings on first use."""
+    limiter = _limiters.get(route)
+    if limiter is None:
+        limiter = _limiters[route] = AdaptiveLimiter(
+            name=route,
+            initial_limit=settings.ADMISSION_INITIAL_LIMIT,
+            min_limit=settings.ADMISSION_MIN_LIMIT,
+            max_limit=settings.ADMISSION_MAX_LIMIT,
+            queue_size=settings.ADMISSION_QUEUE_SIZE,
+            queue_timeout=settings.ADMISSION_QUEUE_TIMEOUT_SECONDS,
+            target_latency=settings.ADMISSION_TARGET_LATENCY_MS / 1000,
+            backoff_ratio=settings.ADMISSION_BACKOFF_RATIO,
+        )
+    return limiter
+
+
+_CACHE_CHECK_WORKERS = 4
+_cache_check_executor: Optional[ThreadPoolExecutor] = None
+
+
+def _cache_check_pool() -> ThreadPoolExecutor:
+    # Se crea en el primer uso, ya dentro de cada worker (nunca se hereda por fork)
+    global _cache_check_executor
+    if _cache_check_executor is None:
+        _cache_check_executor = ThreadPoolExecutor(_CACHE_CHECK_WORKERS, thread_name_prefix="admission-cache")
+    return _cache_check_executor
+
+
+async def _served_from_cache(request: Request, route: str, path_params: dict) -> bool:
+    if request.method != "GET" or route != f"{settings.API_V1_STR}/articles/{{article_id}}":
+        return False
+    try:
+        article_id = int(path_params["article_id"])
+    except (KeyError, ValueError):
+        return False
+    # Fuera del event loop y del threadpool compartido, que es el que está saturado
+    return await asyncio.get_running_loop().run_in_executor(_cache_check_pool(), CacheWrapper().exists, article_id)
+
+
+async def admission_middleware(request: Request, call_next):
+    """
+    HTTP middleware applying per-route admission control.
+    """
+    if not settings.ADMISSION_CONTROL_ENABLED or request.url.path in EXEMPT_PATHS:
+        return await call_next(request)
+
+    route, path_params = match_route(request)
+    limiter = get_limiter(route)
+
+    # La consulta a Redis solo se paga cuando habría que esperar un slot
+    if limiter.saturated and await _served_from_cache(request, route, path_params):
+        return await call_next(request)
+
+    rejection = await limiter.acquire()
+    if rejection is not None:
+        ADMISSION_REJECTIONS.labels(route, rejection).inc()
+        return JSONResponse(
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+            content={"detail": "Service overloaded. Please retry later."},
+            headers={"Retry-After": str(settings.ADMISSION_RETRY_AFTER_SECONDS)},
+        )
+
+    start = time.perf_counter()
+    latency = None
+    try:
+        response = await call_next(request)
+        latency = time.perf_counter() - start
+        return response
+    finally:
+        # Las excepciones no alimentan el controlador AIMD
+        limiter.release(latency)
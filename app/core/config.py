@@ -1,6 +1,6 @@
 import os
 from pydantic_settings import BaseSettings, SettingsConfigDict
-from pydantic import ValidationError
+from pydantic import ValidationError, model_validator
 
 class Settings(BaseSettings):
     """
@@ -15,8 +15,91 @@ class Settings(BaseSettings):
         API_V1_STR (str): Base path for the API version 1 routes.
         DATABASE_URL (str): Database connection URL for PostgreSQL.
         REDIS_URL (str): Redis connection URL used for caching or messaging.
+        REDIS_NODES (Optional[str]): Comma-separated Redis URLs to shard cache and
+            rate-limit keys across with consistent hashing; `REDIS_URL` alone if unset.
+        REDIS_VIRTUAL_NODES (int): Points per Redis node on the consistent-hash ring.
         API_KEY (Optional[str]): Optional API key for authentication.
         CACHE_TTL_SECONDS (int): Default cache expiration time in seconds.
+        PROFILING_HEADER_ENABLED (bool): Profile requests carrying the `X-Profile` header.
+        PROFILING_SAMPLE_RATE (float): Fraction of requests profiled at random (0 disables).
+        PROFILING_OUTPUT_DIR (Optional[str]): Directory where stack-sample profiles are written.
+        PROFILING_SAMPLE_INTERVAL (float): Seconds between stack samples.
+        LOG_LEVEL (str): Level of the application loggers.
+        LOG_JSON (bool): Emit logs as JSON lines instead of plain text.
+        LOG_HOT_PATH_SAMPLE_RATE (float): Fraction of repetitive hot-path messages logged.
+        SLOW_QUERY_THRESHOLD_MS (float): Duration above which a SQL statement is logged.
+        SLOW_QUERY_SAMPLE_RATE (float): Fraction of slow queries that are logged.
+        DB_POOL_SIZE (int): Connections kept open in the SQLAlchemy pool.
+        DB_MAX_OVERFLOW (int): Extra connections allowed above the pool size.
+        DB_POOL_TIMEOUT (float): Seconds to wait for a free connection before failing.
+        DB_POOL_RECYCLE (int): Seconds after which pooled connections are replaced (-1 disables).
+        DB_POOL_PRE_PING (bool): Test connections for liveness on checkout.
+        DB_PGBOUNCER_MODE (bool): Use NullPool and disable server-side prepared statements,
+            for deployments behind PgBouncer in transaction pooling mode.
+        DATABASE_REPLICA_URL (Optional[str]): Read replica URL; reads use the primary if unset.
+        REPLICA_MAX_LAG_SECONDS (float): How long a client stays pinned to the primary
+            after a write, at most.
+        ADMISSION_CONTROL_ENABLED (bool): Enable per-route admission control and load shedding.
+        ADMISSION_INITIAL_LIMIT (int): Starting concurrency limit of each route.
+        ADMISSION_MIN_LIMIT (int): Lower bound of the adaptive concurrency limit.
+        ADMISSION_MAX_LIMIT (int): Upper bound of the adaptive concurrency limit.
+        ADMISSION_QUEUE_SIZE (int): Requests allowed to wait for a slot per route.
+        ADMISSION_QUEUE_TIMEOUT_SECONDS (float): Maximum wait for a slot before a 503.
+        ADMISSION_TARGET_LATENCY_MS (float): Latency above which the limit is reduced.
+        ADMISSION_BACKOFF_RATIO (float): Multiplicative decrease applied to the limit.
+        ADMISSION_RETRY_AFTER_SECONDS (int): `Retry-After` value of shed requests.
+        ARTICLES_PARTITION_INTERVAL (str): `month` or `year` partitions for `articles` (PostgreSQL).
+        ARTICLES_PARTITION_PREMAKE (int): Future partitions created ahead of time.
+        ARTICLES_PARTITION_RETENTION_MONTHS (int): Age after which partitions are archived.
+        HOT_KEY_SAMPLE_RATE (float): Fraction of article reads counted for hot-key tracking.
+        HOT_KEY_DECAY_INTERVAL_SECONDS (int): Period of the hot-key score decay.
+        HOT_KEY_DECAY_FACTOR (float): Multiplier applied to hot-key scores on each decay.
+        HOT_KEY_MIN_SCORE (float): Scores below this value are pruned on decay.
+        HOT_KEY_TOP_N (int): Number of hottest articles prewarmed and refreshed on update.
+        CACHE_WARM_ON_STARTUP (bool): Prewarm the hottest articles during application startup.
+        NEGATIVE_CACHE_TTL_SECONDS (int): Lifetime of the cache entries recording that an
+            article does not exist.
+        BLOOM_FILTER_ENABLED (bool): Answer lookups of ids absent from the Redis Bloom filter
+            of article ids with a 404 without querying the database.
+        BLOOM_FILTER_CAPACITY (int): Article ids the Bloom filter is sized for.
+        BLOOM_FILTER_ERROR_RATE (float): False-positive rate of the filter at full capacity.
+        BLOOM_FILTER_REBUILD_INTERVAL_SECONDS (float): Period of the full rebuild that drops
+            deleted ids.
+        HEALTH_CHECK_INTERVAL_SECONDS (float): Refresh period of the `/health` status snapshot.
+        RELATED_INDEX_SIZE (int): Related articles precomputed per article (upper bound of `k`).
+        RELATED_AUTHOR_BOOST (float): Score added to related articles by the same author.
+        RELATED_CANDIDATES_PER_TAG (int): Newest articles per tag (and per author) considered
+            when an article's related entries are recomputed.
+        DUPLICATE_CHECK_MODE (str): Near-duplicate check on create and bulk import: `off`,
+            `warn` (create and report the candidates) or `reject` (409 / skip the article).
+        DUPLICATE_SIMILARITY_THRESHOLD (float): Estimated Jaccard similarity of title and
+            body shingles from which an article counts as a near duplicate.
+        DUPLICATE_MAX_CANDIDATES (int): LSH candidates whose signatures are compared per check.
+        MINHASH_PERMUTATIONS (int): Hash functions per MinHash signature.
+        MINHASH_BANDS (int): LSH bands the signature is split into (must divide the permutations).
+        MINHASH_SHINGLE_SIZE (int): Words per shingle.
+        MIGRATION_LOCK_TIMEOUT_MS (int): `lock_timeout` of migration statements (PostgreSQL).
+        MIGRATION_STATEMENT_TIMEOUT_MS (int): `statement_timeout` of migration statements and
+            backfill batches (PostgreSQL); concurrent index builds run without it.
+        MIGRATION_BATCH_SIZE (int): Primary-key range covered by each backfill batch.
+        MIGRATION_BATCH_SLEEP_SECONDS (float): Pause between backfill batches.
+        TRACING_ENABLED (bool): Record request traces (spans per layer, SQL and Redis command).
+        TRACING_SLOW_THRESHOLD_MS (float): Traces at least this slow are always kept.
+        TRACING_SAMPLE_RATE (float): Fraction of the other successful traces kept at random.
+        TRACING_TRUST_UPSTREAM_SAMPLED (bool): Always keep traces whose incoming `traceparent`
+            is flagged as sampled (only behind callers that can be trusted).
+        TRACING_EXPORTER (str): `none` (discard), `file` (JSON lines at `TRACING_FILE_PATH`)
+            or `memory` (last `TRACING_MEMORY_MAX_SPANS` spans).
+        TRACING_FILE_PATH (str): Output file of the `file` exporter.
+        TRACING_MAX_SPANS (int): Spans buffered per trace; further spans are counted as dropped.
+        TRACING_MEMORY_MAX_SPANS (int): Spans kept by the `memory` exporter.
+        SERVER_WORKERS (int): Gunicorn worker processes; 0 sizes them to the CPU count.
+        SERVER_PRELOAD (bool): Import the application in the Gunicorn master before forking.
+        SERVER_MAX_REQUESTS (int): Requests after which a worker is recycled (0 disables).
+        SERVER_MAX_REQUESTS_JITTER (int): Random jitter added to `SERVER_MAX_REQUESTS`.
+        SERVER_TIMEOUT (int): Seconds a silent worker may run before being restarted.
+        SERVER_GRACEFUL_TIMEOUT (int): Seconds workers get to finish in-flight requests on restart.
+        SERVER_KEEPALIVE (int): Seconds idle keep-alive connections are held open.
 
     Methods:
         Inherits methods from `BaseSettings` to load, parse, and validate
@@ -41,13 +124,92 @@ class Settings(BaseSettings):
     API_PORT: int = 8000
     RATE_LIMIT_WINDOW: int = 60
     RATE_LIMIT_MAX_REQUESTS: int = 20
+    PROFILING_HEADER_ENABLED: bool = False
+    PROFILING_SAMPLE_RATE: float = 0.0
+    PROFILING_OUTPUT_DIR: str | None = None
+    PROFILING_SAMPLE_INTERVAL: float = 0.005
+    LOG_LEVEL: str = "INFO"
+    LOG_JSON: bool = True
+    LOG_HOT_PATH_SAMPLE_RATE: float = 0.01
+    SLOW_QUERY_THRESHOLD_MS: float = 200.0
+    SLOW_QUERY_SAMPLE_RATE: float = 1.0
+    DB_POOL_SIZE: int = 5
+    DB_MAX_OVERFLOW: int = 10
+    DB_POOL_TIMEOUT: float = 30.0
+    DB_POOL_RECYCLE: int = 1800
+    DB_POOL_PRE_PING: bool = True
+    DB_PGBOUNCER_MODE: bool = False
+    ADMISSION_CONTROL_ENABLED: bool = True
+    ADMISSION_INITIAL_LIMIT: int = 10
+    ADMISSION_MIN_LIMIT: int = 2
+    ADMISSION_MAX_LIMIT: int = 40
+    ADMISSION_QUEUE_SIZE: int = 50
+    ADMISSION_QUEUE_TIMEOUT_SECONDS: float = 1.0
+    ADMISSION_TARGET_LATENCY_MS: float = 250.0
+    ADMISSION_BACKOFF_RATIO: float = 0.9
+    ADMISSION_RETRY_AFTER_SECONDS: int = 1
+    ARTICLES_PARTITION_INTERVAL: str = "month"
+    ARTICLES_PARTITION_PREMAKE: int = 3
+    ARTICLES_PARTITION_RETENTION_MONTHS: int = 24
+    HOT_KEY_SAMPLE_RATE: float = 0.1
+    HOT_KEY_DECAY_INTERVAL_SECONDS: int = 300
+    HOT_KEY_DECAY_FACTOR: float = 0.5
+    HOT_KEY_MIN_SCORE: float = 0.5
+    HOT_KEY_TOP_N: int = 1000
+    CACHE_WARM_ON_STARTUP: bool = True
+    NEGATIVE_CACHE_TTL_SECONDS: int = 30
+    BLOOM_FILTER_ENABLED: bool = True
+    BLOOM_FILTER_CAPACITY: int = 2_000_000
+    BLOOM_FILTER_ERROR_RATE: float = 0.01
+    BLOOM_FILTER_REBUILD_INTERVAL_SECONDS: float = 3600.0
+    HEALTH_CHECK_INTERVAL_SECONDS: float = 5.0
+    RELATED_INDEX_SIZE: int = 20
+    RELATED_AUTHOR_BOOST: float = 0.2
+    RELATED_CANDIDATES_PER_TAG: int = 200
+    DUPLICATE_CHECK_MODE: str = "warn"
+    DUPLICATE_SIMILARITY_THRESHOLD: float = 0.8
+    DUPLICATE_MAX_CANDIDATES: int = 50
+    MINHASH_PERMUTATIONS: int = 64
+    MINHASH_BANDS: int = 16
+    MINHASH_SHINGLE_SIZE: int = 3
+    MIGRATION_LOCK_TIMEOUT_MS: int = 5000
+    MIGRATION_STATEMENT_TIMEOUT_MS: int = 60000
+    MIGRATION_BATCH_SIZE: int = 5000
+    MIGRATION_BATCH_SLEEP_SECONDS: float = 0.1
+    TRACING_ENABLED: bool = False
+    TRACING_SLOW_THRESHOLD_MS: float = 500.0
+    TRACING_SAMPLE_RATE: float = 0.0
+    TRACING_TRUST_UPSTREAM_SAMPLED: bool = False
+    TRACING_EXPORTER: str = "none"
+    TRACING_FILE_PATH: str = "traces.jsonl"
+    TRACING_MAX_SPANS: int = 1000
+    TRACING_MEMORY_MAX_SPANS: int = 10000
+    SERVER_WORKERS: int = 0
+    SERVER_PRELOAD: bool = False
+    SERVER_MAX_REQUESTS: int = 10000
+    SERVER_MAX_REQUESTS_JITTER: int = 1000
+    SERVER_TIMEOUT: int = 60
+    SERVER_GRACEFUL_TIMEOUT: int = 30
+    SERVER_KEEPALIVE: int = 5
+    DATABASE_REPLICA_URL: str | None = None
+    REPLICA_MAX_LAG_SECONDS: float = 10.0
     REDIS_HOST : str = (os.getenv("REDIS_HOST", "redis"))
     REDIS_PORT: int = (os.getenv("REDIS_PORT", 6379))
     REDIS_DB: int = (os.getenv("REDIS_DB", 0))
     REDIS_URL: str = (os.getenv("REDIS_URL")) or str(f"redis://{REDIS_HOST}:{REDIS_PORT}/{REDIS_DB}")
+    REDIS_NODES: str | None = None
+    REDIS_VIRTUAL_NODES: int = 160
 
     model_config = SettingsConfigDict(env_file=".env", env_file_encoding="utf-8")  
     
+    @model_validator(mode="after")
+    def _check_minhash_bands(self):
+        if self.MINHASH_BANDS <= 0 or self.MINHASH_PERMUTATIONS % self.MINHASH_BANDS:
+            raise ValueError(
+                f"MINHASH_BANDS ({self.MINHASH_BANDS}) must divide MINHASH_PERMUTATIONS ({self.MINHASH_PERMUTATIONS})"
+            )
+        return self
+
     @property
     def DATABASE_URL(self):
         return (
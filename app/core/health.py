@@ -0,0 +1,113 @@
+import logging
+import threading
+import time
+from typing import Any, Dict, Optional
+
+from sqlalchemy import text
+
+from app.cache import redis_wrapper
+from app.core.config import settings
+from app.db import session as db_session
+
+"""
+Background health monitor.
+
+Readiness and liveness probes hit `/health` far more often than the status of
+PostgreSQL or Redis actually changes. Instead of checking out a connection and
+running `SELECT 1` on every probe, a daemon thread refreshes a status snapshot
+every `HEALTH_CHECK_INTERVAL_SECONDS`; the endpoint only reads that snapshot
+and the in-memory pool statistics.
+
+Attributes:
+    health_monitor (HealthMonitor): Process-wide monitor started by the
+        application lifespan.
+"""
+
+logger = logging.getLogger(__name__)
+
+
+class HealthMonitor:
+    """
+    Periodically checks the database and Redis and keeps the latest result.
+
+    Args:
+        interval (float): Seconds between two refreshes.
+    """
+
+    def __init__(self, interval: float):
+        self.interval = interval
+        self._snapshot: Optional[Dict[str, Any]] = None
+        self._lock = threading.Lock()
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    def _check_database(self) -> str:
+        try:
+            with db_session.get_engine().connect() as conn:
+                conn.execute(text("SELECT 1"))
+            return "ok"
+        except Exception:
+            logger.warning("Database health check failed", exc_info=True)
+            return "error"
+
+    def _check_redis(self) -> str:
+        try:
+            # Con varios nodos, cualquiera caído degrada el estado
+            if not all(node.ping() for node in redis_wrapper.all_clients().values()):
+                return "error"
+            return "ok"
+        except Exception:
+            return "error"
+
+    def refresh(self) -> Dict[str, Any]:
+        """Run the checks now and store the resulting snapshot."""
+        database = self._check_database()
+        redis = self._check_redis()
+        snapshot = {
+            "status": "ok" if database == "ok" and redis == "ok" else "degraded",
+            "database": database,
+            "redis": redis,
+            "checked_at": time.time(),
+        }
+        with self._lock:
+            self._snapshot = snapshot
+        return snapshot
+
+    def snapshot(self) -> Dict[str, Any]:
+        """
+        Return the latest snapshot, refreshing synchronously only if no check
+        has run yet. A snapshot older than three intervals is reported as
+        degraded, since it means the monitor thread is no longer running.
+        """
+        with self._lock:
+            snapshot = self._snapshot
+        if snapshot is None:
+            snapshot = self.refresh()
+        snapshot = dict(snapshot)
+        if time.time() - snapshot["checked_at"] > 3 * self.interval:
+            snapshot["status"] = "degraded"
+            snapshot["stale"] = True
+        return snapshot
+
+    def _run(self) -> None:
+        while not self._stop.is_set():
+            self.refresh()
+            self._stop.wait(self.interval)
+
+    def start(self) -> None:
+        """Start the background refresh thread (no-op if already running)."""
+        if self._thread is not None and self._thread.is_alive():
+            return
+        self._stop.clear()
+        self._thread = threading.Thread(target=self._run, name="health-monitor", daemon=True)
+        self._thread.start()
+
+    def stop(self) -> None:
+        """Stop the background refresh thread."""
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join(timeout=self.interval)
+            self._thread = None
+
+
+health_monitor = HealthMonitor(settings.HEALTH_CHECK_INTERVAL_SECONDS)
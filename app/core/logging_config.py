@@ -0,0 +1,167 @@
+import atexit
+import json
+import logging
+import os
+import queue
+import random
+import sys
+import time
+import uuid
+from contextvars import ContextVar
+from datetime import datetime, timezone
+from logging.handlers import QueueHandler, QueueListener
+from typing import Optional
+
+from fastapi import Request
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+
+from app.core.config import settings
+
+"""
+Structured logging subsystem.
+
+All application loggers (the `app` hierarchy) write to a `QueueHandler`; a
+`QueueListener` thread formats the records and performs the actual stream I/O,
+so request threads never block on stdout. Records are emitted as JSON lines
+carrying the id of the request that produced them.
+
+The module also provides a slow-query log fed by SQLAlchemy engine events,
+with a configurable threshold and sample rate, and `sampled()` to thin out
+messages logged on the hot path.
+
+Attributes:
+    request_id (ContextVar): Id of the request being served, or None.
+    slow_query_logger (logging.Logger): Logger receiving slow-query records.
+"""
+
+request_id: ContextVar[Optional[str]] = ContextVar("request_id", default=None)
+slow_query_logger = logging.getLogger("app.db.slow_query")
+
+_listener: Optional[QueueListener] = None
+
+# Atributos estándar de LogRecord; el resto se considera contexto (`extra`)
+_RESERVED_ATTRS = set(vars(logging.LogRecord("", 0, "", 0, "", (), None))) | {"message", "asctime", "request_id"}
+
+
+class RequestIdFilter(logging.Filter):
+    """Attach the current request id to every record."""
+
+    def filter(self, record: logging.LogRecord) -> bool:
+        record.request_id = request_id.get()
+        return True
+
+
+class JsonFormatter(logging.Formatter):
+    """Render log records as single-line JSON objects."""
+
+    def format(self, record: logging.LogRecord) -> str:
+        payload = {
+            "ts": datetime.fromtimestamp(record.created, tz=timezone.utc).isoformat(),
+            "level": record.levelname,
+            "logger": record.name,
+            "message": record.getMessage(),
+            "request_id": getattr(record, "request_id", None),
+        }
+        for key, value in record.__dict__.items():
+            if key not in _RESERVED_ATTRS:
+                payload[key] = value
+        if record.exc_info:
+            payload["exc_info"] = self.formatException(record.exc_info)
+        return json.dumps(payload, default=str)
+
+
+def setup_logging() -> None:
+    """
+    Configure the `app` logger hierarchy with a non-blocking JSON handler.
+
+    Safe to call more than once; only the first call installs the handlers.
+    """
+    global _listener
+    if _listener is not None:
+        return
+
+    stream_handler = logging.StreamHandler(sys.stdout)
+    stream_handler.setFormatter(
+        JsonFormatter() if settings.LOG_JSON
+        else logging.Formatter("%(asctime)s %(levelname)s [%(name)s] [%(request_id)s] %(message)s")
+    )
+
+    log_queue: queue.Queue = queue.Queue(-1)
+    queue_handler = QueueHandler(log_queue)
+    # El request id se resuelve en el hilo de la petición, antes de encolar
+    queue_handler.addFilter(RequestIdFilter())
+
+    app_logger = logging.getLogger("app")
+    app_logger.setLevel(settings.LOG_LEVEL.upper())
+    app_logger.addHandler(queue_handler)
+    app_logger.propagate = False
+
+    _listener = QueueListener(log_queue, stream_handler, respect_handler_level=True)
+    _listener.start()
+    atexit.register(_listener.stop)
+
+
+def _restart_listener_after_fork() -> None:
+    # El hilo del listener no sobrevive al fork: sin esto, un worker creado
+    # con `preload_app` encolaría sus logs sin que nadie los escribiera.
+    # Se crea un listener nuevo con los mismos handlers y una cola propia.
+    global _listener
+    if _listener is None:
+        return
+    log_queue: queue.Queue = queue.Queue(-1)
+    for handler in logging.getLogger("app").handlers:
+        if isinstance(handler, QueueHandler):
+            handler.queue = log_queue
+    atexit.unregister(_listener.stop)
+    _listener = QueueListener(log_queue, *_listener.handlers, respect_handler_level=_listener.respect_handler_level)
+    _listener.start()
+    atexit.register(_listener.stop)
+
+
+os.register_at_fork(after_in_child=_restart_listener_after_fork)
+
+
+def sampled(rate: float) -> bool:
+    """Return True for roughly `rate` of the calls (1.0 always, 0.0 never)."""
+    return rate >= 1.0 or (rate > 0 and random.random() < rate)
+
+
+async def request_id_middleware(request: Request, call_next):
+    """
+    HTTP middleware propagating the `X-Request-ID` header (or a generated id)
+    to the logging context and back to the client.
+    """
+    rid = request.headers.get("X-Request-ID") or uuid.uuid4().hex
+    token = request_id.set(rid)
+    try:
+        response = await call_next(request)
+    finally:
+        request_id.reset(token)
+    response.headers["X-Request-ID"] = rid
+    return response
+
+
+def instrument_engine(engine: Engine) -> None:
+    """
+    Attach SQLAlchemy listeners logging statements slower than
+    `SLOW_QUERY_THRESHOLD_MS`, sampled at `SLOW_QUERY_SAMPLE_RATE`.
+
+    Only the statement text is logged; bound parameters are never rendered.
+    """
+
+    @event.listens_for(engine, "before_cursor_execute")
+    def _before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+        conn.info["slow_query_start"] = time.perf_counter()
+
+    @event.listens_for(engine, "after_cursor_execute")
+    def _after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+        start = conn.info.pop("slow_query_start", None)
+        if start is None:
+            return
+        elapsed_ms = (time.perf_counter() - start) * 1000
+        if elapsed_ms >= settings.SLOW_QUERY_THRESHOLD_MS and sampled(settings.SLOW_QUERY_SAMPLE_RATE):
+            slow_query_logger.warning(
+                "Slow query",
+                extra={"duration_ms": round(elapsed_ms, 2), "statement": statement},
+            )
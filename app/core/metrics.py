@@ -0,0 +1,226 @@
+import os
+import time
+from typing import Any, Dict, Tuple
+
+from fastapi import Request
+from fastapi.responses import Response
+from prometheus_client import (
+    CONTENT_TYPE_LATEST,
+    CollectorRegistry,
+    Counter,
+    Gauge,
+    Histogram,
+    REGISTRY,
+    generate_latest,
+)
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+
+"""
+Prometheus metrics for the Article Management Service.
+
+This module defines every metric exported by the service and the hooks that
+feed them: an HTTP middleware for per-route latency and in-flight requests,
+SQLAlchemy engine events for query counts, durations and pool usage, and the
+counters incremented by `CacheWrapper` and the rate limiter.
+
+When the `PROMETHEUS_MULTIPROC_DIR` environment variable is set (required when
+running several worker processes), samples are written to that directory by
+each worker and aggregated at scrape time by `render_metrics`.
+
+Attributes:
+    REQUEST_LATENCY (Histogram): Request duration by method, route and status.
+    REQUESTS_IN_PROGRESS (Gauge): Requests currently being served by route.
+    DB_QUERIES (Counter): Executed SQL statements by operation.
+    DB_QUERY_LATENCY (Histogram): SQL statement duration by operation.
+    DB_POOL_CHECKED_OUT (Gauge): Connections currently checked out, per engine.
+    DB_POOL_OVERFLOW (Gauge): Connections opened beyond the pool size, per engine.
+    CACHE_HITS / CACHE_MISSES / CACHE_ERRORS (Counter): Cache lookups outcome.
+    CACHE_NEGATIVE_HITS (Counter): Lookups answered by a negative cache entry.
+    BLOOM_FILTER_REJECTIONS (Counter): Lookups of ids the Bloom filter ruled out.
+    RATE_LIMIT_REJECTIONS (Counter): Requests rejected with HTTP 429.
+    ADMISSION_REJECTIONS (Counter): Requests shed by admission control with HTTP 503.
+    ADMISSION_LIMIT (Gauge): Adaptive concurrency limit per route.
+"""
+
+REQUEST_LATENCY = Histogram(
+    "http_request_duration_seconds",
+    "HTTP request latency in seconds.",
+    ["method", "route", "status"],
+)
+REQUESTS_IN_PROGRESS = Gauge(
+    "http_requests_in_progress",
+    "HTTP requests currently being processed.",
+    ["method", "route"],
+    multiprocess_mode="livesum",
+)
+DB_QUERIES = Counter(
+    "db_queries_total",
+    "SQL statements executed.",
+    ["operation"],
+)
+DB_QUERY_LATENCY = Histogram(
+    "db_query_duration_seconds",
+    "SQL statement execution time in seconds.",
+    ["operation"],
+    buckets=(0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5),
+)
+DB_POOL_CHECKED_OUT = Gauge(
+    "db_pool_checked_out_connections",
+    "Database connections currently checked out of the pool.",
+    ["engine"],
+    multiprocess_mode="livesum",
+)
+DB_POOL_OVERFLOW = Gauge(
+    "db_pool_overflow_connections",
+    "Database connections opened beyond the configured pool size.",
+    ["engine"],
+    multiprocess_mode="livesum",
+)
+CACHE_HITS = Counter("cache_hits_total", "Article cache hits.")
+CACHE_MISSES = Counter("cache_misses_total", "Article cache misses.")
+CACHE_ERRORS = Counter(
+    "cache_errors_total",
+    "Cache operations that failed or found Redis unavailable.",
+    ["operation"],
+)
+CACHE_NEGATIVE_HITS = Counter("cache_negative_hits_total", "Article lookups answered by a negative cache entry.")
+BLOOM_FILTER_REJECTIONS = Counter(
+    "bloom_filter_rejections_total",
+    "Article lookups of ids that the existence Bloom filter ruled out.",
+)
+RATE_LIMIT_REJECTIONS = Counter(
+    "rate_limit_rejections_total",
+    "Requests rejected by the rate limiter.",
+)
+ADMISSION_REJECTIONS = Counter(
+    "admission_rejections_total",
+    "Requests shed by admission control.",
+    ["route", "reason"],
+)
+ADMISSION_LIMIT = Gauge(
+    "admission_concurrency_limit",
+    "Current adaptive concurrency limit per route.",
+    ["route"],
+    multiprocess_mode="livesum",
+)
+
+_SQL_OPERATIONS = {"SELECT", "INSERT", "UPDATE", "DELETE", "BEGIN", "COMMIT", "ROLLBACK"}
+_UNMATCHED_ROUTE = "unmatched"
+
+
+def match_route(request: Request) -> Tuple[str, Dict[str, Any]]:
+    """
+    Resolve the path template and path parameters of the route that will serve
+    the request. The result is cached in the ASGI scope, so every middleware
+    shares a single resolution.
+    """
+    cached = request.scope.get("app.route_match")
+    if cached is not None:
+        return cached
+    from starlette.routing import Match
+
+    result = (_UNMATCHED_ROUTE, {})
+    for route in request.app.router.routes:
+        match, child_scope = route.matches(request.scope)
+        if match == Match.FULL:
+            result = (getattr(route, "path", _UNMATCHED_ROUTE), child_scope.get("path_params", {}))
+            break
+    request.scope["app.route_match"] = result
+    return result
+
+
+def route_template(request: Request) -> str:
+    """
+    Resolve the path template of the route that will serve the request.
+
+    Using the template (e.g. `/api/v1/articles/{article_id}`) instead of the raw
+    path keeps label cardinality bounded.
+    """
+    return match_route(request)[0]
+
+
+async def metrics_middleware(request: Request, call_next):
+    """
+    HTTP middleware recording per-route latency and in-flight requests.
+    """
+    method = request.method
+    route = route_template(request)
+    in_progress = REQUESTS_IN_PROGRESS.labels(method, route)
+    in_progress.inc()
+    start = time.perf_counter()
+    status_code = 500
+    try:
+        response = await call_next(request)
+        status_code = response.status_code
+        return response
+    finally:
+        REQUEST_LATENCY.labels(method, route, str(status_code)).observe(time.perf_counter() - start)
+        in_progress.dec()
+
+
+def sql_operation(statement: str) -> str:
+    """Leading keyword of a SQL statement (`SELECT`, `INSERT`, ...), or `OTHER`."""
+    keyword = statement.lstrip().split(None, 1)[0].upper() if statement.strip() else ""
+    return keyword if keyword in _SQL_OPERATIONS else "OTHER"
+
+
+def _update_pool_gauges(pool, name: str) -> None:
+    checkedout = getattr(pool, "checkedout", None)
+    overflow = getattr(pool, "overflow", None)
+    if checkedout is not None:
+        DB_POOL_CHECKED_OUT.labels(name).set(checkedout())
+    if overflow is not None:
+        DB_POOL_OVERFLOW.labels(name).set(max(overflow(), 0))
+
+
+def instrument_engine(engine: Engine, name: str = "primary") -> None:
+    """
+    Attach SQLAlchemy event listeners that feed the database metrics.
+
+    Args:
+        engine (Engine): The engine whose statements and pool should be tracked.
+        name (str): Label distinguishing the pool gauges of several engines.
+    """
+
+    @event.listens_for(engine, "before_cursor_execute")
+    def _before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+        conn.info.setdefault("metrics_query_start", []).append(time.perf_counter())
+
+    @event.listens_for(engine, "after_cursor_execute")
+    def _after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+        elapsed = time.perf_counter() - conn.info["metrics_query_start"].pop()
+        operation = sql_operation(statement)
+        DB_QUERIES.labels(operation).inc()
+        DB_QUERY_LATENCY.labels(operation).observe(elapsed)
+
+    @event.listens_for(engine, "handle_error")
+    def _handle_error(context):
+        starts = context.connection.info.get("metrics_query_start") if context.connection else None
+        if starts:
+            starts.pop()
+
+    @event.listens_for(engine.pool, "checkout")
+    def _checkout(dbapi_connection, connection_record, connection_proxy):
+        _update_pool_gauges(engine.pool, name)
+
+    @event.listens_for(engine.pool, "checkin")
+    def _checkin(dbapi_connection, connection_record):
+        _update_pool_gauges(engine.pool, name)
+
+
+def render_metrics() -> Response:
+    """
+    Render all metrics in the Prometheus text exposition format.
+
+    In multiprocess mode a fresh registry aggregates the samples written by
+    every worker; otherwise the default in-process registry is used.
+    """
+    if os.environ.get("PROMETHEUS_MULTIPROC_DIR"):
+        from prometheus_client import multiprocess
+
+        registry = CollectorRegistry()
+        multiprocess.MultiProcessCollector(registry)
+    else:
+        registry = REGISTRY
+    return Response(generate_latest(registry), media_type=CONTENT_TYPE_LATEST)
@@ -0,0 +1,235 @@
+import os
+import random
+import sys
+import threading
+import time
+import uuid
+from collections import Counter as FrameCounter
+from contextlib import contextmanager
+from contextvars import ContextVar
+from dataclasses import dataclass
+from typing import Iterator, Optional
+
+from fastapi import Request
+from fastapi.concurrency import run_in_threadpool
+from redis.connection import Connection, SSLConnection
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+
+from app.core.config import settings
+
+"""
+Opt-in per-request profiling.
+
+A request is profiled when it carries the `X-Profile` header (if
+`PROFILING_HEADER_ENABLED` is set) or when it is picked by the
+`PROFILING_SAMPLE_RATE` sampler. For profiled requests the service records the
+number of SQL statements and total database time, Redis round trips and time,
+and serialization time, and returns them in a `Server-Timing` header.
+
+When `PROFILING_OUTPUT_DIR` is configured, a statistical profile of the request
+(stack samples in the collapsed "folded" format understood by flamegraph tools)
+is written to that directory as `<request id>.folded`.
+
+Attributes:
+    current_profile (ContextVar): The profile of the request being served, or
+        None when the request is not profiled.
+"""
+
+
+@dataclass
+class RequestProfile:
+    """Timings accumulated while serving a single profiled request."""
+
+    sql_count: int = 0
+    sql_time: float = 0.0
+    redis_round_trips: int = 0
+    redis_time: float = 0.0
+    serialization_time: float = 0.0
+
+    def server_timing(self, total: float) -> str:
+        """Format the profile as a `Server-Timing` header value (durations in ms)."""
+        return ", ".join([
+            f'db;dur={self.sql_time * 1000:.2f};desc="{self.sql_count} queries"',
+            f'redis;dur={self.redis_time * 1000:.2f};desc="{self.redis_round_trips} round trips"',
+            f"serialize;dur={self.serialization_time * 1000:.2f}",
+            f"total;dur={total * 1000:.2f}",
+        ])
+
+
+current_profile: ContextVar[Optional[RequestProfile]] = ContextVar("current_profile", default=None)
+
+
+@contextmanager
+def profile_block() -> Iterator[RequestProfile]:
+    """
+    Profile an arbitrary block of code outside of the HTTP middleware.
+
+    Useful in tests and scripts to count the SQL statements or Redis round trips
+    issued by a piece of code.
+    """
+    profile = RequestProfile()
+    token = current_profile.set(profile)
+    try:
+        yield profile
+    finally:
+        current_profile.reset(token)
+
+
+@contextmanager
+def serialization_timer() -> Iterator[None]:
+    """Add the duration of the wrapped block to the serialization time."""
+    profile = current_profile.get()
+    if profile is None:
+        yield
+        return
+    start = time.perf_counter()
+    try:
+        yield
+    finally:
+        profile.serialization_time += time.perf_counter() - start
+
+
+def instrument_engine(engine: Engine) -> None:
+    """
+    Attach SQLAlchemy listeners recording statement count and time on the
+    current request profile. Costs a single context lookup when not profiling.
+    """
+
+    @event.listens_for(engine, "before_cursor_execute")
+    def _before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+        if current_profile.get() is not None:
+            conn.info["profiling_query_start"] = time.perf_counter()
+
+    @event.listens_for(engine, "after_cursor_execute")
+    def _after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+        profile = current_profile.get()
+        start = conn.info.pop("profiling_query_start", None)
+        if profile is not None and start is not None:
+            profile.sql_count += 1
+            profile.sql_time += time.perf_counter() - start
+
+
+class _ProfiledConnectionMixin:
+    """
+    Redis connection hooks recording round trips on the current request profile.
+
+    Each packed command sent is one round trip (a pipeline is sent as a single
+    packet); the time spent sending and reading replies is accumulated.
+    """
+
+    def send_packed_command(self, command, check_health=True):
+        profile = current_profile.get()
+        if profile is None:
+            return super().send_packed_command(command, check_health)
+        start = time.perf_counter()
+        try:
+            return super().send_packed_command(command, check_health)
+        finally:
+            profile.redis_round_trips += 1
+            profile.redis_time += time.perf_counter() - start
+
+    def read_response(self, *args, **kwargs):
+        profile = current_profile.get()
+        if profile is None:
+            return super().read_response(*args, **kwargs)
+        start = time.perf_counter()
+        try:
+            return super().read_response(*args, **kwargs)
+        finally:
+            profile.redis_time += time.perf_counter() - start
+
+
+class ProfiledConnection(_ProfiledConnectionMixin, Connection):
+    pass
+
+
+class ProfiledSSLConnection(_ProfiledConnectionMixin, SSLConnection):
+    pass
+
+
+def redis_connection_class(url: str):
+    """Return the profiled Redis connection class matching the URL scheme."""
+    return ProfiledSSLConnection if url.startswith("rediss://") else ProfiledConnection
+
+
+class StackSampler:
+    """
+    Minimal statistical profiler.
+
+    A background thread samples the stacks of every other thread at a fixed
+    interval. Sync endpoints run in the threadpool, so sampling all threads is
+    what captures their work; under concurrency, samples of other in-flight
+    requests are included as well.
+    """
+
+    def __init__(self, interval: float):
+        self.interval = interval
+        self.samples: FrameCounter = FrameCounter()
+        self._stop = threading.Event()
+        self._thread = threading.Thread(target=self._run, name="stack-sampler", daemon=True)
+
+    def _run(self) -> None:
+        own_id = threading.get_ident()
+        while not self._stop.wait(self.interval):
+            for thread_id, frame in sys._current_frames().items():
+                if thread_id == own_id:
+                    continue
+                stack = []
+                while frame is not None:
+                    code = frame.f_code
+                    stack.append(f"{code.co_name} ({os.path.basename(code.co_filename)}:{frame.f_lineno})")
+                    frame = frame.f_back
+                self.samples[";".join(reversed(stack))] += 1
+
+    def start(self) -> None:
+        self._thread.start()
+
+    def stop(self) -> None:
+        self._stop.set()
+        self._thread.join()
+
+    def dump(self, path: str) -> None:
+        os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+        with open(path, "w", encoding="utf-8") as fh:
+            for stack, count in self.samples.most_common():
+                fh.write(f"{stack} {count}\n")
+
+
+def _should_profile(request: Request) -> bool:
+    if settings.PROFILING_HEADER_ENABLED and request.headers.get("X-Profile"):
+        return True
+    return settings.PROFILING_SAMPLE_RATE > 0 and random.random() < settings.PROFILING_SAMPLE_RATE
+
+
+async def profiling_middleware(request: Request, call_next):
+    """
+    HTTP middleware enabling profiling for opted-in or sampled requests and
+    reporting the collected timings in the `Server-Timing` response header.
+    """
+    if not _should_profile(request):
+        return await call_next(request)
+
+    sampler = None
+    if settings.PROFILING_OUTPUT_DIR:
+        sampler = StackSampler(settings.PROFILING_SAMPLE_INTERVAL)
+        sampler.start()
+
+    profile = RequestProfile()
+    token = current_profile.set(profile)
+    start = time.perf_counter()
+    try:
+        response = await call_next(request)
+    finally:
+        current_profile.reset(token)
+        if sampler is not None:
+            # Parar el muestreador espera a su hilo: fuera del event loop
+            await run_in_threadpool(sampler.stop)
+
+    response.headers["Server-Timing"] = profile.server_timing(time.perf_counter() - start)
+    if sampler is not None:
+        profile_id = uuid.uuid4().hex
+        # La escritura del fichero no debe bloquear el event loop ni las demás peticiones
+        await run_in_threadpool(sampler.dump, os.path.join(settings.PROFILING_OUTPUT_DIR, f"{profile_id}.folded"))
+        response.headers["X-Profile-Id"] = profile_id
+    return response
@@ -0,0 +1,61 @@
+import os
+import shutil
+from multiprocessing import cpu_count
+
+from uvicorn.workers import UvicornWorker
+
+from app.core.config import settings
+
+"""
+Production server profile (Gunicorn managing Uvicorn workers).
+
+`gunicorn.conf.py` at the repository root reads its values from here, so the
+profile is driven by the same settings as the application:
+
+    gunicorn app.main:app
+
+Each worker is a separate process with its own event loop, engines, Redis
+client and in-process state (admission limiters, health snapshot). Nothing is
+created before the fork (see `app.db.session` and `app.cache.redis_wrapper`),
+and the pools inherited through `preload_app` are reset in every child.
+Size `DB_POOL_SIZE + DB_MAX_OVERFLOW` per worker: the database sees
+`workers * (DB_POOL_SIZE + DB_MAX_OVERFLOW)` connections at most.
+
+With more than one worker, Prometheus metrics are written to a shared
+`PROMETHEUS_MULTIPROC_DIR` so `/metrics` aggregates every worker.
+"""
+
+
+class ProductionUvicornWorker(UvicornWorker):
+    """Uvicorn worker pinned to uvloop and httptools, with the lifespan enabled."""
+
+    CONFIG_KWARGS = {"loop": "uvloop", "http": "httptools", "lifespan": "on"}
+
+
+def worker_count() -> int:
+    """`SERVER_WORKERS`, or one worker per CPU when it is 0."""
+    return settings.SERVER_WORKERS or cpu_count()
+
+
+def prepare_multiprocess_metrics(workers: int) -> None:
+    """
+    Point prometheus_client at an empty shared directory when running several
+    workers (or when `PROMETHEUS_MULTIPROC_DIR` is set explicitly). Must run in
+    the master before any worker imports the metrics.
+    """
+    if workers > 1:
+        os.environ.setdefault("PROMETHEUS_MULTIPROC_DIR", "/tmp/prometheus-multiproc")
+    directory = os.environ.get("PROMETHEUS_MULTIPROC_DIR")
+    if not directory:
+        return
+    # Los ficheros de una ejecución anterior inflarían los contadores agregados
+    shutil.rmtree(directory, ignore_errors=True)
+    os.makedirs(directory, exist_ok=True)
+
+
+def mark_worker_dead(pid: int) -> None:
+    """Drop the live gauges of an exited worker from the aggregated metrics."""
+    if os.environ.get("PROMETHEUS_MULTIPROC_DIR"):
+        from prometheus_client import multiprocess
+
+        multiprocess.mark_process_dead(pid)
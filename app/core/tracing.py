@@ -0,0 +1,507 @@
+import functools
+import json
+import logging
+import os
+import queue
+import random
+import re
+import threading
+import time
+import types
+from collections import deque
+from contextlib import contextmanager
+from contextvars import ContextVar
+from dataclasses import dataclass, field
+from typing import Any, Callable, Dict, Iterator, List, Optional, Tuple
+
+from fastapi import HTTPException, Request
+from redis import Redis
+from redis.client import Pipeline
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+
+from app.core.config import settings
+from app.core.metrics import match_route, sql_operation
+
+"""
+Request tracing with OpenTelemetry-style spans.
+
+With `TRACING_ENABLED`, every request opens a trace. Spans are recorded for
+the request itself (server span, named after the route template), for the
+public methods of the service, repository and cache classes (`trace_methods`),
+for every SQL statement (SQLAlchemy engine events) and for every Redis command
+or pipeline (`TracedRedis`).
+
+Context propagation follows W3C Trace Context: an incoming `traceparent`
+header continues the caller's trace, and the response carries a `traceparent`
+naming the server span so clients can find it.
+
+Spans are buffered per request and the trace is handed to the tail sampler
+when the request finishes. It keeps the traces that were slow
+(`TRACING_SLOW_THRESHOLD_MS`), failed (5xx or an exception in any span),
+were picked at random (`TRACING_SAMPLE_RATE`) or, only with
+`TRACING_TRUST_UPSTREAM_SAMPLED`, were sampled upstream (`traceparent` flag;
+any client can set it, so it is ignored by default); everything else is
+discarded. Kept traces go to the exporter: `none` (the default, discards
+them), `file` (JSON lines at `TRACING_FILE_PATH`, one span per line, written
+by a background thread so the event loop never waits on the disk) or `memory`
+(the last `TRACING_MEMORY_MAX_SPANS` spans, for tests and offline
+inspection).
+
+With tracing disabled the middleware passes requests straight through, and
+every hook costs a single context-variable lookup.
+
+Attributes:
+    current_trace (ContextVar): Span buffer of the request being traced, or None.
+    current_span (ContextVar): Innermost open span, parent of the next one.
+    tracer (Tracer): Process-wide tracer holding the sampler and the exporter.
+"""
+
+logger = logging.getLogger(__name__)
+
+_TRACEPARENT = re.compile(r"^00-([0-9a-f]{32})-([0-9a-f]{16})-([0-9a-f]{2})$")
+_STATEMENT_MAX_LENGTH = 500
+
+
+def _new_id(bytes_: int) -> str:
+    return os.urandom(bytes_).hex()
+
+
+@dataclass
+class Span:
+    """A timed operation within a trace."""
+
+    name: str
+    trace_id: str
+    span_id: str
+    parent_span_id: Optional[str] = None
+    kind: str = "internal"
+    attributes: Dict[str, Any] = field(default_factory=dict)
+    start_ns: int = field(default_factory=time.time_ns)
+    end_ns: Optional[int] = None
+    status: str = "unset"
+    status_message: Optional[str] = None
+
+    @property
+    def duration_ms(self) -> float:
+        return ((self.end_ns or time.time_ns()) - self.start_ns) / 1e6
+
+    def set_attribute(self, key: str, value: Any) -> None:
+        self.attributes[key] = value
+
+    def record_exception(self, exc: BaseException) -> None:
+        """Mark the span as failed, except for client errors (4xx `HTTPException`)."""
+        self.attributes["exception.type"] = type(exc).__name__
+        if isinstance(exc, HTTPException) and exc.status_code < 500:
+            return
+        self.status = "error"
+        self.status_message = str(exc)[:_STATEMENT_MAX_LENGTH]
+
+    def end(self) -> None:
+        if self.end_ns is None:
+            self.end_ns = time.time_ns()
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "trace_id": self.trace_id,
+            "span_id": self.span_id,
+            "parent_span_id": self.parent_span_id,
+            "name": self.name,
+            "kind": self.kind,
+            "start_time_unix_nano": self.start_ns,
+            "end_time_unix_nano": self.end_ns,
+            "duration_ms": round(self.duration_ms, 3),
+            "attributes": self.attributes,
+            "status": self.status,
+            "status_message": self.status_message,
+        }
+
+
+@dataclass
+class TraceRecord:
+    """Spans buffered for one request until the tail-sampling decision."""
+
+    trace_id: str
+    parent_span_id: Optional[str] = None
+    remote_sampled: bool = False
+    spans: List[Span] = field(default_factory=list)
+    dropped_spans: int = 0
+
+    @property
+    def root(self) -> Optional[Span]:
+        return self.spans[0] if self.spans else None
+
+    @property
+    def has_error(self) -> bool:
+        return any(span.status == "error" for span in self.spans)
+
+
+current_trace: ContextVar[Optional[TraceRecord]] = ContextVar("current_trace", default=None)
+current_span: ContextVar[Optional[Span]] = ContextVar("current_span", default=None)
+
+
+def parse_traceparent(header: Optional[str]) -> Optional[Tuple[str, str, bool]]:
+    """Return (trace id, parent span id, sampled) from a W3C `traceparent`, or None if invalid."""
+    match = _TRACEPARENT.match((header or "").strip().lower())
+    if not match:
+        return None
+    trace_id, parent_id, flags = match.groups()
+    if trace_id == "0" * 32 or parent_id == "0" * 16:
+        return None
+    return trace_id, parent_id, bool(int(flags, 16) & 0x01)
+
+
+def format_traceparent(trace_id: str, span_id: str, sampled: bool) -> str:
+    return f"00-{trace_id}-{span_id}-{'01' if sampled else '00'}"
+
+
+class TailSampler:
+    """
+    Keep slow, failed and randomly picked traces, and upstream-sampled ones
+    when `trust_upstream` is set.
+    """
+
+    def __init__(self, slow_threshold_ms: float, sample_rate: float, trust_upstream: bool = False):
+        self.slow_threshold_ms = slow_threshold_ms
+        self.sample_rate = sample_rate
+        self.trust_upstream = trust_upstream
+
+    def should_keep(self, trace: TraceRecord) -> bool:
+        root = trace.root
+        if root is None:
+            return False
+        if trace.has_error or root.duration_ms >= self.slow_threshold_ms:
+            return True
+        if trace.remote_sampled and self.trust_upstream:
+            return True
+        return self.sample_rate > 0 and random.random() < self.sample_rate
+
+
+class NoopSpanExporter:
+    """Discard exported spans."""
+
+    def export(self, spans: List[Span]) -> None:
+        pass
+
+
+class InMemorySpanExporter:
+    """
+    Keep the last `max_spans` exported spans (tests, offline inspection).
+
+    Args:
+        max_spans (int | None): Defaults to `TRACING_MEMORY_MAX_SPANS`; older spans are discarded.
+    """
+
+    def __init__(self, max_spans: Optional[int] = None):
+        self.spans: deque = deque(maxlen=max_spans or settings.TRACING_MEMORY_MAX_SPANS)
+        self._lock = threading.Lock()
+
+    def export(self, spans: List[Span]) -> None:
+        with self._lock:
+            self.spans.extend(spans)
+
+    def trace(self, trace_id: str) -> List[Span]:
+        with self._lock:
+            return [span for span in self.spans if span.trace_id == trace_id]
+
+    def clear(self) -> None:
+        with self._lock:
+            self.spans.clear()
+
+
+class FileSpanExporter:
+    """
+    Append exported spans to a file as JSON lines.
+
+    `export` only enqueues the trace; a daemon writer thread serializes and
+    writes it, so the request never waits on the disk. When `max_queue`
+    traces are already waiting, further ones are dropped and counted in
+    `dropped`.
+    """
+
+    def __init__(self, path: str, max_queue: int = 1000):
+        self.path = path
+        self.max_queue = max_queue
+        self.dropped = 0
+        self._lock = threading.Lock()
+        self._pid: Optional[int] = None
+        self._queue: Optional[queue.Queue] = None
+        self._thread: Optional[threading.Thread] = None
+
+    def _writer_queue(self) -> queue.Queue:
+        # El hilo escritor no sobrevive a un fork: cada proceso arranca el suyo
+        if self._pid != os.getpid():
+            with self._lock:
+                if self._pid != os.getpid():
+                    self._queue = queue.Queue(self.max_queue)
+                    self._thread = threading.Thread(target=self._run, args=(self._queue,), name="span-writer", daemon=True)
+                    self._thread.start()
+                    self._pid = os.getpid()
+        return self._queue
+
+    def export(self, spans: List[Span]) -> None:
+        try:
+            self._writer_queue().put_nowait([span.to_dict() for span in spans])
+        except queue.Full:
+            self.dropped += 1
+
+    def _run(self, pending: queue.Queue) -> None:
+        while True:
+            spans = pending.get()
+            try:
+                self._write(spans)
+            except OSError:
+                logger.warning("Could not write spans to %s", self.path, exc_info=True)
+            finally:
+                pending.task_done()
+
+    def _write(self, spans: List[Dict[str, Any]]) -> None:
+        lines = "".join(json.dumps(span, default=str) + "\n" for span in spans)
+        directory = os.path.dirname(self.path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        with open(self.path, "a", encoding="utf-8") as fh:
+            fh.write(lines)
+
+    def flush(self) -> None:
+        """Wait until every enqueued trace has been written."""
+        if self._pid == os.getpid():
+            self._queue.join()
+
+
+class Tracer:
+    """
+    Start traces and spans and hand finished traces to the sampler and exporter.
+
+    The sampler and the exporter are built from the settings on first use and
+    can be replaced (e.g. with an `InMemorySpanExporter` in tests).
+    """
+
+    def __init__(self):
+        self._sampler: Optional[TailSampler] = None
+        self._exporter = None
+
+    @property
+    def sampler(self) -> TailSampler:
+        if self._sampler is None:
+            self._sampler = TailSampler(
+                settings.TRACING_SLOW_THRESHOLD_MS, settings.TRACING_SAMPLE_RATE, settings.TRACING_TRUST_UPSTREAM_SAMPLED
+            )
+        return self._sampler
+
+    @sampler.setter
+    def sampler(self, value: TailSampler) -> None:
+        self._sampler = value
+
+    @property
+    def exporter(self):
+        if self._exporter is None:
+            if settings.TRACING_EXPORTER == "file":
+                self._exporter = FileSpanExporter(settings.TRACING_FILE_PATH)
+            elif settings.TRACING_EXPORTER == "memory":
+                self._exporter = InMemorySpanExporter()
+            else:
+                self._exporter = NoopSpanExporter()
+        return self._exporter
+
+    @exporter.setter
+    def exporter(self, value) -> None:
+        self._exporter = value
+
+    def start_span(self, trace: TraceRecord, name: str, kind: str = "internal", attributes=None) -> Span:
+        parent = current_span.get()
+        span = Span(
+            name=name,
+            trace_id=trace.trace_id,
+            span_id=_new_id(8),
+            parent_span_id=parent.span_id if parent is not None else trace.parent_span_id,
+            kind=kind,
+            attributes=dict(attributes or {}),
+        )
+        if len(trace.spans) < settings.TRACING_MAX_SPANS:
+            trace.spans.append(span)
+        else:
+            trace.dropped_spans += 1
+        return span
+
+    def finish(self, trace: TraceRecord) -> bool:
+        """Apply the tail sampler and export the trace if kept. Returns the decision."""
+        if not self.sampler.should_keep(trace):
+            return False
+        if trace.dropped_spans and trace.root is not None:
+            trace.root.set_attribute("tracing.dropped_spans", trace.dropped_spans)
+        self.exporter.export(trace.spans)
+        return True
+
+
+tracer = Tracer()
+
+
+@contextmanager
+def start_span(name: str, kind: str = "internal", attributes: Optional[Dict[str, Any]] = None) -> Iterator[Optional[Span]]:
+    """
+    Record the wrapped block as a child of the current span.
+
+    Yields None, recording nothing, when the current request is not traced.
+    """
+    trace = current_trace.get()
+    if trace is None:
+        yield None
+        return
+    span = tracer.start_span(trace, name, kind, attributes)
+    token = current_span.set(span)
+    try:
+        yield span
+    except BaseException as exc:
+        span.record_exception(exc)
+        raise
+    finally:
+        current_span.reset(token)
+        span.end()
+
+
+def traced(name: Optional[str] = None, attributes: Optional[Dict[str, Any]] = None) -> Callable:
+    """Decorator recording each call of the function as a span."""
+
+    def decorator(func: Callable) -> Callable:
+        span_name = name or func.__qualname__
+
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            if current_trace.get() is None:
+                return func(*args, **kwargs)
+            with start_span(span_name, attributes=attributes):
+                return func(*args, **kwargs)
+
+        return wrapper
+
+    return decorator
+
+
+def trace_methods(layer: str) -> Callable[[type], type]:
+    """
+    Class decorator recording a span for every call of the class's public
+    methods, named `<Class>.<method>` and tagged with `layer`.
+    """
+
+    def decorator(cls: type) -> type:
+        for attr_name, attr in list(vars(cls).items()):
+            if attr_name.startswith("_") or not isinstance(attr, types.FunctionType):
+                continue
+            setattr(cls, attr_name, traced(f"{cls.__name__}.{attr_name}", {"layer": layer})(attr))
+        return cls
+
+    return decorator
+
+
+def instrument_engine(engine: Engine) -> None:
+    """Record a client span per SQL statement executed while a request is traced."""
+
+    @event.listens_for(engine, "before_cursor_execute")
+    def _before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+        trace = current_trace.get()
+        if trace is None:
+            return
+        operation = sql_operation(statement)
+        conn.info.setdefault("tracing_spans", []).append(tracer.start_span(
+            trace,
+            f"SQL {operation}",
+            kind="client",
+            attributes={
+                "layer": "db",
+                "db.system": engine.dialect.name,
+                "db.operation": operation,
+                "db.statement": statement[:_STATEMENT_MAX_LENGTH],
+            },
+        ))
+
+    @event.listens_for(engine, "after_cursor_execute")
+    def _after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+        spans = conn.info.get("tracing_spans")
+        if spans:
+            spans.pop().end()
+
+    @event.listens_for(engine, "handle_error")
+    def _handle_error(exception_context):
+        conn = exception_context.connection
+        spans = conn.info.get("tracing_spans") if conn is not None else None
+        if spans:
+            span = spans.pop()
+            span.record_exception(exception_context.original_exception)
+            span.end()
+
+
+def _redis_span_attributes(operation: str) -> Dict[str, Any]:
+    return {"layer": "redis", "db.system": "redis", "db.operation": operation}
+
+
+class TracedPipeline(Pipeline):
+    """Pipeline recording one client span per execution (a single round trip)."""
+
+    def execute(self, raise_on_error=True):
+        if current_trace.get() is None:
+            return super().execute(raise_on_error)
+        commands = [str(args[0]).upper() for args, _ in self.command_stack]
+        attributes = _redis_span_attributes("PIPELINE")
+        attributes["db.redis.commands"] = ",".join(sorted(set(commands)))
+        attributes["db.redis.command_count"] = len(commands)
+        with start_span("redis PIPELINE", kind="client", attributes=attributes):
+            return super().execute(raise_on_error)
+
+
+class TracedRedis(Redis):
+    """Redis client recording one client span per command while a request is traced."""
+
+    def execute_command(self, *args, **options):
+        if current_trace.get() is None:
+            return super().execute_command(*args, **options)
+        operation = str(args[0]).upper()
+        with start_span(f"redis {operation}", kind="client", attributes=_redis_span_attributes(operation)):
+            return super().execute_command(*args, **options)
+
+    def pipeline(self, transaction=True, shard_hint=None) -> TracedPipeline:
+        return TracedPipeline(self.connection_pool, self.response_callbacks, transaction, shard_hint)
+
+
+async def tracing_middleware(request: Request, call_next):
+    """
+    HTTP middleware opening the trace and server span of each request,
+    continuing the caller's W3C trace context when present.
+    """
+    if not settings.TRACING_ENABLED:
+        return await call_next(request)
+
+    parent = parse_traceparent(request.headers.get("traceparent"))
+    if parent is not None:
+        trace = TraceRecord(trace_id=parent[0], parent_span_id=parent[1], remote_sampled=parent[2])
+    else:
+        trace = TraceRecord(trace_id=_new_id(16))
+    trace_token = current_trace.set(trace)
+    route = match_route(request)[0]
+    server_span = tracer.start_span(
+        trace,
+        f"{request.method} {route}",
+        kind="server",
+        attributes={
+            "layer": "route", "http.method": request.method, "http.route": route, "url.path": request.url.path,
+        },
+    )
+    span_token = current_span.set(server_span)
+    try:
+        response = await call_next(request)
+    except BaseException as exc:
+        server_span.record_exception(exc)
+        server_span.end()
+        tracer.finish(trace)
+        raise
+    finally:
+        current_span.reset(span_token)
+        current_trace.reset(trace_token)
+
+    server_span.set_attribute("http.status_code", response.status_code)
+    if response.status_code >= 500:
+        server_span.status = "error"
+    server_span.end()
+    sampled = tracer.finish(trace)
+    response.headers["traceparent"] = format_traceparent(trace.trace_id, server_span.span_id, sampled)
+    return response
@@ -0,0 +1,311 @@
+import hashlib
+import logging
+import time
+from contextlib import contextmanager
+from typing import Iterator, List, Optional, Sequence, Union
+
+from alembic import op
+from alembic.operations import ops
+from sqlalchemy import Boolean, BigInteger, Column, DateTime, MetaData, String, Table, func, inspect, select, text
+from sqlalchemy.engine import Connection
+from sqlalchemy.schema import CreateIndex
+from sqlalchemy.sql.elements import TextClause
+
+from app.core.config import settings
+
+"""
+Helpers for online (zero-downtime) Alembic migrations on large tables.
+
+PostgreSQL takes locks that queue every later query on the table behind them,
+so a migration waiting for a lock, or holding one for minutes, stalls the
+API. These helpers keep each step short and non-blocking:
+
+    - `apply_timeouts` (called by `alembic/env.py` for every migration run)
+      sets `lock_timeout` and `statement_timeout`, so a DDL statement that
+      cannot get its lock quickly fails instead of piling traffic up behind it.
+    - `create_index_concurrently` / `drop_index_concurrently` build or drop
+      indexes with `CONCURRENTLY` outside the migration transaction, without
+      blocking writes. An invalid index left by an interrupted build is
+      dropped and rebuilt. On a partitioned table (see `app.db.partitioning`),
+      which does not support `CONCURRENTLY`, the index is created on the
+      parent only, built concurrently on each partition and attached.
+    - `backfill` runs a data migration in primary-key ranges, each one in its
+      own short transaction together with its progress row in
+      `migration_backfill_progress`, sleeping between batches. An interrupted
+      backfill resumes after the last committed range when the migration is
+      run again. A downgrade that drops the backfilled data must call
+      `reset_backfill`, or the next upgrade would skip it as completed.
+
+Usage in a migration:
+
+    from app.db.migrations import backfill, create_index_concurrently
+
+    def upgrade() -> None:
+        op.add_column('articles', sa.Column('body_length', sa.Integer(), nullable=True))
+        backfill(
+            'articles_body_length', 'articles',
+            "UPDATE articles SET body_length = length(body) "
+            "WHERE id >= :start AND id < :end AND body_length IS NULL",
+        )
+        create_index_concurrently('ix_articles_body_length', 'articles', ['body_length'])
+
+Rows written after a backfill starts must already be handled by the
+application (deploy the code that writes the new column first). On SQLite,
+used by the tests, the timeouts are skipped and `CONCURRENTLY` is ignored.
+"""
+
+logger = logging.getLogger(__name__)
+
+PROGRESS_TABLE = "migration_backfill_progress"
+
+# Fuera de `Base.metadata`: la tabla es del framework de migraciones, no del modelo
+progress_table = Table(
+    PROGRESS_TABLE,
+    MetaData(),
+    Column("name", String(255), primary_key=True),
+    Column("last_key", BigInteger, nullable=False),
+    Column("done", Boolean, nullable=False, default=False),
+    Column("updated_at", DateTime(timezone=True), server_default=func.now(), nullable=False),
+)
+
+
+def _is_postgresql(conn: Connection) -> bool:
+    return conn.dialect.name == "postgresql"
+
+
+def apply_timeouts(
+    conn: Connection, lock_timeout_ms: Optional[int] = None, statement_timeout_ms: Optional[int] = None
+) -> None:
+    """
+    Set the session `lock_timeout` and `statement_timeout` (PostgreSQL only).
+
+    Args:
+        conn (Connection): Migration connection.
+        lock_timeout_ms (int | None): Defaults to `MIGRATION_LOCK_TIMEOUT_MS`; 0 waits forever.
+        statement_timeout_ms (int | None): Defaults to `MIGRATION_STATEMENT_TIMEOUT_MS`; 0 disables it.
+    """
+    if not _is_postgresql(conn):
+        return
+    lock_timeout_ms = settings.MIGRATION_LOCK_TIMEOUT_MS if lock_timeout_ms is None else lock_timeout_ms
+    statement_timeout_ms = (
+        settings.MIGRATION_STATEMENT_TIMEOUT_MS if statement_timeout_ms is None else statement_timeout_ms
+    )
+    conn.execute(text(f"SET lock_timeout = {int(lock_timeout_ms)}"))
+    conn.execute(text(f"SET statement_timeout = {int(statement_timeout_ms)}"))
+
+
+@contextmanager
+def _without_timeouts(conn: Connection) -> Iterator[None]:
+    # Un índice concurrente tarda lo que tarde y no bloquea escrituras: sin límites mientras dura
+    apply_timeouts(conn, lock_timeout_ms=0, statement_timeout_ms=0)
+    try:
+        yield
+    finally:
+        apply_timeouts(conn)
+
+
+def _drop_invalid_index(conn: Connection, index_name: str) -> None:
+    invalid = conn.execute(
+        text(
+            "SELECT 1 FROM pg_index i JOIN pg_class c ON c.oid = i.indexrelid "
+            "WHERE c.relname = :name AND NOT i.indisvalid"
+        ),
+        {"name": index_name},
+    ).scalar()
+    if invalid:
+        logger.warning("Dropping invalid index %s left by an interrupted build", index_name)
+        conn.execute(text(f'DROP INDEX CONCURRENTLY IF EXISTS "{index_name}"'))
+
+
+def _partitions(conn: Connection, table_name: str) -> Optional[List[str]]:
+    """Partitions of `table_name`, or None if it is not a partitioned table."""
+    if not _is_postgresql(conn) or op.get_context().as_sql:
+        return None
+    partitioned = conn.execute(
+        text(
+            "SELECT 1 FROM pg_partitioned_table pt JOIN pg_class c ON c.oid = pt.partrelid "
+            "WHERE c.relname = :name AND pg_table_is_visible(c.oid)"
+        ),
+        {"name": table_name},
+    ).scalar()
+    if not partitioned:
+        return None
+    rows = conn.execute(
+        text(
+            "SELECT c.relname FROM pg_inherits i "
+            "JOIN pg_class c ON c.oid = i.inhrelid JOIN pg_class p ON p.oid = i.inhparent "
+            "WHERE p.relname = :name AND pg_table_is_visible(p.oid) ORDER BY c.relname"
+        ),
+        {"name": table_name},
+    )
+    return [row[0] for row in rows]
+
+
+def _partition_index_name(index_name: str, partition: str) -> str:
+    name = f"{index_name}_{partition}"
+    if len(name) <= 63:
+        return name
+    # Límite de 63 bytes de los identificadores de PostgreSQL
+    return f"{name[:54]}_{hashlib.md5(name.encode()).hexdigest()[:8]}"
+
+
+def _create_partitioned_index(
+    conn: Connection, index_name: str, table_name: str, columns: List[Union[str, TextClause]],
+    partitions: List[str], **kwargs,
+) -> None:
+    # El índice del padre nace inválido y pasa a válido al adjuntar el de la última partición
+    parent = ops.CreateIndexOp(index_name, table_name, columns, **kwargs).to_index()
+    statement = str(CreateIndex(parent, if_not_exists=True).compile(dialect=conn.dialect))
+    conn.execute(text(statement.replace(" ON ", " ON ONLY ", 1)))
+    for partition in partitions:
+        child_name = _partition_index_name(index_name, partition)
+        _drop_invalid_index(conn, child_name)
+        op.create_index(
+            child_name, partition, columns, postgresql_concurrently=True, if_not_exists=True, **kwargs
+        )
+        conn.execute(text(f'ALTER INDEX "{index_name}" ATTACH PARTITION "{child_name}"'))
+
+
+def create_index_concurrently(
+    index_name: str, table_name: str, columns: Sequence[Union[str, TextClause]], **kwargs
+) -> None:
+    """
+    `op.create_index` with `CREATE INDEX CONCURRENTLY IF NOT EXISTS`, outside
+    the migration transaction and without timeouts. Extra keyword arguments
+    (`unique`, `postgresql_where`, ...) are passed through.
+
+    On a partitioned table the index is created with `ON ONLY` on the parent,
+    built concurrently on every partition and attached to the parent's index.
+    """
+    with op.get_context().autocommit_block():
+        conn = op.get_bind()
+        with _without_timeouts(conn):
+            partitions = _partitions(conn, table_name)
+            if partitions is not None:
+                _create_partitioned_index(conn, index_name, table_name, list(columns), partitions, **kwargs)
+                return
+            if _is_postgresql(conn) and not op.get_context().as_sql:
+                _drop_invalid_index(conn, index_name)
+            op.create_index(
+                index_name, table_name, list(columns), postgresql_concurrently=True, if_not_exists=True, **kwargs
+            )
+
+
+def drop_index_concurrently(index_name: str, table_name: str) -> None:
+    """
+    `op.drop_index` with `DROP INDEX CONCURRENTLY IF EXISTS`, outside the
+    migration transaction. The index of a partitioned table cannot be dropped
+    concurrently; it is dropped with its partition indexes in one statement,
+    under the usual migration timeouts.
+    """
+    with op.get_context().autocommit_block():
+        conn = op.get_bind()
+        if _partitions(conn, table_name) is not None:
+            # Bloqueo exclusivo breve: se mantienen los límites de espera de la migración
+            op.drop_index(index_name, table_name=table_name, if_exists=True)
+            return
+        with _without_timeouts(conn):
+            op.drop_index(index_name, table_name=table_name, postgresql_concurrently=True, if_exists=True)
+
+
+def backfill(
+    name: str,
+    table_name: str,
+    statement: str,
+    key: str = "id",
+    batch_size: Optional[int] = None,
+    sleep_seconds: Optional[float] = None,
+    dialects: Optional[Sequence[str]] = None,
+) -> int:
+    """
+    Run `statement` over `table_name` in ranges of its integer `key`.
+
+    `statement` must restrict itself to `key >= :start AND key < :end`. Each
+    range is committed together with the progress of backfill `name`, so an
+    interrupted run resumes where it stopped; the backfill is skipped once
+    completed.
+
+    Args:
+        name (str): Unique name of the backfill (its progress key).
+        table_name (str): Table whose `key` range is walked.
+        statement (str): SQL run once per range with the `:start` and `:end` parameters.
+        key (str): Integer primary-key column of `table_name`.
+        batch_size (int | None): Keys per range; defaults to `MIGRATION_BATCH_SIZE`.
+        sleep_seconds (float | None): Pause between ranges; defaults to `MIGRATION_BATCH_SLEEP_SECONDS`.
+        dialects (Sequence[str] | None): Database dialects `statement` is written
+            for. On any other one the backfill fails unless the table is empty.
+
+    Returns:
+        int: Rows affected by this run.
+
+    Raises:
+        RuntimeError: In offline (`--sql`) mode, or on an unsupported dialect
+            with rows to backfill.
+    """
+    if op.get_context().as_sql:
+        raise RuntimeError(f"Backfill {name!r} needs a database connection; it cannot run in offline (--sql) mode")
+    batch_size = batch_size or settings.MIGRATION_BATCH_SIZE
+    sleep_seconds = settings.MIGRATION_BATCH_SLEEP_SECONDS if sleep_seconds is None else sleep_seconds
+
+    # Se confirma el DDL anterior: los lotes usan sus propias conexiones y transacciones
+    with op.get_context().autocommit_block():
+        engine = op.get_bind().engine
+        with engine.begin() as conn:
+            progress_table.create(conn, checkfirst=True)
+            progress = conn.execute(select(progress_table).where(progress_table.c.name == name)).first()
+            first, last = conn.execute(text(f"SELECT min({key}), max({key}) FROM {table_name}")).one()
+            if dialects and conn.dialect.name not in dialects and last is not None:
+                raise RuntimeError(
+                    f"Backfill {name!r} only supports {', '.join(dialects)}, not {conn.dialect.name}"
+                )
+            if progress is None:
+                conn.execute(progress_table.insert().values(name=name, last_key=(first or 1) - 1, done=False))
+        if progress is not None and progress.done:
+            logger.info("Backfill %s already completed", name)
+            return 0
+
+        start = origin = progress.last_key + 1 if progress is not None else (first or 1)
+        if progress is not None:
+            logger.info("Resuming backfill %s from %s=%s", name, key, start)
+        affected = 0
+        started = time.monotonic()
+        while last is not None and start <= last:
+            end = min(start + batch_size, last + 1)
+            with engine.begin() as conn:
+                apply_timeouts(conn)
+                affected += max(conn.execute(text(statement), {"start": start, "end": end}).rowcount, 0)
+                conn.execute(
+                    progress_table.update()
+                    .where(progress_table.c.name == name)
+                    .values(last_key=end - 1, updated_at=func.now())
+                )
+            logger.info(
+                "Backfill %s: %s %s/%s (%.0f%%), %s rows, %.1fs",
+                name, key, end - 1, last, 100 * (end - origin) / (last - origin + 1), affected,
+                time.monotonic() - started,
+            )
+            start = end
+            if sleep_seconds and start <= last:
+                time.sleep(sleep_seconds)
+
+        with engine.begin() as conn:
+            conn.execute(
+                progress_table.update().where(progress_table.c.name == name).values(done=True, updated_at=func.now())
+            )
+    logger.info("Backfill %s completed: %s rows", name, affected)
+    return affected
+
+
+def reset_backfill(name: str) -> None:
+    """
+    Forget the progress of backfill `name`, so it runs again on the next
+    upgrade. Call it from the `downgrade` that drops what the backfill wrote.
+    """
+    if op.get_context().as_sql:
+        op.execute(progress_table.delete().where(progress_table.c.name == name))
+        return
+    # Con su propia transacción, como el progreso que escribe `backfill`
+    with op.get_context().autocommit_block():
+        with op.get_bind().engine.begin() as conn:
+            if inspect(conn).has_table(PROGRESS_TABLE):
+                conn.execute(progress_table.delete().where(progress_table.c.name == name))
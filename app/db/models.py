@@ -1,7 +1,32 @@
-from sqlalchemy import Column, Integer, String, Text, DateTime, func, UniqueConstraint, Index, text
+from sqlalchemy import Column, Integer, SmallInteger, BigInteger, LargeBinary, String, Text, DateTime, Float, func, UniqueConstraint, Index, text
 from app.db.base import Base
 from datetime import datetime
 
+
+def _not_postgresql(ddl, target, bind, dialect=None, **kw) -> bool:
+    return dialect is not None and dialect.name != "postgresql"
+
+
+def _newest_first_index(name, *leading, **kwargs):
+    """
+    Build an index on `leading` columns followed by `published_at DESC NULLS
+    LAST, id DESC`, the order used by `ArticleRepository.list`, so filtered
+    listings are served by an index scan without a sort step.
+
+    PostgreSQL needs `NULLS LAST` spelled out to match the query ordering;
+    SQLite rejects it in index definitions but already sorts NULLs last in a
+    descending index, so each dialect gets its own DDL under the same name.
+    """
+    published_at = kwargs.pop("published_at")
+    article_id = kwargs.pop("article_id")
+    return (
+        Index(name, *leading, published_at.desc().nulls_last(), article_id.desc(), **kwargs)
+        .ddl_if(dialect="postgresql"),
+        Index(name, *leading, published_at.desc(), article_id.desc(), **kwargs)
+        .ddl_if(callable_=_not_postgresql),
+    )
+
+
 class Article(Base):
     
     """
@@ -24,14 +49,21 @@ class Article(Base):
         UniqueConstraint('title', 'author', name='uix_title_author'): 
             Ensures that the same author cannot publish multiple articles 
             with the same title.
-        Index('ix_articles_author', 'author'): 
-            Improves query performance for lookups by author.
-        Index('ix_articles_published_at', 'published_at'): 
-            Optimizes filtering and sorting by publication date.
+        Index('ix_articles_author_published_at_id', author, published_at DESC, id DESC):
+            Serves "articles by author X, newest first" with a single index scan.
+        Index('ix_articles_published_at_id_published', published_at DESC, id DESC)
+            WHERE published_at IS NOT NULL:
+            Partial index for published-date range listings, which never match drafts.
+        Index('ix_articles_published_at_id', published_at DESC, id DESC):
+            Serves the unfiltered listing, newest first, without a sort step.
+        Index('ix_articles_author_published_at_id_asc', author, published_at, id):
+            Serves "articles by author X, oldest first". Ascending order keeps
+            each database's default NULL placement (drafts last on PostgreSQL),
+            which is not the reverse of the newest-first indexes.
     """
     __tablename__ = "articles"
 
-    id = Column(Integer, primary_key=True, index=True)
+    id = Column(Integer, primary_key=True)
     title = Column(String(255), nullable=False)
     author = Column(String(150), nullable=False)
     body = Column(Text, nullable=False)
@@ -41,6 +73,127 @@ class Article(Base):
     updated_at = Column(DateTime(timezone=True), server_default=func.now(), onupdate=func.now(), nullable=False)
     __table_args__ = (
         UniqueConstraint("title", "author", name="uix_title_author"),
-        Index("ix_articles_author", "author"),
-        Index("ix_articles_published_at", "published_at"),
-    )
\ No newline at end of file
+        *_newest_first_index(
+            "ix_articles_author_published_at_id", author, published_at=published_at, article_id=id
+        ),
+        *_newest_first_index(
+            "ix_articles_published_at_id_published",
+            published_at=published_at,
+            article_id=id,
+            postgresql_where=published_at.isnot(None),
+            sqlite_where=published_at.isnot(None),
+        ),
+        *_newest_first_index("ix_articles_published_at_id", published_at=published_at, article_id=id),
+        Index("ix_articles_author_published_at_id_asc", author, published_at, id),
+    )
+
+class ArticleFacetCount(Base):
+    """
+    Database model for the `article_facet_counts` table.
+
+    Incrementally maintained facet counters, updated in the same transaction
+    as every article create, update and delete (see `FacetRepository`), so
+    facet counts are served without a `GROUP BY` over `articles`.
+
+    Attributes:
+        scope (str): `""` for counts over all articles, or `author:<name>` for
+            counts restricted to one author's articles.
+        field (str): Facet field: `total`, `author` or `tags`.
+        value (str): Facet value (author name or tag; `""` for `total`).
+        count (int): Number of articles in the scope with that value.
+    """
+    __tablename__ = "article_facet_counts"
+
+    scope = Column(String(160), primary_key=True)
+    field = Column(String(16), primary_key=True)
+    value = Column(String(255), primary_key=True)
+    count = Column(Integer, nullable=False, default=0)
+
+
+class ArticleTag(Base):
+    """
+    Database model for the `article_tags` table.
+
+    Inverted index from each tag to the articles carrying it, maintained by
+    `RelatedRepository`. Lets related-article candidates be found with index
+    range scans instead of `ILIKE` over `articles.tags`.
+
+    Attributes:
+        tag (str): A single tag.
+        article_id (int): Article carrying the tag.
+
+    Table Args:
+        Index('ix_article_tags_article_id', article_id): Removes an article's tags on update or delete.
+    """
+    __tablename__ = "article_tags"
+
+    tag = Column(String(255), primary_key=True)
+    article_id = Column(Integer, primary_key=True)
+    __table_args__ = (Index("ix_article_tags_article_id", "article_id"),)
+
+
+class ArticleRelated(Base):
+    """
+    Database model for the `article_related` table.
+
+    Precomputed related-article index: the top `RELATED_INDEX_SIZE` most
+    similar articles of every article, by tag Jaccard similarity plus a
+    same-author boost (see `RelatedRepository`).
+
+    Attributes:
+        article_id (int): Article whose related list this row belongs to.
+        related_id (int): A related article.
+        score (float): Similarity score, higher is more related.
+
+    Table Args:
+        Index('ix_article_related_related_id', related_id): Finds the lists an
+            article appears in, to update them when it changes.
+    """
+    __tablename__ = "article_related"
+
+    article_id = Column(Integer, primary_key=True)
+    related_id = Column(Integer, primary_key=True)
+    score = Column(Float, nullable=False)
+    __table_args__ = (Index("ix_article_related_related_id", "related_id"),)
+
+
+class ArticleMinHash(Base):
+    """
+    Database model for the `article_minhash` table.
+
+    MinHash signature of every article's title and body, used to estimate the
+    similarity of near-duplicate candidates (see `DuplicateRepository`).
+
+    Attributes:
+        article_id (int): The article.
+        signature (bytes): `MINHASH_PERMUTATIONS` little-endian 32-bit minimum hashes.
+    """
+    __tablename__ = "article_minhash"
+
+    article_id = Column(Integer, primary_key=True)
+    signature = Column(LargeBinary, nullable=False)
+
+
+class ArticleLshBucket(Base):
+    """
+    Database model for the `article_lsh_buckets` table.
+
+    Locality-sensitive hashing index over the MinHash signatures: one row per
+    article and band, keyed by the hash of that band. Articles sharing any
+    bucket are near-duplicate candidates, found with primary-key lookups.
+
+    Attributes:
+        band (int): Band number, from 0 to `MINHASH_BANDS - 1`.
+        bucket (int): 64-bit hash of the band's rows of the signature.
+        article_id (int): The article.
+
+    Table Args:
+        Index('ix_article_lsh_buckets_article_id', article_id): Removes an
+            article's buckets on update or delete.
+    """
+    __tablename__ = "article_lsh_buckets"
+
+    band = Column(SmallInteger, primary_key=True)
+    bucket = Column(BigInteger, primary_key=True)
+    article_id = Column(Integer, primary_key=True)
+    __table_args__ = (Index("ix_article_lsh_buckets_article_id", "article_id"),)
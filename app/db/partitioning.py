@@ -0,0 +1,321 @@
+import argparse
+import logging
+from dataclasses import dataclass
+from datetime import date
+from typing import Iterable, List, Optional
+
+from sqlalchemy import text
+from sqlalchemy.engine import Connection
+from sqlalchemy.orm import Session
+
+from app.cache.bloom import ArticleBloomFilter
+from app.cache.redis_wrapper import CacheWrapper
+from app.core.config import settings
+from app.repositories.duplicate_repository import DuplicateRepository
+from app.repositories.facet_repository import FacetRepository
+from app.repositories.related_repository import RelatedRepository
+
+"""
+Declarative range partitioning of the `articles` table (PostgreSQL only).
+
+Almost all traffic touches recent articles, so `articles` can be converted into
+a table partitioned by `published_at`, monthly or yearly
+(`ARTICLES_PARTITION_INTERVAL`). Drafts (`published_at IS NULL`) and any row
+outside the created ranges land in the `articles_default` partition. Queries
+bounded by `published_after`/`published_before` are pruned to the matching
+partitions, and vacuum/index maintenance only works on the partitions that
+actually change.
+
+PostgreSQL requires unique constraints on a partitioned table to include the
+partition key, so `uix_title_author` can no longer live on `articles` itself.
+It is preserved by the `article_title_author_keys` table, whose primary key
+(named `uix_title_author`) is maintained by a row trigger on `articles`: a
+duplicate (title, author) fails the statement exactly as before.
+
+The same rule rules out `PRIMARY KEY (id)`, and `(id, published_at)` is not
+possible either because drafts have a NULL `published_at`. Article ids keep
+coming from the original sequence, `id` stays indexed on every partition, and
+the `article_id` column of `article_title_author_keys` is `UNIQUE`, so an
+explicit duplicate id is rejected by the same trigger.
+
+Archiving a partition also removes its articles from the derived data: facet
+counters, the related-articles and near-duplicate indexes, and their cache
+entries. The Bloom filter of existing ids is rebuilt afterwards.
+
+Maintenance commands:
+
+    python -m app.db.partitioning convert            # one-off, in a maintenance window
+    python -m app.db.partitioning ensure             # create upcoming partitions (cron)
+    python -m app.db.partitioning archive --mode detach|archive|drop
+
+`ensure` must run ahead of time: a partition cannot be attached while rows for
+its range sit in the default partition.
+"""
+
+logger = logging.getLogger(__name__)
+
+ARCHIVE_SCHEMA = "articles_archive"
+DEFAULT_PARTITION = "articles_default"
+
+
+@dataclass(frozen=True)
+class PartitionRange:
+    """A partition of `articles` covering `[start, end)`."""
+
+    name: str
+    start: date
+    end: date
+
+
+def _add_months(day: date, months: int) -> date:
+    month_index = day.year * 12 + day.month - 1 + months
+    return date(month_index // 12, month_index % 12 + 1, 1)
+
+
+def partition_for(day: date, interval: str) -> PartitionRange:
+    """Return the partition containing `day` for the given interval."""
+    if interval == "year":
+        start = date(day.year, 1, 1)
+        return PartitionRange(f"articles_p{day.year}", start, date(day.year + 1, 1, 1))
+    if interval == "month":
+        start = date(day.year, day.month, 1)
+        return PartitionRange(f"articles_p{day.year}_{day.month:02d}", start, _add_months(start, 1))
+    raise ValueError(f"Unsupported partition interval: {interval!r}")
+
+
+def partition_ranges(first: date, last: date, interval: str) -> List[PartitionRange]:
+    """Return the consecutive partitions covering `first` through `last`."""
+    ranges = []
+    current = partition_for(first, interval)
+    while current.start <= last:
+        ranges.append(current)
+        current = partition_for(current.end, interval)
+    return ranges
+
+
+def _create_partition_sql(partition: PartitionRange) -> str:
+    return (
+        f"CREATE TABLE IF NOT EXISTS {partition.name} PARTITION OF articles "
+        f"FOR VALUES FROM ('{partition.start.isoformat()}') TO ('{partition.end.isoformat()}')"
+    )
+
+
+def conversion_statements(partitions: Iterable[PartitionRange]) -> List[str]:
+    """
+    SQL converting the plain `articles` table into a partitioned one.
+
+    The data is copied into the new table, which then takes over the name,
+    the id sequence and the indexes; the old table is kept as
+    `articles_unpartitioned` until dropped manually.
+    """
+    statements = [
+        "LOCK TABLE articles IN ACCESS EXCLUSIVE MODE",
+        "CREATE TABLE articles_partitioned (LIKE articles INCLUDING DEFAULTS INCLUDING STORAGE) "
+        "PARTITION BY RANGE (published_at)",
+        f"CREATE TABLE {DEFAULT_PARTITION} PARTITION OF articles_partitioned DEFAULT",
+    ]
+    statements += [
+        _create_partition_sql(p).replace("PARTITION OF articles ", "PARTITION OF articles_partitioned ")
+        for p in partitions
+    ]
+    statements += [
+        "INSERT INTO articles_partitioned SELECT * FROM articles",
+        "ALTER SEQUENCE articles_id_seq OWNED BY articles_partitioned.id",
+        "ALTER TABLE articles RENAME TO articles_unpartitioned",
+        "ALTER TABLE articles_unpartitioned RENAME CONSTRAINT uix_title_author TO uix_title_author_unpartitioned",
+        "ALTER TABLE articles_partitioned RENAME TO articles",
+        # Índices del padre: se crean en cada partición, presente y futura
+        "CREATE INDEX ix_articles_part_id ON articles (id)",
+        "CREATE INDEX ix_articles_part_author_published_at_id ON articles (author, published_at DESC NULLS LAST, id DESC)",
+        "CREATE INDEX ix_articles_part_published_at_id ON articles (published_at DESC NULLS LAST, id DESC)",
+        "CREATE INDEX ix_articles_part_author_published_at_id_asc ON articles (author, published_at, id)",
+        # Unicidad (title, author) entre particiones
+        "CREATE TABLE article_title_author_keys ("
+        " title VARCHAR(255) NOT NULL, author VARCHAR(150) NOT NULL, article_id INTEGER NOT NULL,"
+        " CONSTRAINT uix_title_author PRIMARY KEY (title, author),"
+        " CONSTRAINT uq_article_title_author_keys_article_id UNIQUE (article_id))",
+        "INSERT INTO article_title_author_keys (title, author, article_id) SELECT title, author, id FROM articles",
+        """
+        CREATE OR REPLACE FUNCTION articles_title_author_keys() RETURNS trigger AS $$
+        BEGIN
+            IF TG_OP IN ('DELETE', 'UPDATE') THEN
+                DELETE FROM article_title_author_keys WHERE title = OLD.title AND author = OLD.author;
+            END IF;
+            IF TG_OP IN ('INSERT', 'UPDATE') THEN
+                INSERT INTO article_title_author_keys (title, author, article_id)
+                VALUES (NEW.title, NEW.author, NEW.id);
+            END IF;
+            RETURN NULL;
+        END;
+        $$ LANGUAGE plpgsql
+        """,
+        "CREATE TRIGGER trg_articles_title_author_keys AFTER INSERT OR UPDATE OF id, title, author OR DELETE "
+        "ON articles FOR EACH ROW EXECUTE FUNCTION articles_title_author_keys()",
+        "ANALYZE articles",
+    ]
+    return statements
+
+
+def existing_partitions(conn: Connection) -> List[str]:
+    """Names of the partitions currently attached to `articles`."""
+    rows = conn.execute(text(
+        "SELECT c.relname FROM pg_inherits i "
+        "JOIN pg_class c ON c.oid = i.inhrelid "
+        "JOIN pg_class p ON p.oid = i.inhparent "
+        "WHERE p.relname = 'articles' ORDER BY c.relname"
+    ))
+    return [row[0] for row in rows]
+
+
+def is_partitioned(conn: Connection) -> bool:
+    return bool(conn.execute(text(
+        "SELECT 1 FROM pg_partitioned_table pt JOIN pg_class c ON c.oid = pt.partrelid "
+        "WHERE c.relname = 'articles'"
+    )).scalar())
+
+
+def convert(conn: Connection, interval: str, premake: int, today: Optional[date] = None) -> None:
+    """Convert `articles` into a partitioned table covering existing data and `premake` future periods."""
+    if is_partitioned(conn):
+        logger.info("articles is already partitioned")
+        return
+    today = today or date.today()
+    oldest = conn.execute(text("SELECT min(published_at) FROM articles")).scalar()
+    first = oldest.date() if oldest else today
+    last = _add_months(today, premake) if interval == "month" else date(today.year + premake, 1, 1)
+    for statement in conversion_statements(partition_ranges(first, last, interval)):
+        conn.execute(text(statement))
+    logger.info("articles converted to %s partitions", interval)
+
+
+def ensure(conn: Connection, interval: str, premake: int, today: Optional[date] = None) -> List[str]:
+    """Create the partitions for the current and the next `premake` periods."""
+    today = today or date.today()
+    last = _add_months(today, premake) if interval == "month" else date(today.year + premake, 1, 1)
+    existing = set(existing_partitions(conn))
+    created = []
+    for partition in partition_ranges(today, last, interval):
+        if partition.name not in existing:
+            conn.execute(text(_create_partition_sql(partition)))
+            created.append(partition.name)
+    return created
+
+
+def expired_partitions(names: Iterable[str], retention_months: int, today: date) -> List[str]:
+    """
+    Partitions whose whole range ends before the retention horizon.
+    The default partition is never expired.
+    """
+    horizon = _add_months(date(today.year, today.month, 1), -retention_months)
+    expired = []
+    for name in names:
+        suffix = name.removeprefix("articles_p")
+        if name == DEFAULT_PARTITION or suffix == name:
+            continue
+        parts = suffix.split("_")
+        if len(parts) == 2:
+            end = _add_months(date(int(parts[0]), int(parts[1]), 1), 1)
+        else:
+            end = date(int(parts[0]) + 1, 1, 1)
+        if end <= horizon:
+            expired.append(name)
+    return expired
+
+
+def purge_derived(conn: Connection, partition: str, batch_size: int = 1000) -> int:
+    """
+    Remove the articles of `partition` from the facet counters, the related
+    and near-duplicate indexes and the cache, in the transaction of `conn`.
+    Returns the number of articles removed.
+    """
+    cache = CacheWrapper()
+    facets, related, duplicates = FacetRepository(), RelatedRepository(), DuplicateRepository()
+    removed, last_id = 0, 0
+    with Session(bind=conn) as db:
+        while True:
+            rows = db.execute(
+                text(f"SELECT id, author, tags FROM {partition} WHERE id > :last_id ORDER BY id LIMIT :limit"),
+                {"last_id": last_id, "limit": batch_size},
+            ).all()
+            if not rows:
+                break
+            article_ids = [row.id for row in rows]
+            facets.remove_many(db, [(row.author, row.tags) for row in rows])
+            affected = related.remove_many(db, article_ids)
+            duplicates.remove_many(db, article_ids)
+            cache.invalidate_many(article_ids)
+            cache.invalidate_related(article_ids + affected)
+            removed += len(rows)
+            last_id = article_ids[-1]
+    return removed
+
+
+def archive(conn: Connection, retention_months: int, mode: str, today: Optional[date] = None) -> List[str]:
+    """
+    Detach partitions older than the retention period and remove their
+    articles from the derived data (`purge_derived`).
+
+    Detached and archived rows keep their (title, author) and id reserved, so
+    the uniqueness guarantees still cover them; only `drop` releases them.
+
+    Modes:
+        detach: leave the detached table in place (no longer queried).
+        archive: detach and move it to the `articles_archive` schema, the
+            archive tier, which can be placed on cheaper storage.
+        drop: detach and drop it.
+    """
+    today = today or date.today()
+    expired = expired_partitions(existing_partitions(conn), retention_months, today)
+    if mode == "archive":
+        conn.execute(text(f"CREATE SCHEMA IF NOT EXISTS {ARCHIVE_SCHEMA}"))
+    for name in expired:
+        logger.info("Removed %d articles of %s from the derived tables", purge_derived(conn, name), name)
+        if mode == "drop":
+            # Las filas archivadas siguen reservando su (title, author); las borradas no
+            conn.execute(text(
+                f"DELETE FROM article_title_author_keys k USING {name} a "
+                "WHERE k.title = a.title AND k.author = a.author"
+            ))
+        conn.execute(text(f"ALTER TABLE articles DETACH PARTITION {name}"))
+        if mode == "archive":
+            conn.execute(text(f"ALTER TABLE {name} SET SCHEMA {ARCHIVE_SCHEMA}"))
+        elif mode == "drop":
+            conn.execute(text(f"DROP TABLE {name}"))
+    return expired
+
+
+def main(argv: Optional[List[str]] = None) -> None:
+    parser = argparse.ArgumentParser(description="Manage the partitions of the articles table.")
+    parser.add_argument("command", choices=["convert", "ensure", "archive", "list"])
+    parser.add_argument("--interval", choices=["month", "year"], default=settings.ARTICLES_PARTITION_INTERVAL)
+    parser.add_argument("--premake", type=int, default=settings.ARTICLES_PARTITION_PREMAKE)
+    parser.add_argument("--retention-months", type=int, default=settings.ARTICLES_PARTITION_RETENTION_MONTHS)
+    parser.add_argument("--mode", choices=["detach", "archive", "drop"], default="archive")
+    args = parser.parse_args(argv)
+
+    from app.db.session import engine
+
+    if engine.dialect.name != "postgresql":
+        raise SystemExit("Partitioning is only supported on PostgreSQL.")
+
+    with engine.begin() as conn:
+        if args.command == "convert":
+            convert(conn, args.interval, args.premake)
+        elif args.command == "ensure":
+            print("Created:", ", ".join(ensure(conn, args.interval, args.premake)) or "nothing")
+        elif args.command == "archive":
+            expired = archive(conn, args.retention_months, args.mode)
+            print(f"{args.mode}:", ", ".join(expired) or "nothing")
+        else:
+            print("\n".join(existing_partitions(conn)))
+
+    if args.command == "archive" and expired:
+        # El filtro de Bloom no permite quitar ids: se reconstruye sin los archivados
+        from app.db.session import SessionLocal
+
+        with SessionLocal() as db:
+            ArticleBloomFilter().rebuild(db)
+
+
+if __name__ == "__main__":
+    main()
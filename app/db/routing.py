@@ -0,0 +1,159 @@
+import math
+import time
+from contextvars import ContextVar
+from dataclasses import dataclass
+from typing import Optional
+
+from fastapi import Request
+from sqlalchemy import event, text
+from sqlalchemy.engine import Engine
+from sqlalchemy.orm import Session
+from sqlalchemy.pool import Pool
+
+from app.core.config import settings
+from app.db import session as db_session
+
+"""
+Read-replica routing with read-your-writes consistency.
+
+Reads are served by `ReaderSessionLocal` (the replica) and writes by
+`SessionLocal` (the primary). Because the replica lags behind, a client that
+just wrote must keep reading from the primary until the replica has replayed
+its write. After every commit on the primary a consistency token is returned to
+the client, both as the `X-Read-After` response header and as a cookie of the
+same name, valid for `REPLICA_MAX_LAG_SECONDS`:
+
+    - `lsn:<LSN>` on PostgreSQL: the WAL position of the primary after the
+      commit, read on the committing connection as it is returned to the pool
+      (no extra connection). Reads go to the replica once
+      `pg_last_wal_replay_lsn()` has reached it.
+    - `ts:<epoch>` on other backends: reads go to the primary until
+      `REPLICA_MAX_LAG_SECONDS` have elapsed since the write.
+
+Attributes:
+    CONSISTENCY_TOKEN_NAME (str): Header and cookie carrying the token.
+"""
+
+CONSISTENCY_TOKEN_NAME = "X-Read-After"
+
+# Marca en la conexión del primario: al devolverla al pool se lee su LSN
+_LSN_PENDING = "consistency_lsn_pending"
+
+
+@dataclass
+class ConsistencyState:
+    """Consistency tokens received with the request and produced while serving it."""
+
+    received: Optional[str] = None
+    issued: Optional[str] = None
+
+
+_consistency: ContextVar[Optional[ConsistencyState]] = ContextVar("consistency", default=None)
+
+
+def replica_enabled() -> bool:
+    return db_session.replica_engine is not db_session.engine
+
+
+def _timestamp_token() -> str:
+    return f"ts:{time.time():.3f}"
+
+
+@event.listens_for(Engine, "commit")
+def _mark_primary_commit(conn) -> None:
+    if _consistency.get() is None or not replica_enabled():
+        return
+    if conn.engine is db_session.engine and conn.engine.dialect.name == "postgresql":
+        conn.info[_LSN_PENDING] = True
+
+
+@event.listens_for(Pool, "reset")
+def _issue_lsn_token_on_release(dbapi_connection, connection_record, reset_state) -> None:
+    # La sesión devuelve la conexión justo tras el commit: se lee el LSN antes de soltarla
+    if not connection_record.info.pop(_LSN_PENDING, False):
+        return
+    state = _consistency.get()
+    if state is None or not reset_state.asyncio_safe:
+        return
+    cursor = dbapi_connection.cursor()
+    try:
+        cursor.execute("SELECT pg_current_wal_lsn()")
+        state.issued = f"lsn:{cursor.fetchone()[0]}"
+    except Exception:
+        # Sin LSN, el token de tiempo mantiene read-your-writes de forma conservadora
+        state.issued = _timestamp_token()
+    finally:
+        cursor.close()
+        dbapi_connection.rollback()
+
+
+@event.listens_for(db_session.SessionLocal, "after_commit")
+def _issue_token_after_commit(session: Session) -> None:
+    state = _consistency.get()
+    if state is None or not replica_enabled():
+        return
+    if db_session.engine.dialect.name != "postgresql":
+        state.issued = _timestamp_token()
+
+
+def replica_caught_up(token: Optional[str]) -> bool:
+    """
+    Tell whether the replica already reflects the write identified by `token`.
+
+    Malformed tokens are ignored (treated as caught up), so a tampered cookie can
+    at worst cost the client its own read-your-writes guarantee.
+    """
+    if not token:
+        return True
+    kind, _, value = token.partition(":")
+    if kind == "ts":
+        try:
+            return time.time() - float(value) >= settings.REPLICA_MAX_LAG_SECONDS
+        except ValueError:
+            return True
+    if kind == "lsn" and db_session.replica_engine.dialect.name == "postgresql":
+        try:
+            with db_session.replica_engine.connect() as conn:
+                return bool(conn.execute(
+                    text("SELECT pg_last_wal_replay_lsn() >= CAST(:lsn AS pg_lsn)"), {"lsn": value}
+                ).scalar())
+        except Exception:
+            # Réplica no disponible o LSN inválido: leer del primario es siempre correcto
+            return False
+    return True
+
+
+def reader_session() -> Session:
+    """
+    Open a session for a read: on the replica, unless the client must still be
+    pinned to the primary to see its own writes.
+    """
+    state = _consistency.get()
+    if replica_enabled() and replica_caught_up(state.received if state else None):
+        return db_session.ReaderSessionLocal()
+    return db_session.SessionLocal()
+
+
+async def consistency_middleware(request: Request, call_next):
+    """
+    HTTP middleware reading the client's consistency token and returning a new
+    one after requests that committed a write on the primary.
+    """
+    state = ConsistencyState(
+        received=request.headers.get(CONSISTENCY_TOKEN_NAME) or request.cookies.get(CONSISTENCY_TOKEN_NAME)
+    )
+    token = _consistency.set(state)
+    try:
+        response = await call_next(request)
+    finally:
+        _consistency.reset(token)
+    if state.issued:
+        response.headers[CONSISTENCY_TOKEN_NAME] = state.issued
+        response.set_cookie(
+            CONSISTENCY_TOKEN_NAME,
+            state.issued,
+            max_age=math.ceil(settings.REPLICA_MAX_LAG_SECONDS),
+            httponly=True,
+            samesite="lax",
+        )
+    return response
@@ -1,7 +1,13 @@
+import os
+import threading
+from typing import Any, Callable, Dict
 from sqlalchemy import create_engine
-from sqlalchemy.orm import sessionmaker
-from app.core.config import settings
+from sqlalchemy.engine import Engine
+from sqlalchemy.engine import make_url
+from sqlalchemy.pool import NullPool
+from sqlalchemy.orm import Session, sessionmaker
 from app.core.config import settings
+from app.core import logging_config, metrics, profiling, tracing
 
 
 """
@@ -11,22 +17,152 @@ This module initializes the synchronous SQLAlchemy engine and session factory
 used throughout the application for database interactions. It relies on 
 the configuration values defined in `settings.DATABASE_URL`.
 
+Engines are created lazily: importing this module builds nothing, so the
+application imports fast and a worker that never touches the database never
+loads its driver. `init_engines()` runs from the application lifespan, and
+otherwise on the first session opened or first access to `engine` /
+`replica_engine`.
+
 Attributes:
     engine (sqlalchemy.engine.Engine): 
         The SQLAlchemy database engine configured with connection pooling.
     SessionLocal (sqlalchemy.orm.session.sessionmaker): 
         Factory for creating new database sessions with controlled 
         commit and flush behavior.
+    replica_engine (sqlalchemy.engine.Engine):
+        Engine for the read replica configured in `DATABASE_REPLICA_URL`,
+        or the primary `engine` itself when no replica is configured.
+    ReaderSessionLocal (sqlalchemy.orm.session.sessionmaker):
+        Factory for read-only sessions bound to `replica_engine`.
 
 Notes:
-    The engine uses `pool_pre_ping=True` to ensure that connections 
-    are valid before being used, preventing stale or dropped connections.
+    Pool sizing, overflow, checkout timeout, recycling and pre-ping are driven
+    by the `DB_POOL_*` settings. With `DB_PGBOUNCER_MODE` the engine keeps no
+    pool of its own (PgBouncer does the pooling) and server-side prepared
+    statements are disabled for the drivers that use them, since they do not
+    survive transaction-level pooling.
 """
 
 
+def engine_options(url: str) -> Dict[str, Any]:
+    """
+    Build the `create_engine` keyword arguments for the given database URL.
+
+    Args:
+        url (str): Database connection URL.
+
+    Returns:
+        Dict[str, Any]: Pool and driver options derived from the settings.
+    """
+    backend = make_url(url)
+    options: Dict[str, Any] = {"pool_pre_ping": settings.DB_POOL_PRE_PING}
+
+    if backend.get_backend_name() == "sqlite":
+        options["connect_args"] = {"check_same_thread": False}
+        return options
+
+    if settings.DB_PGBOUNCER_MODE:
+        options["poolclass"] = NullPool
+        driver = backend.get_driver_name()
+        if driver == "psycopg":
+            options["connect_args"] = {"prepare_threshold": None}
+        elif driver == "asyncpg":
+            options["connect_args"] = {"statement_cache_size": 0, "prepared_statement_cache_size": 0}
+        # psycopg2 nunca usa prepared statements del lado del servidor
+        return options
+
+    options.update(
+        pool_size=settings.DB_POOL_SIZE,
+        max_overflow=settings.DB_MAX_OVERFLOW,
+        pool_timeout=settings.DB_POOL_TIMEOUT,
+        pool_recycle=settings.DB_POOL_RECYCLE,
+    )
+    return options
+
+
+def pool_status() -> Dict[str, int]:
+    """
+    Return an in-memory snapshot of the connection pool usage.
+
+    Pools that do not keep connections (e.g. `NullPool`) only report the
+    figures they track.
+    """
+    pool = get_engine().pool
+    stats = {}
+    for name in ("size", "checkedin", "checkedout", "overflow"):
+        getter = getattr(pool, name, None)
+        if getter is not None:
+            stats[name] = getter()
+    return stats
+
+
 SQLALCHEMY_DATABASE_URL = settings.DATABASE_URL
 
-engine = create_engine(
-    SQLALCHEMY_DATABASE_URL, connect_args={"check_same_thread": False} if "sqlite" in SQLALCHEMY_DATABASE_URL else {}
-)
-SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
\ No newline at end of file
+def _instrument(engine, name: str) -> None:
+    metrics.instrument_engine(engine, name)
+    profiling.instrument_engine(engine)
+    logging_config.instrument_engine(engine)
+    tracing.instrument_engine(engine)
+
+
+_engines: Dict[str, Engine] = {}
+_engines_lock = threading.Lock()
+
+
+def init_engines() -> None:
+    """Create (once) the primary and replica engines and bind the session factories."""
+    if _engines:
+        return
+    with _engines_lock:
+        if _engines:
+            return
+        primary = create_engine(SQLALCHEMY_DATABASE_URL, **engine_options(SQLALCHEMY_DATABASE_URL))
+        _instrument(primary, "primary")
+        if settings.DATABASE_REPLICA_URL:
+            replica = create_engine(settings.DATABASE_REPLICA_URL, **engine_options(settings.DATABASE_REPLICA_URL))
+            _instrument(replica, "replica")
+        else:
+            replica = primary
+        SessionLocal.configure(bind=primary)
+        ReaderSessionLocal.configure(bind=replica)
+        _engines.update(primary=primary, replica=replica)
+
+
+def get_engine() -> Engine:
+    init_engines()
+    return _engines["primary"]
+
+
+def get_replica_engine() -> Engine:
+    init_engines()
+    return _engines["replica"]
+
+
+def _dispose_after_fork() -> None:
+    # close=False: las conexiones heredadas pertenecen al padre y no se cierran aquí
+    for pooled_engine in set(_engines.values()):
+        pooled_engine.dispose(close=False)
+
+
+os.register_at_fork(after_in_child=_dispose_after_fork)
+
+
+class LazySessionmaker(sessionmaker):
+    """`sessionmaker` that creates the engines on the first session it opens."""
+
+    def __call__(self, **local_kw: Any) -> Session:
+        init_engines()
+        return super().__call__(**local_kw)
+
+
+SessionLocal = LazySessionmaker(autocommit=False, autoflush=False)
+ReaderSessionLocal = LazySessionmaker(autocommit=False, autoflush=False)
+
+_LAZY_ATTRIBUTES: Dict[str, Callable[[], Engine]] = {"engine": get_engine, "replica_engine": get_replica_engine}
+
+
+def __getattr__(name: str) -> Engine:
+    # `engine` y `replica_engine` se resuelven al primer acceso (PEP 562)
+    if name in _LAZY_ATTRIBUTES:
+        return _LAZY_ATTRIBUTES[name]()
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
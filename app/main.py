@@ -1,22 +1,79 @@
+import logging
+import threading
+from contextlib import asynccontextmanager
 from fastapi import FastAPI, Depends, APIRouter
 from fastapi.middleware.cors import CORSMiddleware
-from redis import RedisError
-from sqlalchemy.exc import SQLAlchemyError
-from app.db.session import SessionLocal
+from app.cache import redis_wrapper
+from app.cache.bloom import bloom_refresher
+from app.db.session import SessionLocal, init_engines, pool_status
 from app.core.config import settings
-from app.api.v1 import articles
+from app.api.v1 import admin, articles
 from app.api.deps import require_api_key, rate_limiter
-from app.cache.redis_wrapper import get_redis_client
-from app.cache.redis_wrapper import redis_client
-from sqlalchemy import text
+from app.core.metrics import metrics_middleware, render_metrics
+from app.core.profiling import profiling_middleware
+from app.core.tracing import tracing_middleware
+from app.core.logging_config import request_id_middleware, setup_logging
+from app.core.health import health_monitor
+from app.db.routing import consistency_middleware
+from app.core.admission import admission_middleware
+from app.services.article_service import ArticleService
+
+
+setup_logging()
+logger = logging.getLogger(__name__)
+
+
+def warm_cache_on_startup() -> None:
+    """Prewarm the cache with the hottest articles; failures only cost cold misses."""
+    db = SessionLocal()
+    try:
+        warmed = ArticleService(db).warm_cache(settings.HOT_KEY_TOP_N)
+        logger.info("Cache prewarmed with %d hot articles", warmed)
+    except Exception:
+        logger.exception("Cache prewarm failed")
+    finally:
+        db.close()
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    """
+    Create the process resources and start background workers on startup;
+    stop them on shutdown.
+
+    Importing `app.main` creates no engine, client or connection. The engines
+    and the Redis client are built here, without connecting (pools connect on
+    first use), and nothing slow blocks startup: health checks, the cache
+    prewarm and the article-id Bloom filter rebuilds run in background threads.
+    """
+    init_engines()
+    redis_wrapper.client()
+    health_monitor.start()
+    bloom_refresher.start()
+    if settings.CACHE_WARM_ON_STARTUP:
+        threading.Thread(target=warm_cache_on_startup, name="cache-prewarm", daemon=True).start()
+    yield
+    bloom_refresher.stop()
+    health_monitor.stop()
 
 
 app = FastAPI(
     title=settings.APP_NAME,
-    openapi_url=f"{settings.API_V1_STR}/openapi.json"
+    openapi_url=f"{settings.API_V1_STR}/openapi.json",
+    lifespan=lifespan,
 )
 
 app.middleware("http")(rate_limiter)
+app.middleware("http")(consistency_middleware)
+# Descarta carga antes de tocar Redis o la BD; dentro de metrics para medir los 503
+app.middleware("http")(admission_middleware)
+# Registrado después del rate limiter para envolverlo y medir también las respuestas 429
+app.middleware("http")(metrics_middleware)
+app.middleware("http")(profiling_middleware)
+# Justo dentro del request id: el span de servidor cubre todas las capas anteriores
+app.middleware("http")(tracing_middleware)
+# El más externo: el request id debe existir para todo lo que registren las capas internas
+app.middleware("http")(request_id_middleware)
 #app.include_router(articles.router, prefix=settings.API_V1_STR)
 
 # CORS configuration to allow requests from the React frontend
@@ -35,9 +92,28 @@ app.include_router(
     tags=["Articles"],
     dependencies=[Depends(require_api_key)]
 )
+app.include_router(
+    admin.router,
+    prefix=settings.API_V1_STR,
+    dependencies=[Depends(require_api_key)]
+)
 
 router = APIRouter()
 
+@app.get("/metrics", tags=["Health"], include_in_schema=False)
+def metrics():
+    """
+    Prometheus scrape endpoint.
+
+    Exposes route latency, in-flight requests, SQL query counts and durations,
+    connection pool usage, cache hit/miss/error counters and rate-limit
+    rejections in the Prometheus text format.
+
+    Returns:
+        Response: The metrics in `text/plain` exposition format.
+    """
+    return render_metrics()
+
 @app.get("/health", tags=["Health"])
 def health_check():
     """
@@ -47,25 +123,13 @@ def health_check():
     and reachable. Useful for uptime monitoring or container orchestration
     probes (e.g., Kubernetes liveness/readiness checks).
 
+    The database and Redis status come from a snapshot refreshed in the
+    background by `health_monitor`, so probes never open a connection
+    themselves. Connection pool statistics are included for diagnostics.
+
     Returns:
         dict: A JSON response containing the status message.
     """
-    status = {"status": "ok", "database": "ok", "redis": "ok"}
-
-    # Chequeo DB
-    try:
-        with SessionLocal() as db:
-            db.execute(text("SELECT 1"))
-    except Exception:
-        status["status"] = "degraded"
-        status["database"] = "error"
-
-    # Chequeo Redis
-    try:
-        if redis_client is None or not redis_client.ping():
-            raise Exception("Redis no disponible")
-    except Exception:
-        status["status"] = "degraded"
-        status["redis"] = "error"
-
+    status = health_monitor.snapshot()
+    status["pool"] = pool_status()
     return status
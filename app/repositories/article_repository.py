@@ -1,8 +1,16 @@
-from sqlalchemy.orm import Session
+import logging
+from datetime import datetime
+from sqlalchemy.orm import Query, Session
+from app.core.tracing import trace_methods
 from app.db.models import Article
+from app.repositories.duplicate_repository import DuplicateRepository, Signature, minhash_signature
+from app.repositories.facet_repository import FacetRepository
 from app.schemas.article_schema import ArticleCreate, ArticleUpdate
-from typing import List, Optional, Tuple
+from typing import Dict, List, Optional, Sequence, Tuple
 
+logger = logging.getLogger(__name__)
+
+@trace_methods("repository")
 class ArticleRepository:
     """
     Data access layer (Repository) for the Article model.
@@ -15,6 +23,8 @@ class ArticleRepository:
         - Handle query filtering, pagination, and sorting.
         - Convert tag lists into a semicolon-separated string for storage.
         - Maintain database session integrity (commit, rollback, refresh).
+        - Keep the facet counters and the near-duplicate (MinHash) index in step
+          with every write, in the same transaction.
 
     Classes:
         ArticleRepository:
@@ -25,62 +35,144 @@ class ArticleRepository:
     """
     
     model = Article
+    facets = FacetRepository()
+    duplicates = DuplicateRepository()
+
     def _tags_to_string(self, tags: Optional[List[str]]) -> Optional[str]:
         return ";".join(tags) if tags else None
 
     def get(self, db: Session, article_id: int) -> Optional[Article]:
         return db.query(Article).filter(Article.id == article_id).first()
 
+    def get_many(self, db: Session, article_ids: List[int]) -> List[Article]:
+        if not article_ids:
+            return []
+        return db.query(Article).filter(Article.id.in_(article_ids)).all()
+
     def get_by_title_and_author(self, db: Session, title: str, author: str) -> Optional[Article]:
         return db.query(Article).filter(Article.title == title, Article.author == author).first()
 
-    def list(
+    def list_query(
         self,
         db: Session,
-        skip: int = 0,
-        limit: int = 20,
         tag: Optional[str] = None,
         author: Optional[str] = None,
         search: Optional[str] = None,
-        sort_order: str = "desc"
-    ) -> Tuple[List[Article], int]:
-        """Lista artículos con filtros, paginación, búsqueda opcional y ordenamiento."""
-        
-        # --- AÑADE ESTA LÍNEA DE DEPURACIÓN ---
-        print(f"🔍 Repositorio recibió el parámetro de búsqueda: '{search}'")
-
+        sort_order: str = "desc",
+        published_after: Optional[datetime] = None,
+        published_before: Optional[datetime] = None,
+    ) -> Query:
+        """
+        Construye la consulta de listado (sin paginar).
+
+        El orden `published_at DESC NULLS LAST, id DESC` coincide con los índices
+        compuestos de `Article`, de modo que los filtros por autor y por rango de
+        fechas se resuelven con un único recorrido de índice. `asc` conserva el
+        orden por defecto de cada base (en PostgreSQL, borradores al final) y
+        por autor lo sirve su propio índice. El `id` desempata y hace estable la
+        paginación.
+        """
         query = db.query(Article)
 
         if author:
             query = query.filter(Article.author == author)
+        if published_after:
+            query = query.filter(Article.published_at >= published_after)
+        if published_before:
+            query = query.filter(Article.published_at < published_before)
         if tag:
             query = query.filter(Article.tags.ilike(f"%{tag}%"))
         
         if search:
-            print("✅ Aplicando filtro de búsqueda...")
             search_query = f"%{search}%"
             query = query.filter(
                 (Article.title.ilike(search_query)) | (Article.body.ilike(search_query))
             )
 
-        # --- AÑADE ESTAS LÍNEAS PARA VER EL SQL ---
-        # Compila y muestra la consulta SQL exacta que se va a ejecutar
-        compiled_query = query.compile(dialect=postgresql.dialect(), compile_kwargs={"literal_binds": True})
-        print("--- 📜 SQL Generado ---")
-        print(compiled_query)
-        print("----------------------")
-
-        order_column = Article.published_at
         if sort_order == "asc":
-            query = query.order_by(order_column.asc())
-        else:
-            query = query.order_by(order_column.desc().nullslast())
+            return query.order_by(Article.published_at.asc(), Article.id.asc())
+        return query.order_by(Article.published_at.desc().nullslast(), Article.id.desc())
+
+    def list(
+        self,
+        db: Session,
+        skip: int = 0,
+        limit: int = 20,
+        tag: Optional[str] = None,
+        author: Optional[str] = None,
+        search: Optional[str] = None,
+        sort_order: str = "desc",
+        published_after: Optional[datetime] = None,
+        published_before: Optional[datetime] = None,
+    ) -> Tuple[List[Article], int]:
+        """Lista artículos con filtros, paginación, búsqueda opcional y ordenamiento."""
+        query = self.list_query(
+            db,
+            tag=tag,
+            author=author,
+            search=search,
+            sort_order=sort_order,
+            published_after=published_after,
+            published_before=published_before,
+        )
+
+        # Compilar el SQL con literal_binds es costoso: solo se hace si el nivel DEBUG está activo
+        if logger.isEnabledFor(logging.DEBUG):
+            logger.debug(
+                "Listing articles",
+                extra={
+                    "search": search,
+                    "sql": str(query.statement.compile(
+                        dialect=db.get_bind().dialect, compile_kwargs={"literal_binds": True}
+                    )),
+                },
+            )
 
-        total = query.count()
+        total = query.order_by(None).count()
         articles = query.offset(skip).limit(limit).all()
         return articles, total
 
-    def create(self, db: Session, payload: ArticleCreate) -> Article:
+    def facet_counts(
+        self,
+        db: Session,
+        fields: Sequence[str],
+        size: int = 20,
+        tag: Optional[str] = None,
+        author: Optional[str] = None,
+        search: Optional[str] = None,
+        published_after: Optional[datetime] = None,
+        published_before: Optional[datetime] = None,
+    ) -> Tuple[int, Dict[str, Dict[str, int]], str]:
+        """
+        Cuenta artículos por valor de faceta con los mismos filtros que `list`.
+
+        Sin filtros o filtrando solo por autor se leen los contadores
+        incrementales; con cualquier otro filtro se agrega la consulta de
+        listado. Devuelve (total, facetas, origen: `counters` o `query`).
+        """
+        if not (tag or search or published_after or published_before):
+            total, facets = self.facets.counter_facets(db, fields, author=author, size=size)
+            return total, facets, "counters"
+        query = self.list_query(
+            db,
+            tag=tag,
+            author=author,
+            search=search,
+            published_after=published_after,
+            published_before=published_before,
+        )
+        total, facets = self.facets.query_facets(db, query, fields, size=size)
+        return total, facets, "query"
+
+    def create(
+        self, db: Session, payload: ArticleCreate, signature: Optional[Signature] = None, commit: bool = True
+    ) -> Article:
+        """
+        Inserta un artículo con sus contadores de facetas y su firma MinHash.
+
+        Con `commit=False` solo se hace flush (importación masiva: el llamador
+        confirma todo el lote de una vez).
+        """
         db_article = Article(
             title=payload.title,
             body=payload.body,
@@ -89,23 +181,35 @@ class ArticleRepository:
             published_at=payload.published_at
         )
         db.add(db_article)
-        db.commit()
-        db.refresh(db_article)
+        self.facets.apply(db, added=(db_article.author, db_article.tags))
+        db.flush()
+        self.duplicates.index(db, db_article.id, signature or minhash_signature(payload.title, payload.body))
+        if commit:
+            db.commit()
+            db.refresh(db_article)
         return db_article
 
     def update(self, db: Session, db_obj: Article, payload: ArticleUpdate) -> Article:
         update_data = payload.model_dump(exclude_unset=True)
+        previous = (db_obj.author, db_obj.tags)
+        previous_text = (db_obj.title, db_obj.body)
         for field, value in update_data.items():
             if field == "tags":
                 setattr(db_obj, field, self._tags_to_string(value))
             else:
                 setattr(db_obj, field, value)
         db.add(db_obj)
+        if (db_obj.author, db_obj.tags) != previous:
+            self.facets.apply(db, removed=previous, added=(db_obj.author, db_obj.tags))
+        if (db_obj.title, db_obj.body) != previous_text:
+            self.duplicates.reindex(db, db_obj.id, minhash_signature(db_obj.title, db_obj.body))
         db.commit()
         db.refresh(db_obj)
         return db_obj
 
     def delete(self, db: Session, db_obj: Article) -> Article:
         db.delete(db_obj)
+        self.facets.apply(db, removed=(db_obj.author, db_obj.tags))
+        self.duplicates.remove(db, db_obj.id)
         db.commit()
         return db_obj
\ No newline at end of file
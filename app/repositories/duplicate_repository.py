@@ -0,0 +1,214 @@
+import argparse
+import hashlib
+import random
+import re
+import struct
+from functools import lru_cache
+from typing import Dict, List, Optional, Sequence, Tuple
+
+from sqlalchemy import delete, func, insert, select, tuple_
+from sqlalchemy.orm import Session
+
+from app.core.config import settings
+from app.core.tracing import trace_methods
+from app.db.models import Article, ArticleLshBucket, ArticleMinHash
+
+"""
+Near-duplicate detection with MinHash and locality-sensitive hashing.
+
+The title and body of an article are reduced to a set of word shingles
+(`MINHASH_SHINGLE_SIZE` consecutive words). Its MinHash signature keeps, for
+each of `MINHASH_PERMUTATIONS` hash functions, the minimum hash over the set;
+the fraction of equal positions between two signatures estimates the Jaccard
+similarity of the two shingle sets.
+
+The signature is split into `MINHASH_BANDS` bands, and each band is hashed
+into a bucket of `article_lsh_buckets`. Two articles become candidates when
+they share a bucket in any band, which happens with high probability above
+roughly `(1 / bands) ** (1 / rows)` similarity (about 0.5 with the defaults),
+and rarely below. A check is one lookup per band on the bucket primary key
+plus a comparison with at most `DUPLICATE_MAX_CANDIDATES` signatures, so it
+does not scan the articles.
+
+Signatures are written in the same transaction as the article. Changing the
+permutations, bands or shingle size requires rebuilding the index:
+
+    python -m app.repositories.duplicate_repository rebuild
+"""
+
+Signature = Tuple[int, ...]
+
+_MASK64 = (1 << 64) - 1
+_WORD = re.compile(r"\w+")
+
+
+@lru_cache(maxsize=4)
+def _permutations(count: int) -> Tuple[Tuple[int, int], ...]:
+    # Semilla fija: las firmas guardadas deben poder compararse entre procesos y despliegues
+    rng = random.Random(count)
+    return tuple((rng.getrandbits(64) | 1, rng.getrandbits(64)) for _ in range(count))
+
+
+def _stable_hash(value: str) -> int:
+    return int.from_bytes(hashlib.blake2b(value.encode("utf-8"), digest_size=8).digest(), "big")
+
+
+def shingles(text: str, size: Optional[int] = None) -> List[str]:
+    """Distinct lowercase word shingles of `text` (the whole text if shorter than one shingle)."""
+    size = size or settings.MINHASH_SHINGLE_SIZE
+    words = _WORD.findall(text.lower())
+    if len(words) <= size:
+        return [" ".join(words)]
+    return list({" ".join(words[i:i + size]) for i in range(len(words) - size + 1)})
+
+
+def minhash_signature(title: str, body: str, permutations: Optional[int] = None) -> Signature:
+    """MinHash signature of an article's title and body."""
+    hashes = [_stable_hash(shingle) for shingle in shingles(f"{title} {body}")]
+    return tuple(
+        min(((a * x + b) & _MASK64) for x in hashes) >> 32
+        for a, b in _permutations(permutations or settings.MINHASH_PERMUTATIONS)
+    )
+
+
+def band_buckets(signature: Signature, bands: Optional[int] = None) -> List[Tuple[int, int]]:
+    """(band, bucket) pairs of a signature; buckets are signed 64-bit hashes of each band."""
+    bands = bands or settings.MINHASH_BANDS
+    rows = len(signature) // bands
+    return [
+        (
+            band,
+            int.from_bytes(
+                hashlib.blake2b(pack_signature(signature[band * rows:(band + 1) * rows]), digest_size=8).digest(),
+                "big",
+                signed=True,
+            ),
+        )
+        for band in range(bands)
+    ]
+
+
+def estimated_similarity(signature: Signature, other: Signature) -> float:
+    """Estimated Jaccard similarity of the shingle sets behind two signatures."""
+    if not signature or len(signature) != len(other):
+        return 0.0
+    return round(sum(1 for a, b in zip(signature, other) if a == b) / len(signature), 6)
+
+
+def pack_signature(signature: Sequence[int]) -> bytes:
+    return struct.pack(f"<{len(signature)}I", *signature)
+
+
+def unpack_signature(data: bytes) -> Signature:
+    return struct.unpack(f"<{len(data) // 4}I", data)
+
+
+@trace_methods("repository")
+class DuplicateRepository:
+    """
+    Data access layer for the near-duplicate (MinHash/LSH) index of the Article model.
+    """
+
+    def index(self, db: Session, article_id: int, signature: Signature) -> None:
+        """Store the signature and buckets of a flushed article. The caller commits."""
+        db.execute(insert(ArticleMinHash), [{"article_id": article_id, "signature": pack_signature(signature)}])
+        db.execute(
+            insert(ArticleLshBucket),
+            [{"band": band, "bucket": bucket, "article_id": article_id} for band, bucket in band_buckets(signature)],
+        )
+
+    def remove(self, db: Session, article_id: int) -> None:
+        """Drop an article from the index. The caller commits."""
+        db.execute(delete(ArticleLshBucket).where(ArticleLshBucket.article_id == article_id))
+        db.execute(delete(ArticleMinHash).where(ArticleMinHash.article_id == article_id))
+
+    def remove_many(self, db: Session, article_ids: List[int]) -> None:
+        """Drop several articles from the index (partition archiving). The caller commits."""
+        db.execute(delete(ArticleLshBucket).where(ArticleLshBucket.article_id.in_(article_ids)))
+        db.execute(delete(ArticleMinHash).where(ArticleMinHash.article_id.in_(article_ids)))
+
+    def reindex(self, db: Session, article_id: int, signature: Signature) -> None:
+        """Replace an article's signature after its title or body changed. The caller commits."""
+        self.remove(db, article_id)
+        self.index(db, article_id, signature)
+
+    def near_duplicates(
+        self, db: Session, signature: Signature, threshold: Optional[float] = None
+    ) -> List[Dict]:
+        """
+        Articles whose estimated similarity to `signature` reaches `threshold`.
+
+        Returns:
+            List[Dict]: `id`, `title`, `author` and `similarity`, most similar first.
+        """
+        threshold = settings.DUPLICATE_SIMILARITY_THRESHOLD if threshold is None else threshold
+        buckets = band_buckets(signature)
+        # Los candidatos que comparten más bandas son los más parecidos: se comparan primero
+        candidate_ids = list(db.execute(
+            select(ArticleLshBucket.article_id)
+            .where(tuple_(ArticleLshBucket.band, ArticleLshBucket.bucket).in_(buckets))
+            .group_by(ArticleLshBucket.article_id)
+            .order_by(func.count().desc(), ArticleLshBucket.article_id)
+            .limit(settings.DUPLICATE_MAX_CANDIDATES)
+        ).scalars())
+        if not candidate_ids:
+            return []
+
+        rows = db.execute(
+            select(Article.id, Article.title, Article.author, ArticleMinHash.signature)
+            .join(ArticleMinHash, ArticleMinHash.article_id == Article.id)
+            .where(Article.id.in_(candidate_ids))
+        )
+        matches = []
+        for row in rows:
+            score = estimated_similarity(signature, unpack_signature(row.signature))
+            if score >= threshold:
+                matches.append({"id": row.id, "title": row.title, "author": row.author, "similarity": score})
+        return sorted(matches, key=lambda match: (-match["similarity"], match["id"]))
+
+    def rebuild(self, db: Session, batch_size: int = 1000) -> int:
+        """Recompute every signature and bucket from `articles` and commit. Returns the number of articles."""
+        db.execute(delete(ArticleLshBucket))
+        db.execute(delete(ArticleMinHash))
+        indexed, last_id = 0, 0
+        while True:
+            rows = db.execute(
+                select(Article.id, Article.title, Article.body)
+                .where(Article.id > last_id)
+                .order_by(Article.id)
+                .limit(batch_size)
+            ).all()
+            if not rows:
+                break
+            signatures, buckets = [], []
+            for article_id, title, body in rows:
+                signature = minhash_signature(title, body or "")
+                signatures.append({"article_id": article_id, "signature": pack_signature(signature)})
+                buckets += [
+                    {"band": band, "bucket": bucket, "article_id": article_id}
+                    for band, bucket in band_buckets(signature)
+                ]
+            db.execute(insert(ArticleMinHash), signatures)
+            db.execute(insert(ArticleLshBucket), buckets)
+            indexed += len(rows)
+            last_id = rows[-1].id
+        db.commit()
+        return indexed
+
+
+def main(argv: Optional[List[str]] = None) -> None:
+    parser = argparse.ArgumentParser(description="Maintain the near-duplicate (MinHash/LSH) index.")
+    parser.add_argument("command", choices=["rebuild"])
+    parser.parse_args(argv)
+
+    from app.db.session import SessionLocal
+
+    db = SessionLocal()
+    try:
+        print(f"Near-duplicate index rebuilt for {DuplicateRepository().rebuild(db)} articles")
+    finally:
+        db.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,236 @@
+import argparse
+from collections import Counter
+from typing import Dict, Iterable, List, Optional, Tuple
+
+from sqlalchemy import func, select
+from sqlalchemy.orm import Query, Session
+
+from app.core.tracing import trace_methods
+from app.db.models import Article, ArticleFacetCount
+
+"""
+Facet counts (articles per tag / per author) for the article listings.
+
+Counters live in `article_facet_counts` and are kept up to date by
+`ArticleRepository` within the transaction of each write: one multi-row
+upsert per create, delete or tag change. Each article contributes
+
+    ("",            "author", author)  +1
+    ("",            "tags",   tag)     +1 per tag
+    ("author:<a>",  "tags",   tag)     +1 per tag
+
+so unfiltered and author-filtered facets are read from the counters. Any
+other filter (tag, search, date range) falls back to aggregating the filtered
+listing query. The `tag` filter of the listings is a substring match, which
+exact-tag counters cannot answer.
+
+There is no global total row: every write would update that single row and
+writers would queue on its lock. The unfiltered total is the sum of the
+per-author counters instead, one primary-key range scan whose cost grows with
+the number of distinct authors, not with the number of articles.
+
+Counter keys are upserted in sorted order, so concurrent writers lock the
+rows in the same order and cannot deadlock. Rows that drop to zero are left
+in place (reads ignore them) and removed by the recount job:
+
+    python -m app.repositories.facet_repository recount
+
+The recount does not block writers: it reads the articles and the counters
+in one snapshot, then adds the difference to each drifted counter, which
+commutes with the upserts committed in the meantime.
+"""
+
+FACET_FIELDS = ("tags", "author")
+CounterKey = Tuple[str, str, str]
+
+
+def split_tags(tags: Optional[str]) -> List[str]:
+    return sorted({tag for tag in tags.split(";") if tag}) if tags else []
+
+
+def article_counter_keys(author: str, tags: Optional[str]) -> List[CounterKey]:
+    """Counter rows an article with this author and stored tags contributes to."""
+    keys = [("", "author", author)]
+    for tag in split_tags(tags):
+        keys += [("", "tags", tag), (f"author:{author}", "tags", tag)]
+    return keys
+
+
+@trace_methods("repository")
+class FacetRepository:
+    """
+    Data access layer for the facet counters of the Article model.
+    """
+
+    model = ArticleFacetCount
+
+    def _upsert(self, db: Session, deltas: Dict[CounterKey, int]):
+        rows = [
+            {"scope": scope, "field": field, "value": value, "count": delta}
+            for (scope, field, value), delta in sorted(deltas.items())
+            if delta
+        ]
+        if not rows:
+            return None
+        if db.get_bind().dialect.name == "postgresql":
+            from sqlalchemy.dialects.postgresql import insert
+        else:
+            from sqlalchemy.dialects.sqlite import insert
+        statement = insert(ArticleFacetCount).values(rows)
+        return statement.on_conflict_do_update(
+            index_elements=["scope", "field", "value"],
+            set_={"count": ArticleFacetCount.count + statement.excluded.count},
+        )
+
+    def apply(
+        self,
+        db: Session,
+        removed: Optional[Tuple[str, Optional[str]]] = None,
+        added: Optional[Tuple[str, Optional[str]]] = None,
+    ) -> None:
+        """
+        Add the counter changes of replacing the `removed` (author, tags) pair
+        by the `added` one to the current transaction. The caller commits.
+        """
+        deltas: Counter = Counter()
+        if removed:
+            deltas.subtract(article_counter_keys(*removed))
+        if added:
+            deltas.update(article_counter_keys(*added))
+        statement = self._upsert(db, deltas)
+        if statement is not None:
+            db.execute(statement)
+
+    def remove_many(self, db: Session, articles: Iterable[Tuple[str, Optional[str]]]) -> None:
+        """
+        Subtract the counters of several removed (author, tags) pairs in one
+        upsert (partition archiving). The caller commits.
+        """
+        deltas: Counter = Counter()
+        for author, tags in articles:
+            deltas.subtract(article_counter_keys(author, tags))
+        statement = self._upsert(db, deltas)
+        if statement is not None:
+            db.execute(statement)
+
+    def counter_facets(
+        self, db: Session, fields: Iterable[str], author: Optional[str], size: int
+    ) -> Tuple[int, Dict[str, Dict[str, int]]]:
+        """Total and top-`size` facet values, read from the counters."""
+        def top(scope: str, field: str) -> Dict[str, int]:
+            rows = db.execute(
+                select(ArticleFacetCount.value, ArticleFacetCount.count)
+                .where(
+                    ArticleFacetCount.scope == scope,
+                    ArticleFacetCount.field == field,
+                    ArticleFacetCount.count > 0,
+                )
+                .order_by(ArticleFacetCount.count.desc(), ArticleFacetCount.value)
+                .limit(size)
+            )
+            return {value: count for value, count in rows}
+
+        if author is None:
+            total = db.execute(
+                select(func.coalesce(func.sum(ArticleFacetCount.count), 0)).where(
+                    ArticleFacetCount.scope == "", ArticleFacetCount.field == "author", ArticleFacetCount.count > 0
+                )
+            ).scalar()
+            return total, {field: top("", field) for field in fields}
+
+        total = db.execute(
+            select(ArticleFacetCount.count).where(
+                ArticleFacetCount.scope == "", ArticleFacetCount.field == "author", ArticleFacetCount.value == author
+            )
+        ).scalar() or 0
+        facets = {}
+        for field in fields:
+            if field == "author":
+                facets[field] = {author: total} if total > 0 else {}
+            else:
+                facets[field] = top(f"author:{author}", field)
+        return total, facets
+
+    def query_facets(
+        self, db: Session, query: Query, fields: Iterable[str], size: int
+    ) -> Tuple[int, Dict[str, Dict[str, int]]]:
+        """Total and top-`size` facet values, aggregated from a filtered listing query."""
+        filtered = query.order_by(None).with_entities(Article.id, Article.author, Article.tags).subquery()
+        total = db.execute(select(func.count()).select_from(filtered)).scalar() or 0
+        facets = {}
+        for field in fields:
+            if field == "author":
+                count = func.count().label("count")
+                rows = db.execute(
+                    select(filtered.c.author, count).group_by(filtered.c.author)
+                    .order_by(count.desc(), filtered.c.author).limit(size)
+                )
+                facets[field] = {author: n for author, n in rows}
+            elif db.get_bind().dialect.name == "postgresql":
+                tag = func.unnest(func.string_to_array(filtered.c.tags, ";")).label("tag")
+                tags = select(filtered.c.id, tag).subquery()
+                count = func.count(func.distinct(tags.c.id)).label("count")
+                rows = db.execute(
+                    select(tags.c.tag, count).where(tags.c.tag != "").group_by(tags.c.tag)
+                    .order_by(count.desc(), tags.c.tag).limit(size)
+                )
+                facets[field] = {value: n for value, n in rows}
+            else:
+                # Sin funciones para separar los tags en SQL: se agregan en Python
+                counts: Counter = Counter()
+                for (tags,) in db.execute(select(filtered.c.tags)):
+                    counts.update(split_tags(tags))
+                ranked = sorted(counts.items(), key=lambda item: (-item[1], item[0]))
+                facets[field] = dict(ranked[:size])
+        return total, facets
+
+    def recount(self, db: Session, batch_size: int = 10_000) -> int:
+        """
+        Repair every counter from `articles` without blocking writers.
+        Returns the number of counters corrected.
+
+        Articles and counters are read in one snapshot (`REPEATABLE READ` on
+        PostgreSQL), so their difference is the drift as of that snapshot.
+        It is then added to the live counters in short upserts, which keeps
+        the writes committed since the snapshot, and the counters left at
+        zero are deleted.
+        """
+        db.rollback()
+        if db.get_bind().dialect.name == "postgresql":
+            db.connection(execution_options={"isolation_level": "REPEATABLE READ"})
+        drift: Counter = Counter()
+        for author, tags in db.execute(select(Article.author, Article.tags)).yield_per(batch_size):
+            drift.update(article_counter_keys(author, tags))
+        counters = db.execute(
+            select(ArticleFacetCount.scope, ArticleFacetCount.field, ArticleFacetCount.value, ArticleFacetCount.count)
+        )
+        for scope, field, value, count in counters.yield_per(batch_size):
+            drift[(scope, field, value)] -= count
+        db.rollback()
+
+        corrections = sorted((key, delta) for key, delta in drift.items() if delta)
+        for start in range(0, len(corrections), batch_size):
+            statement = self._upsert(db, dict(corrections[start:start + batch_size]))
+            db.execute(statement)
+            db.commit()
+        db.query(ArticleFacetCount).filter(ArticleFacetCount.count == 0).delete(synchronize_session=False)
+        db.commit()
+        return len(corrections)
+
+
+def main(argv: Optional[List[str]] = None) -> None:
+    parser = argparse.ArgumentParser(description="Maintain the article facet counters.")
+    parser.add_argument("command", choices=["recount"])
+    parser.parse_args(argv)
+
+    from app.db.session import SessionLocal
+
+    db = SessionLocal()
+    try:
+        print(f"Facet counters recounted: {FacetRepository().recount(db)} corrected")
+    finally:
+        db.close()
+
+
+if __name__ == "__main__":
+    main()
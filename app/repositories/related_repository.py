@@ -0,0 +1,266 @@
+import argparse
+from typing import Dict, Iterable, Iterator, List, Optional, Set, Tuple
+
+from sqlalchemy import delete, func, insert, or_, select, tuple_, union
+from sqlalchemy.orm import Session
+
+from app.core.config import settings
+from app.core.tracing import trace_methods
+from app.db.models import Article, ArticleRelated, ArticleTag
+from app.repositories.facet_repository import split_tags
+
+"""
+Precomputed related-articles index.
+
+Two tables back `GET /articles/{id}/related`:
+
+    - `article_tags`: inverted index tag -> article ids.
+    - `article_related`: the `RELATED_INDEX_SIZE` best matches of each article.
+
+Similarity is the Jaccard index of the two tag sets plus
+`RELATED_AUTHOR_BOOST` when both articles share the author. Reading a list is
+a primary-key range scan of at most `RELATED_INDEX_SIZE` rows, so its cost
+does not depend on the size of `articles`.
+
+`refresh` recomputes one article after a create or a tag change. Candidates are
+the `RELATED_CANDIDATES_PER_TAG` newest articles of each of its tags and of its
+author. The article gets its own list, and it is offered to every candidate's
+list, which is then trimmed back to its best `RELATED_INDEX_SIZE` entries. The
+work per write is bounded by those settings, not by the table size.
+
+Lists an article drops out of are not backfilled until the owning article is
+refreshed; the full rebuild repairs everything:
+
+    python -m app.repositories.related_repository rebuild
+"""
+
+
+def similarity(tags: Set[str], author: str, other_tags: Set[str], other_author: str) -> float:
+    """Tag Jaccard similarity plus the same-author boost."""
+    union_size = len(tags | other_tags)
+    score = len(tags & other_tags) / union_size if union_size else 0.0
+    if author == other_author:
+        score += settings.RELATED_AUTHOR_BOOST
+    return round(score, 6)
+
+
+@trace_methods("repository")
+class RelatedRepository:
+    """
+    Data access layer for the related-articles index of the Article model.
+    """
+
+    def candidates(self, db: Session, article_id: int, author: str, tags: Iterable[str]) -> List[Tuple[int, str, Set[str]]]:
+        """(id, author, tags) of the articles that may be related to the given one."""
+        per_source = settings.RELATED_CANDIDATES_PER_TAG
+        sources = [
+            select(ArticleTag.article_id.label("id"))
+            .where(ArticleTag.tag == tag)
+            .order_by(ArticleTag.article_id.desc())
+            .limit(per_source)
+            .subquery()
+            .select()
+            for tag in tags
+        ]
+        sources.append(
+            select(Article.id.label("id"))
+            .where(Article.author == author)
+            .order_by(Article.published_at.desc().nullslast(), Article.id.desc())
+            .limit(per_source)
+            .subquery()
+            .select()
+        )
+        candidate_ids = union(*sources).subquery()
+        rows = db.execute(
+            select(Article.id, Article.author, Article.tags)
+            .where(Article.id.in_(select(candidate_ids.c.id)), Article.id != article_id)
+        )
+        return [(row.id, row.author, set(split_tags(row.tags))) for row in rows]
+
+    def referencing(self, db: Session, article_id: int) -> List[int]:
+        """Articles whose related list contains `article_id`."""
+        return list(db.execute(
+            select(ArticleRelated.article_id).where(ArticleRelated.related_id == article_id)
+        ).scalars())
+
+    def _trim(self, db: Session, article_ids: List[int]) -> None:
+        ranked = (
+            select(
+                ArticleRelated.article_id,
+                ArticleRelated.related_id,
+                func.row_number().over(
+                    partition_by=ArticleRelated.article_id,
+                    order_by=(ArticleRelated.score.desc(), ArticleRelated.related_id),
+                ).label("position"),
+            )
+            .where(ArticleRelated.article_id.in_(article_ids))
+            .subquery()
+        )
+        db.execute(
+            delete(ArticleRelated).where(
+                tuple_(ArticleRelated.article_id, ArticleRelated.related_id).in_(
+                    select(ranked.c.article_id, ranked.c.related_id)
+                    .where(ranked.c.position > settings.RELATED_INDEX_SIZE)
+                )
+            )
+        )
+
+    def refresh(self, db: Session, article: Article, new: bool = False, commit: bool = True) -> List[int]:
+        """
+        Recompute the related entries of `article` and commit.
+
+        Args:
+            db (Session): Database session.
+            article (Article): A freshly created or updated article.
+            new (bool): The article was just created, so it has no entries yet.
+            commit (bool): With False the caller commits (bulk import).
+
+        Returns:
+            List[int]: Other articles whose related list changed.
+        """
+        affected: Set[int] = set()
+        tags = split_tags(article.tags)
+        if not new:
+            affected.update(self.referencing(db, article.id))
+            db.execute(delete(ArticleRelated).where(
+                or_(ArticleRelated.article_id == article.id, ArticleRelated.related_id == article.id)
+            ))
+            db.execute(delete(ArticleTag).where(ArticleTag.article_id == article.id))
+        if tags:
+            db.execute(insert(ArticleTag), [{"tag": tag, "article_id": article.id} for tag in tags])
+
+        scored = []
+        for other_id, other_author, other_tags in self.candidates(db, article.id, article.author, tags):
+            score = similarity(set(tags), article.author, other_tags, other_author)
+            if score > 0:
+                scored.append((score, other_id))
+        scored.sort(key=lambda item: (-item[0], item[1]))
+
+        rows = [
+            {"article_id": article.id, "related_id": other_id, "score": score}
+            for score, other_id in scored[: settings.RELATED_INDEX_SIZE]
+        ]
+        rows += [{"article_id": other_id, "related_id": article.id, "score": score} for score, other_id in scored]
+        if rows:
+            db.execute(insert(ArticleRelated), rows)
+            self._trim(db, [other_id for _, other_id in scored])
+            affected.update(other_id for _, other_id in scored)
+        if commit:
+            db.commit()
+        return sorted(affected)
+
+    def remove(self, db: Session, article_id: int) -> List[int]:
+        """Drop a deleted article from the index and commit. Returns the lists it was removed from."""
+        affected = self.referencing(db, article_id)
+        db.execute(delete(ArticleRelated).where(
+            or_(ArticleRelated.article_id == article_id, ArticleRelated.related_id == article_id)
+        ))
+        db.execute(delete(ArticleTag).where(ArticleTag.article_id == article_id))
+        db.commit()
+        return affected
+
+    def remove_many(self, db: Session, article_ids: List[int]) -> List[int]:
+        """
+        Drop several articles from the index (partition archiving). The caller
+        commits. Returns the other lists they were removed from.
+        """
+        removed = set(article_ids)
+        affected = set(db.execute(
+            select(ArticleRelated.article_id).where(ArticleRelated.related_id.in_(article_ids)).distinct()
+        ).scalars())
+        db.execute(delete(ArticleRelated).where(
+            or_(ArticleRelated.article_id.in_(article_ids), ArticleRelated.related_id.in_(article_ids))
+        ))
+        db.execute(delete(ArticleTag).where(ArticleTag.article_id.in_(article_ids)))
+        return sorted(affected - removed)
+
+    def related(self, db: Session, article_id: int, limit: int) -> List[Dict]:
+        """The `limit` best related articles of `article_id`, most related first."""
+        rows = db.execute(
+            select(
+                Article.id, Article.title, Article.author, Article.tags, Article.published_at, ArticleRelated.score
+            )
+            .join(ArticleRelated, ArticleRelated.related_id == Article.id)
+            .where(ArticleRelated.article_id == article_id)
+            .order_by(ArticleRelated.score.desc(), ArticleRelated.related_id)
+            .limit(limit)
+        )
+        return [dict(row._mapping) for row in rows]
+
+    def _pages(self, db: Session, batch_size: int) -> Iterator[Tuple[int, int, List[Tuple[int, str, List[str]]]]]:
+        # Páginas por id: (id anterior, último id, artículos), la última hasta el final del rango
+        last_id = 0
+        while True:
+            rows = db.execute(
+                select(Article.id, Article.author, Article.tags)
+                .where(Article.id > last_id).order_by(Article.id).limit(batch_size)
+            ).all()
+            if not rows:
+                return
+            yield last_id, rows[-1].id, [(row.id, row.author, split_tags(row.tags)) for row in rows]
+            last_id = rows[-1].id
+
+    def rebuild(self, db: Session, batch_size: int = 1000) -> int:
+        """
+        Rebuild both tables from `articles`, one id range per transaction.
+        Returns the number of indexed articles.
+
+        The tags are rebuilt first, range by range, then the related lists,
+        whose candidates are read from the rebuilt tags. Each transaction
+        replaces the rows of one id range, so readers always see a complete
+        list (old or new) and memory stays bounded by `batch_size`.
+        """
+        last_id = 0
+        for first_id, last_id, articles in self._pages(db, batch_size):
+            db.execute(delete(ArticleTag).where(ArticleTag.article_id > first_id, ArticleTag.article_id <= last_id))
+            tag_rows = [{"tag": tag, "article_id": article_id} for article_id, _, tags in articles for tag in tags]
+            if tag_rows:
+                db.execute(insert(ArticleTag), tag_rows)
+            db.commit()
+        db.execute(delete(ArticleTag).where(ArticleTag.article_id > last_id))
+        db.commit()
+
+        indexed = last_id = 0
+        for first_id, last_id, articles in self._pages(db, batch_size):
+            related_rows = []
+            for article_id, author, tags in articles:
+                scored = sorted(
+                    (
+                        (similarity(set(tags), author, other_tags, other_author), other_id)
+                        for other_id, other_author, other_tags in self.candidates(db, article_id, author, tags)
+                    ),
+                    key=lambda item: (-item[0], item[1]),
+                )
+                related_rows += [
+                    {"article_id": article_id, "related_id": other_id, "score": score}
+                    for score, other_id in scored[: settings.RELATED_INDEX_SIZE]
+                    if score > 0
+                ]
+            db.execute(delete(ArticleRelated).where(
+                ArticleRelated.article_id > first_id, ArticleRelated.article_id <= last_id
+            ))
+            if related_rows:
+                db.execute(insert(ArticleRelated), related_rows)
+            db.commit()
+            indexed += len(articles)
+        db.execute(delete(ArticleRelated).where(ArticleRelated.article_id > last_id))
+        db.commit()
+        return indexed
+
+
+def main(argv: Optional[List[str]] = None) -> None:
+    parser = argparse.ArgumentParser(description="Maintain the related-articles index.")
+    parser.add_argument("command", choices=["rebuild"])
+    parser.parse_args(argv)
+
+    from app.db.session import SessionLocal
+
+    db = SessionLocal()
+    try:
+        print(f"Related-articles index rebuilt for {RelatedRepository().rebuild(db)} articles")
+    finally:
+        db.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -1,5 +1,5 @@
 from pydantic import BaseModel, Field, validator
-from typing import List, Optional
+from typing import Annotated, Dict, List, Optional
 from datetime import datetime
 
 """
@@ -24,10 +24,29 @@ Classes:
         Response schema used for returning article data to clients.
     ArticleList:
         Schema used for listing multiple articles.
+    ArticleFacets:
+        Schema used for facet counts (articles per tag / author).
+    RelatedArticle:
+        Schema used for an entry of the related-articles list.
+    NearDuplicate:
+        Schema used for an existing article similar to a new one.
+    ArticleCreated:
+        Response schema of article creation, with the near duplicates found.
+    ArticleBulkImport:
+        Schema used for bulk import requests.
+    BulkImportRejection:
+        Schema used for an article skipped by a bulk import.
+    BulkImportResult:
+        Response schema of a bulk import.
 
 """
 
 
+# Longitud de `article_tags.tag` y `article_facet_counts.value`, donde se indexa cada tag
+TAG_MAX_LENGTH = 255
+Tag = Annotated[str, Field(max_length=TAG_MAX_LENGTH)]
+
+
 class ArticleBase(BaseModel):
     title: str = Field(..., min_length=3, max_length=255)
     body: str = Field(..., min_length=10)
@@ -42,12 +61,12 @@ class ArticleBase(BaseModel):
         return v
 
 class ArticleCreate(ArticleBase):
-    pass
+    tags: Optional[List[Tag]] = Field(None, description="Lista de tags para el artículo")
 
 class ArticleUpdate(BaseModel):
     title: Optional[str] = Field(None, min_length=3, max_length=255)
     body: Optional[str] = Field(None, min_length=10)
-    tags: Optional[List[str]] = None
+    tags: Optional[List[Tag]] = None
     published_at: Optional[datetime] = None
 
 class ArticleInDB(ArticleBase):
@@ -62,4 +81,47 @@ class ArticleOut(ArticleInDB):
     pass
 
 class ArticleList(BaseModel):
-    articles: List[ArticleInDB]
\ No newline at end of file
+    articles: List[ArticleInDB]
+class ArticleFacets(BaseModel):
+    total: int = Field(..., description="Number of articles matching the filters")
+    facets: Dict[str, Dict[str, int]] = Field(..., description="Article counts per value, by facet field")
+    source: str = Field(..., description="`counters` (incremental counters) or `query` (aggregated on demand)")
+
+class RelatedArticle(BaseModel):
+    id: int
+    title: str
+    author: str
+    tags: Optional[List[str]] = None
+    published_at: Optional[datetime] = None
+    score: float = Field(..., description="Tag Jaccard similarity plus the same-author boost")
+
+    @validator("tags", pre=True)
+    def split_tags(cls, v):
+        if isinstance(v, str):
+            return v.split(";")
+        return v
+
+class NearDuplicate(BaseModel):
+    id: int
+    title: str
+    author: str
+    similarity: float = Field(..., description="Estimated Jaccard similarity of title and body shingles")
+
+class ArticleCreated(ArticleOut):
+    near_duplicates: List[NearDuplicate] = Field(
+        default_factory=list, description="Existing articles this one nearly duplicates (warn mode)"
+    )
+
+class ArticleBulkImport(BaseModel):
+    articles: List[ArticleCreate] = Field(..., min_length=1, max_length=1000)
+
+class BulkImportRejection(BaseModel):
+    index: int = Field(..., description="Position of the article in the request")
+    title: str
+    author: str
+    reason: str = Field(..., description="`duplicate` (same title and author) or `near_duplicate`")
+    near_duplicates: List[NearDuplicate] = Field(default_factory=list)
+
+class BulkImportResult(BaseModel):
+    created: List[ArticleCreated]
+    rejected: List[BulkImportRejection]
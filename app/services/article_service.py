@@ -1,9 +1,34 @@
+import logging
+import math
+from typing import List
+from sqlalchemy.exc import SQLAlchemyError
 from sqlalchemy.orm import Session
 from fastapi import HTTPException, status
+from app.core.config import settings
+from app.db.models import Article
 from app.repositories.article_repository import ArticleRepository
-from app.schemas.article_schema import ArticleCreate, ArticleUpdate, ArticleOut
-from app.cache.redis_wrapper import CacheWrapper
+from app.repositories.duplicate_repository import Signature, minhash_signature
+from app.repositories.related_repository import RelatedRepository
+from app.schemas.article_schema import (
+    ArticleCreate,
+    ArticleCreated,
+    ArticleUpdate,
+    ArticleOut,
+    BulkImportRejection,
+    BulkImportResult,
+    NearDuplicate,
+    RelatedArticle,
+)
+from app.cache.bloom import ArticleBloomFilter
+from app.cache.redis_wrapper import MISSING, CacheWrapper
+from app.core.metrics import BLOOM_FILTER_REJECTIONS
+from app.db.routing import replica_enabled
+from app.core.profiling import serialization_timer
+from app.core.tracing import trace_methods
 
+logger = logging.getLogger(__name__)
+
+@trace_methods("service")
 class ArticleService:
     """
     Business logic layer for managing Article entities.
@@ -13,9 +38,16 @@ class ArticleService:
     encapsulate validation, caching strategy, and exception handling for the `Article` domain.
 
     Responsibilities:
-        - Retrieve articles, prioritizing cached data when available.
-        - Create new articles while enforcing uniqueness constraints.
+        - Retrieve articles, prioritizing cached data when available, and answer
+          lookups of nonexistent ids from negative cache entries or the existence
+          Bloom filter without querying the database.
+        - Create new articles while enforcing uniqueness constraints, and check
+          them (singly or in bulk) for near duplicates of existing articles.
         - Update or delete existing articles and invalidate corresponding cache entries.
+        - Track hot articles and prewarm the cache with them; hot entries are
+          refreshed on update instead of being left to the next miss.
+        - Keep the related-articles index up to date on every write and serve
+          the cached related lists.
         - Translate low-level repository results into Pydantic response models (ArticleOut).
 
     Classes:
@@ -27,40 +59,136 @@ class ArticleService:
     def __init__(self, db: Session):
         self.db = db
         self.repo = ArticleRepository()
+        self.related = RelatedRepository()
         self.cache = CacheWrapper()
-        
+        self.bloom = ArticleBloomFilter()
 
     def get_article(self, article_id: int) -> ArticleOut:
         cached_article = self.cache.get(article_id)
+        if cached_article is MISSING:
+            raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Article not found")
         if cached_article:
-            return ArticleOut.model_validate(cached_article)
+            self.cache.track_access(article_id)
+            with serialization_timer():
+                return ArticleOut.model_validate(cached_article)
 
+        if not self.bloom.might_contain(article_id):
+            BLOOM_FILTER_REJECTIONS.inc()
+            raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Article not found")
         db_article = self.repo.get(self.db, article_id)
         if not db_article:
+            # Lectura posiblemente de la réplica: nunca sustituye una entrada ya escrita por una escritura
+            self.cache.set_missing(article_id, only_if_absent=True)
             raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Article not found")
-        
-        article_out = ArticleOut.from_orm(db_article)
-        self.cache.set(article_id, article_out.model_dump())
+        # Solo los ids que existen cuentan como calientes: los recorridos de ids inexistentes no ensucian el ranking
+        self.cache.track_access(article_id)
+
+        with serialization_timer():
+            article_out = ArticleOut.from_orm(db_article)
+            data = article_out.model_dump()
+        self.cache.set(article_id, data, only_if_absent=True)
         return article_out
 
-    def create_article(self, payload: ArticleCreate) -> ArticleOut:
+    def create_article(self, payload: ArticleCreate) -> ArticleCreated:
         existing_article = self.repo.get_by_title_and_author(self.db, title=payload.title, author=payload.author)
         if existing_article:
             raise HTTPException(
                 status_code=status.HTTP_409_CONFLICT,
                 detail="An article with the same title and author already exists."
             )
-        db_article = self.repo.create(self.db, payload=payload)
-        return ArticleOut.from_orm(db_article)
+        signature = minhash_signature(payload.title, payload.body)
+        near_duplicates = self._near_duplicates(signature)
+        if near_duplicates and settings.DUPLICATE_CHECK_MODE == "reject":
+            raise HTTPException(
+                status_code=status.HTTP_409_CONFLICT,
+                detail={
+                    "message": "The article is a near duplicate of existing articles.",
+                    "near_duplicates": [duplicate.model_dump() for duplicate in near_duplicates],
+                },
+            )
+        db_article = self.repo.create(self.db, payload=payload, signature=signature)
+        with serialization_timer():
+            article_out = ArticleCreated.model_validate(db_article)
+            article_out.near_duplicates = near_duplicates
+        self._register_created([article_out.id])
+        self._refresh_related(db_article, new=True)
+        return article_out
+
+    def import_articles(self, payloads: List[ArticleCreate]) -> BulkImportResult:
+        """
+        Create many articles, and their related-articles entries, in a single
+        transaction.
+
+        Every article goes through the same checks as `create_article`, also
+        against the articles imported earlier in the same batch. Exact
+        duplicates are always skipped; near duplicates are skipped in `reject`
+        mode and reported in `warn` mode.
+        """
+        created: List[ArticleCreated] = []
+        articles: List[Article] = []
+        rejected: List[BulkImportRejection] = []
+        for index, payload in enumerate(payloads):
+            if self.repo.get_by_title_and_author(self.db, title=payload.title, author=payload.author):
+                rejected.append(BulkImportRejection(
+                    index=index, title=payload.title, author=payload.author, reason="duplicate"
+                ))
+                continue
+            signature = minhash_signature(payload.title, payload.body)
+            near_duplicates = self._near_duplicates(signature)
+            if near_duplicates and settings.DUPLICATE_CHECK_MODE == "reject":
+                rejected.append(BulkImportRejection(
+                    index=index,
+                    title=payload.title,
+                    author=payload.author,
+                    reason="near_duplicate",
+                    near_duplicates=near_duplicates,
+                ))
+                continue
+            db_article = self.repo.create(self.db, payload=payload, signature=signature, commit=False)
+            with serialization_timer():
+                article_out = ArticleCreated.model_validate(db_article)
+                article_out.near_duplicates = near_duplicates
+            created.append(article_out)
+            articles.append(db_article)
+        affected = self._index_related(articles)
+        self.db.commit()
+        self._register_created([article.id for article in created])
+        self.cache.invalidate_related(affected)
+        return BulkImportResult(created=created, rejected=rejected)
+
+    def _near_duplicates(self, signature: Signature) -> List[NearDuplicate]:
+        if settings.DUPLICATE_CHECK_MODE == "off":
+            return []
+        near_duplicates = [
+            NearDuplicate(**row) for row in self.repo.duplicates.near_duplicates(self.db, signature)
+        ]
+        if near_duplicates:
+            logger.warning(
+                "Near-duplicate article detected",
+                extra={"near_duplicate_ids": [duplicate.id for duplicate in near_duplicates]},
+            )
+        return near_duplicates
 
     def update_article(self, article_id: int, payload: ArticleUpdate) -> ArticleOut:
         db_article = self.repo.get(self.db, article_id)
         if not db_article:
             raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Article not found")
 
+        previous_tags = db_article.tags
         updated_article = self.repo.update(self.db, db_obj=db_article, payload=payload)
-        self.cache.invalidate(article_id)
-        return ArticleOut.from_orm(updated_article)
+        with serialization_timer():
+            article_out = ArticleOut.from_orm(updated_article)
+        if updated_article.tags != previous_tags:
+            self._refresh_related(updated_article)
+        else:
+            # Las listas que lo incluyen muestran su título y fecha: se invalidan
+            self.cache.invalidate_related(self.related.referencing(self.db, article_id))
+        if self.cache.is_hot(article_id):
+            # Una clave caliente invalidada provocaría una ráfaga de misses: se reescribe ya
+            self.cache.set(article_id, article_out.model_dump())
+        else:
+            self.cache.invalidate(article_id, fence_seconds=self._fence_seconds())
+        return article_out
 
     def delete_article(self, article_id: int):
         db_article = self.repo.get(self.db, article_id)
@@ -68,6 +196,77 @@ class ArticleService:
             raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Article not found")
 
         self.repo.delete(self.db, db_obj=db_article)
-        self.cache.invalidate(article_id)
+        # El filtro de Bloom no puede olvidar el id: la entrada negativa evita consultarlo otra vez
+        self.cache.set_missing(article_id, ttl=max(settings.NEGATIVE_CACHE_TTL_SECONDS, self._fence_seconds()))
+        self.cache.invalidate_related([article_id, *self.related.remove(self.db, article_id)])
         return
+
+    def _register_created(self, article_ids: List[int]) -> None:
+        # Justo tras el commit: hasta entonces el filtro y las entradas negativas aún niegan los ids
+        self.bloom.add(article_ids)
+        self.cache.invalidate_many(article_ids, fence_seconds=self._fence_seconds())
+
+    @staticmethod
+    def _fence_seconds() -> int:
+        # Con réplica, una lectura atrasada no debe volver a cachear el estado anterior a la escritura
+        return math.ceil(settings.REPLICA_MAX_LAG_SECONDS) if replica_enabled() else 0
+
+    def _refresh_related(self, article: Article, new: bool = False) -> None:
+        # El artículo ya está guardado: un fallo del índice no debe anular la escritura
+        article_id = article.id
+        try:
+            affected = self.related.refresh(self.db, article, new=new)
+        except SQLAlchemyError:
+            self.db.rollback()
+            logger.exception("Related-articles index update failed", extra={"article_id": article_id})
+            return
+        self.cache.invalidate_related([article_id, *affected])
+
+    def _index_related(self, articles: List[Article]) -> List[int]:
+        # En la transacción de la importación; un fallo del índice solo deshace su savepoint
+        article_ids = [article.id for article in articles]
+        affected = set(article_ids)
+        try:
+            with self.db.begin_nested():
+                for article in articles:
+                    # Los artículos anteriores del lote ya lo añadieron a sus listas: no es `new`
+                    affected.update(self.related.refresh(self.db, article, commit=False))
+        except SQLAlchemyError:
+            logger.exception("Related-articles index update failed", extra={"article_ids": article_ids})
+            return []
+        return sorted(affected)
+
+    def get_related(self, article_id: int, k: int) -> List[RelatedArticle]:
+        """
+        Return the `k` articles most related to `article_id`, from the cached
+        list or the precomputed index (never from a scan of `articles`).
+        """
+        cached = self.cache.get_related(article_id)
+        if cached is not None:
+            with serialization_timer():
+                return [RelatedArticle.model_validate(item) for item in cached[:k]]
+
+        rows = self.related.related(self.db, article_id, settings.RELATED_INDEX_SIZE)
+        if not rows and not self.repo.get(self.db, article_id):
+            raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Article not found")
+        with serialization_timer():
+            related = [RelatedArticle.model_validate(row) for row in rows]
+            self.cache.set_related(article_id, [item.model_dump() for item in related])
+        return related[:k]
+
+    def warm_cache(self, top_n: int) -> int:
+        """
+        Load the `top_n` hottest articles into the cache with a single query
+        and a single Redis pipeline. Returns the number of articles read.
+
+        The rows may come from a lagging replica, so, like the other read-path
+        fills, only missing entries are written: fences, negative entries and
+        fresher data are left alone.
+        """
+        article_ids = self.cache.top_hot(top_n)
+        articles = self.repo.get_many(self.db, article_ids)
+        with serialization_timer():
+            items = {article.id: ArticleOut.from_orm(article).model_dump() for article in articles}
+        self.cache.set_many(items, only_if_absent=True)
+        return len(items)
     
\ No newline at end of file
@@ -0,0 +1,274 @@
+import argparse
+import json
+import os
+import platform
+import random
+import subprocess
+import sys
+import time
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timedelta, timezone
+from typing import Callable, Dict, List, Optional, Tuple
+
+"""
+Reproducible benchmark suite for the Article Management API.
+
+Runs a fixed set of scenarios against every endpoint and writes throughput and
+latency percentiles to a JSON file, tagged with the current git commit, so runs
+can be compared across commits (`--compare baseline.json`).
+
+By default the API is exercised in-process through `TestClient`, against the
+database and Redis configured in the environment (local PostgreSQL/Redis). For
+a self-contained run, `--sqlite PATH` and `--fake-redis` swap in SQLite and
+fakeredis stand-ins. `--url` targets an already running server instead.
+
+Usage:
+    python -m benchmarks.run --sqlite /tmp/bench.db --fake-redis --articles 10000 \\
+        --requests 500 --concurrency 8 --output bench.json
+"""
+
+Request = Tuple[str, str, Optional[dict]]
+
+
+def percentile(sorted_values: List[float], pct: float) -> float:
+    """Nearest-rank percentile of an already sorted list."""
+    if not sorted_values:
+        return 0.0
+    rank = max(1, int(round(pct / 100 * len(sorted_values))))
+    return sorted_values[min(rank, len(sorted_values)) - 1]
+
+
+def summarize(latencies: List[float], errors: int, wall_time: float) -> Dict:
+    values = sorted(latencies)
+    return {
+        "requests": len(values),
+        "errors": errors,
+        "throughput_rps": round(len(values) / wall_time, 2) if wall_time else 0.0,
+        "latency_ms": {
+            "mean": round(sum(values) / len(values) * 1000, 3) if values else 0.0,
+            "p50": round(percentile(values, 50) * 1000, 3),
+            "p90": round(percentile(values, 90) * 1000, 3),
+            "p95": round(percentile(values, 95) * 1000, 3),
+            "p99": round(percentile(values, 99) * 1000, 3),
+            "max": round(values[-1] * 1000, 3) if values else 0.0,
+        },
+    }
+
+
+def run_scenario(client, requests: List[Request], concurrency: int, expected: Tuple[int, ...]) -> Dict:
+    """Send `requests` with `concurrency` threads and summarize the latencies."""
+
+    def send(request: Request) -> Tuple[float, bool]:
+        method, url, payload = request
+        start = time.perf_counter()
+        response = client.request(method, url, json=payload)
+        return time.perf_counter() - start, response.status_code in expected
+
+    start = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=concurrency) as pool:
+        results = list(pool.map(send, requests))
+    wall_time = time.perf_counter() - start
+    return summarize([r[0] for r in results], sum(1 for r in results if not r[1]), wall_time)
+
+
+def _git_commit() -> Optional[str]:
+    try:
+        return subprocess.check_output(["git", "rev-parse", "HEAD"], text=True, stderr=subprocess.DEVNULL).strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def _configure_environment(args) -> None:
+    """Set up stand-ins before `app` is imported (settings are read at import)."""
+    if args.sqlite:
+        os.environ["DATABASE_URL"] = f"sqlite:///{args.sqlite}"
+        for name in ("POSTGRES_DB", "POSTGRES_USER", "POSTGRES_PASSWORD"):
+            os.environ.setdefault(name, "benchmark")
+    # El rate limiter por IP rechazaría casi todo el tráfico del benchmark
+    os.environ.setdefault("RATE_LIMIT_MAX_REQUESTS", str(10 ** 9))
+
+
+def _use_fake_redis() -> None:
+    import fakeredis
+
+    from app.cache import redis_wrapper
+
+    redis_wrapper.redis_client = fakeredis.FakeRedis(decode_responses=True)
+
+
+def build_scenarios(args, ids: List[int], authors: List[str]) -> Dict[str, Tuple[List[Request], Tuple[int, ...], Callable]]:
+    """
+    Build the request list of every scenario. Each entry maps a name to
+    (requests, expected status codes, setup callable run before timing).
+    """
+    from app.cache.redis_wrapper import CacheWrapper
+    from app.core.config import settings
+
+    rng = random.Random(args.seed)
+    base = f"{settings.API_V1_STR}/articles"
+    n = args.requests
+    hot_ids = rng.sample(ids, min(100, len(ids)))
+    miss_ids = rng.sample(ids, min(n, len(ids)))
+    since = (datetime(2026, 1, 1) - timedelta(days=30)).isoformat()
+    run_id = uuid.uuid4().hex[:8]
+    cache = CacheWrapper()
+
+    def warm_hot(client):
+        for article_id in hot_ids:
+            client.get(f"{base}/{article_id}")
+
+    def flush_misses(client):
+        for article_id in miss_ids:
+            cache.invalidate(article_id)
+
+    scenarios = {
+        "get_hit": ([("GET", f"{base}/{hot_ids[i % len(hot_ids)]}", None) for i in range(n)], (200,), warm_hot),
+        "get_miss": ([("GET", f"{base}/{article_id}", None) for article_id in miss_ids], (200,), flush_misses),
+        "list_author": (
+            [("GET", f"{base}/?author={authors[i % len(authors)]}&limit=20", None) for i in range(n)], (200,), None
+        ),
+        "list_date_range": ([("GET", f"{base}/?published_after={since}&limit=20", None)] * n, (200,), None),
+        "search": (
+            # Los títulos generados terminan en "#<n>": consultas selectivas y reproducibles
+            [("GET", f"{base}/search?q=%23{rng.randrange(len(ids))}", None) for _ in range(n)],
+            (200, 404),
+            None,
+        ),
+        "create": (
+            [("POST", f"{base}/", {
+                "title": f"Benchmark {run_id} {i}", "body": "Benchmark body " * 20, "author": "Benchmark",
+                "tags": ["benchmark"],
+            }) for i in range(n)],
+            (201,),
+            None,
+        ),
+        "update": (
+            [("PUT", f"{base}/{hot_ids[i % len(hot_ids)]}", {"body": f"Updated benchmark body {i} " * 10})
+             for i in range(n)],
+            (200,),
+            None,
+        ),
+    }
+    for depth in args.list_depths:
+        scenarios[f"list_depth_{depth}"] = (
+            [("GET", f"{base}/?skip={min(depth, max(len(ids) - 20, 0))}&limit=20", None)] * n, (200,), None
+        )
+    return scenarios
+
+
+def compare(current: Dict, baseline_path: str) -> None:
+    """Print p50/p99/throughput deltas against a previous result file."""
+    with open(baseline_path, encoding="utf-8") as fh:
+        baseline = json.load(fh)
+    print(f"{'scenario':<20}{'p50 ms':>18}{'p99 ms':>18}{'rps':>18}")
+    for name, result in current["scenarios"].items():
+        before = baseline["scenarios"].get(name)
+        if not before:
+            continue
+        cells = []
+        for old, new in (
+            (before["latency_ms"]["p50"], result["latency_ms"]["p50"]),
+            (before["latency_ms"]["p99"], result["latency_ms"]["p99"]),
+            (before["throughput_rps"], result["throughput_rps"]),
+        ):
+            delta = (new - old) / old * 100 if old else 0.0
+            cells.append(f"{new:>9.2f} ({delta:+5.1f}%)")
+        print(f"{name:<20}" + "".join(f"{c:>18}" for c in cells))
+
+
+def main(argv: Optional[List[str]] = None) -> Dict:
+    parser = argparse.ArgumentParser(description="Run the API benchmark suite.")
+    parser.add_argument("--articles", type=int, default=10_000, help="Dataset size to generate if the table is empty")
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--requests", type=int, default=500, help="Requests per scenario")
+    parser.add_argument("--concurrency", type=int, default=8)
+    parser.add_argument("--list-depths", type=int, nargs="+", default=[0, 1000, 10000])
+    parser.add_argument("--scenarios", nargs="+", help="Subset of scenarios to run")
+    parser.add_argument("--sqlite", help="Use a SQLite database at this path instead of DATABASE_URL")
+    parser.add_argument("--fake-redis", action="store_true", help="Use fakeredis instead of REDIS_URL")
+    parser.add_argument("--url", help="Benchmark a running server instead of the in-process app")
+    parser.add_argument("--output", default="bench_output.json")
+    parser.add_argument("--compare", help="Previous result file to compare against")
+    args = parser.parse_args(argv)
+
+    _configure_environment(args)
+
+    import httpx
+    from fastapi.testclient import TestClient
+    from sqlalchemy import func, select
+
+    from app.core.config import settings
+    from app.db.base import Base
+    from app.db.models import Article
+    from app.db.session import engine
+    from app.main import app
+    from benchmarks.datagen import populate
+
+    if args.fake_redis:
+        _use_fake_redis()
+
+    Base.metadata.create_all(bind=engine)
+    with engine.connect() as conn:
+        existing = conn.execute(select(func.count()).select_from(Article)).scalar()
+    if existing == 0:
+        print(f"Generating {args.articles} articles (seed={args.seed})...")
+        populate(engine, args.articles, seed=args.seed)
+    with engine.connect() as conn:
+        ids = list(conn.execute(select(Article.id).order_by(Article.id)).scalars())
+        authors = list(conn.execute(
+            select(Article.author).group_by(Article.author).order_by(func.count().desc()).limit(20)
+        ).scalars())
+
+    headers = {"X-API-Key": settings.API_KEY} if settings.API_KEY else {}
+    if args.url:
+        client = httpx.Client(base_url=args.url, headers=headers, timeout=30)
+    else:
+        client = TestClient(app, headers=headers)
+        client.__enter__()
+
+    scenarios = build_scenarios(args, ids, authors)
+    selected = args.scenarios or list(scenarios)
+    results = {
+        "meta": {
+            "commit": _git_commit(),
+            "timestamp": datetime.now(timezone.utc).isoformat(),
+            "articles": len(ids),
+            "seed": args.seed,
+            "requests_per_scenario": args.requests,
+            "concurrency": args.concurrency,
+            "database": engine.dialect.name,
+            "redis": "fakeredis" if args.fake_redis else "redis",
+            "target": args.url or "in-process",
+            "python": platform.python_version(),
+        },
+        "scenarios": {},
+    }
+    try:
+        for name in selected:
+            requests, expected, setup = scenarios[name]
+            if setup:
+                setup(client)
+            results["scenarios"][name] = run_scenario(client, requests, args.concurrency, expected)
+            summary = results["scenarios"][name]
+            print(
+                f"{name:<20} {summary['throughput_rps']:>10.1f} rps  "
+                f"p50={summary['latency_ms']['p50']:.2f}ms p99={summary['latency_ms']['p99']:.2f}ms "
+                f"errors={summary['errors']}"
+            )
+    finally:
+        if args.url:
+            client.close()
+        else:
+            client.__exit__(*sys.exc_info())
+
+    with open(args.output, "w", encoding="utf-8") as fh:
+        json.dump(results, fh, indent=2)
+    print(f"Results written to {args.output}")
+    if args.compare:
+        compare(results, args.compare)
+    return results
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,149 @@
+import argparse
+import json
+import os
+import random
+import subprocess
+import sys
+import time
+from datetime import datetime, timezone
+from typing import Dict, List, Optional
+
+from benchmarks.run import _configure_environment, _git_commit, run_scenario
+
+"""
+Load test of the production server profile across worker counts.
+
+Starts `gunicorn app.main:app` (configured by `gunicorn.conf.py`) once per
+worker count, drives the same read-heavy mix against each instance over HTTP
+and reports throughput, latency percentiles and the speedup relative to the
+smallest worker count. Throughput should grow roughly linearly with the
+workers until the CPU count, the database or the load generator saturates;
+run the generator on a separate machine for figures above a few cores.
+
+Usage:
+    python -m benchmarks.scaling --sqlite /tmp/bench.db --workers 1 2 4 8 \\
+        --requests 2000 --concurrency 32 --output scaling.json
+"""
+
+
+def speedups(results: Dict[str, Dict]) -> Dict[str, float]:
+    """Throughput of each worker count relative to the first one measured."""
+    counts = list(results)
+    if not counts:
+        return {}
+    base = results[counts[0]]["throughput_rps"]
+    return {count: round(results[count]["throughput_rps"] / base, 2) if base else 0.0 for count in counts}
+
+
+def _wait_until_ready(client, timeout: float) -> None:
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        try:
+            if client.get("/health").status_code == 200:
+                return
+        except Exception:
+            pass
+        time.sleep(0.2)
+    raise RuntimeError("Server did not become ready in time")
+
+
+def _start_server(workers: int, port: int) -> subprocess.Popen:
+    env = dict(os.environ, SERVER_WORKERS=str(workers), API_PORT=str(port))
+    # Cada ejecución usa su propio directorio de métricas multiproceso
+    env["PROMETHEUS_MULTIPROC_DIR"] = f"/tmp/prometheus-scaling-{port}-{workers}"
+    return subprocess.Popen(
+        [sys.executable, "-m", "gunicorn", "app.main:app", "--bind", f"127.0.0.1:{port}"],
+        env=env,
+        stdout=subprocess.DEVNULL,
+        stderr=subprocess.DEVNULL,
+    )
+
+
+def main(argv: Optional[List[str]] = None) -> Dict:
+    parser = argparse.ArgumentParser(description="Measure throughput scaling with the worker count.")
+    parser.add_argument("--workers", type=int, nargs="+", default=[1, 2, 4])
+    parser.add_argument("--articles", type=int, default=10_000, help="Dataset size to generate if the table is empty")
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--requests", type=int, default=2000, help="Requests per worker count")
+    parser.add_argument("--concurrency", type=int, default=32)
+    parser.add_argument("--sqlite", help="Use a SQLite database at this path instead of DATABASE_URL")
+    parser.add_argument("--port", type=int, default=8100)
+    parser.add_argument("--output", default="scaling_output.json")
+    args = parser.parse_args(argv)
+
+    _configure_environment(args)
+
+    import httpx
+    from sqlalchemy import func, select
+
+    from app.core.config import settings
+    from app.db.base import Base
+    from app.db.models import Article
+    from app.db.session import engine
+    from benchmarks.datagen import populate
+
+    Base.metadata.create_all(bind=engine)
+    with engine.connect() as conn:
+        if conn.execute(select(func.count()).select_from(Article)).scalar() == 0:
+            print(f"Generating {args.articles} articles (seed={args.seed})...")
+            populate(engine, args.articles, seed=args.seed)
+    with engine.connect() as conn:
+        ids = list(conn.execute(select(Article.id).order_by(Article.id)).scalars())
+        authors = list(conn.execute(
+            select(Article.author).group_by(Article.author).order_by(func.count().desc()).limit(20)
+        ).scalars())
+    engine.dispose()
+
+    rng = random.Random(args.seed)
+    base = f"{settings.API_V1_STR}/articles"
+    # Mezcla de lectura: 80% por id (caché o BD) y 20% listados por autor
+    requests = [
+        ("GET", f"{base}/{rng.choice(ids)}", None) if rng.random() < 0.8
+        else ("GET", f"{base}/?author={rng.choice(authors)}&limit=20", None)
+        for _ in range(args.requests)
+    ]
+    headers = {"X-API-Key": settings.API_KEY} if settings.API_KEY else {}
+
+    results: Dict[str, Dict] = {}
+    for workers in args.workers:
+        server = _start_server(workers, args.port)
+        limits = httpx.Limits(max_connections=args.concurrency, max_keepalive_connections=args.concurrency)
+        try:
+            with httpx.Client(
+                base_url=f"http://127.0.0.1:{args.port}", headers=headers, timeout=30, limits=limits
+            ) as client:
+                _wait_until_ready(client, timeout=30)
+                run_scenario(client, requests[: args.concurrency * 4], args.concurrency, (200,))  # calentamiento
+                results[str(workers)] = run_scenario(client, requests, args.concurrency, (200,))
+        finally:
+            server.terminate()
+            server.wait(timeout=30)
+        summary = results[str(workers)]
+        print(
+            f"workers={workers:<3} {summary['throughput_rps']:>10.1f} rps  "
+            f"p50={summary['latency_ms']['p50']:.2f}ms p99={summary['latency_ms']['p99']:.2f}ms "
+            f"errors={summary['errors']}"
+        )
+
+    output = {
+        "meta": {
+            "commit": _git_commit(),
+            "timestamp": datetime.now(timezone.utc).isoformat(),
+            "articles": len(ids),
+            "requests": args.requests,
+            "concurrency": args.concurrency,
+            "cpu_count": os.cpu_count(),
+            "database": engine.dialect.name,
+        },
+        "workers": results,
+        "speedup": speedups(results),
+    }
+    with open(args.output, "w", encoding="utf-8") as fh:
+        json.dump(output, fh, indent=2)
+    print("Speedup:", ", ".join(f"{count} workers x{factor}" for count, factor in output["speedup"].items()))
+    print(f"Results written to {args.output}")
+    return output
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,27 @@
+"""
+Gunicorn configuration for the production server profile.
+
+    gunicorn app.main:app
+
+Values come from the application settings (`SERVER_*`, `API_PORT`); see
+`app.core.server`.
+"""
+from app.core.config import settings
+from app.core.server import mark_worker_dead, prepare_multiprocess_metrics, worker_count
+
+bind = f"0.0.0.0:{settings.API_PORT}"
+worker_class = "app.core.server.ProductionUvicornWorker"
+workers = worker_count()
+preload_app = settings.SERVER_PRELOAD
+# Reciclado escalonado de workers: acota fugas de memoria sin reinicios simultáneos
+max_requests = settings.SERVER_MAX_REQUESTS
+max_requests_jitter = settings.SERVER_MAX_REQUESTS_JITTER
+timeout = settings.SERVER_TIMEOUT
+graceful_timeout = settings.SERVER_GRACEFUL_TIMEOUT
+keepalive = settings.SERVER_KEEPALIVE
+
+prepare_multiprocess_metrics(workers)
+
+
+def child_exit(server, worker):
+    mark_worker_dead(worker.pid)
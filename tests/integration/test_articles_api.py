@@ -48,4 +48,46 @@ def test_delete_article(client: TestClient):
 
     # 3. Verificar que el artículo ya no se puede obtener (debe dar 404)
     response = client.get(f"/api/v1/articles/{article_id}")
-    assert response.status_code == 404, f"Expected 404, got {response.status_code}: {response.text}"
\ No newline at end of file
+    assert response.status_code == 404, f"Expected 404, got {response.status_code}: {response.text}"
+def test_list_articles(client: TestClient):
+    """
+    Prueba que el listado de artículos responde y filtra por autor.
+    """
+    response = client.post(
+        "/api/v1/articles/",
+        json={"title": "Listed Article", "body": "This body is long enough.", "author": "Lister"},
+    )
+    assert response.status_code == 201, f"Expected 201, got {response.status_code}: {response.text}"
+
+    response = client.get("/api/v1/articles/", params={"author": "Lister"})
+    assert response.status_code == 200, f"Expected 200, got {response.status_code}: {response.text}"
+    assert [a["title"] for a in response.json()] == ["Listed Article"]
+    assert "X-Request-ID" in response.headers
+
+
+def test_update_refreshes_hot_article_in_cache(client, monkeypatch):
+    """
+    Prueba que al actualizar un artículo caliente su entrada en caché se
+    reescribe con los datos nuevos en lugar de invalidarse.
+    """
+    import fakeredis
+    from app.cache import redis_wrapper
+    from app.cache.redis_wrapper import CacheWrapper
+    from app.core.config import settings
+
+    monkeypatch.setattr(redis_wrapper, "redis_client", fakeredis.FakeRedis(decode_responses=True))
+    monkeypatch.setattr(settings, "HOT_KEY_SAMPLE_RATE", 1.0)
+
+    created = client.post(f"{settings.API_V1_STR}/articles/", json={
+        "title": "Hot article", "body": "Body of a very popular article.", "author": "Hot Author",
+    }).json()
+    client.get(f"{settings.API_V1_STR}/articles/{created['id']}")
+
+    response = client.put(
+        f"{settings.API_V1_STR}/articles/{created['id']}", json={"body": "Refreshed body of the article."}
+    )
+    assert response.status_code == 200
+
+    cached = CacheWrapper().get(created["id"])
+    assert cached is not None
+    assert cached["body"] == "Refreshed body of the article."
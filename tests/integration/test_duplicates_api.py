@@ -0,0 +1,82 @@
+from fastapi.testclient import TestClient
+
+from app.core.config import settings
+
+URL = "/api/v1/articles"
+
+BODY = (
+    "Consistent hashing spreads cache keys across a ring of nodes so that adding "
+    "or removing one node only moves a small fraction of the keys, and virtual "
+    "nodes keep the load balanced between the physical servers of the cluster."
+)
+EDITED_BODY = BODY.replace("physical servers", "physical machines")
+OTHER_BODY = (
+    "Sourdough bread needs a lively starter, a long cold fermentation in the fridge "
+    "and a very hot oven with steam during the first minutes of the bake."
+)
+
+
+def test_create_warns_about_near_duplicates(client: TestClient, monkeypatch):
+    """
+    Prueba que en modo `warn` un artículo casi idéntico se crea y devuelve
+    los candidatos con su similitud, y que uno distinto no devuelve ninguno.
+    """
+    monkeypatch.setattr(settings, "DUPLICATE_CHECK_MODE", "warn")
+    original = client.post(f"{URL}/", json={"title": "Hashing rings explained", "body": BODY, "author": "Dup A"})
+    assert original.status_code == 201
+    assert original.json()["near_duplicates"] == []
+
+    repost = client.post(f"{URL}/", json={"title": "Hashing rings explained!", "body": EDITED_BODY, "author": "Dup B"})
+    assert repost.status_code == 201
+    near = repost.json()["near_duplicates"]
+    assert [item["id"] for item in near] == [original.json()["id"]]
+    assert settings.DUPLICATE_SIMILARITY_THRESHOLD <= near[0]["similarity"] < 1.0
+
+    other = client.post(f"{URL}/", json={"title": "Baking sourdough", "body": OTHER_BODY, "author": "Dup C"})
+    assert other.json()["near_duplicates"] == []
+
+
+def test_create_rejects_near_duplicates(client: TestClient, monkeypatch):
+    """
+    Prueba que en modo `reject` un casi duplicado devuelve 409 con los
+    candidatos, y que tras editar el original deja de considerarse duplicado.
+    """
+    monkeypatch.setattr(settings, "DUPLICATE_CHECK_MODE", "reject")
+    body = BODY.replace("cache keys", "session keys")
+    original = client.post(f"{URL}/", json={"title": "Rings for sessions", "body": body, "author": "Dup Reject"})
+    assert original.status_code == 201
+
+    response = client.post(f"{URL}/", json={"title": "Rings for sessions", "body": body, "author": "Dup Copycat"})
+    assert response.status_code == 409
+    detail = response.json()["detail"]
+    assert detail["near_duplicates"][0]["id"] == original.json()["id"]
+    assert detail["near_duplicates"][0]["similarity"] == 1.0
+
+    client.put(f"{URL}/{original.json()['id']}", json={"body": OTHER_BODY.replace("bread", "loaves")})
+    response = client.post(f"{URL}/", json={"title": "Rings for sessions", "body": body, "author": "Dup Copycat"})
+    assert response.status_code == 201
+
+
+def test_bulk_import_checks_duplicates_within_the_batch(client: TestClient, monkeypatch):
+    """
+    Prueba que la importación masiva crea los artículos nuevos y omite los
+    duplicados exactos y los casi duplicados, también dentro del mismo lote.
+    """
+    monkeypatch.setattr(settings, "DUPLICATE_CHECK_MODE", "reject")
+    body = BODY.replace("cache keys", "queue partitions")
+    articles = [
+        {"title": "Bulk ring one", "body": body, "author": "Bulk Author"},
+        {"title": "Bulk ring one", "body": OTHER_BODY, "author": "Bulk Author"},
+        {"title": "Bulk ring copy", "body": body, "author": "Bulk Other"},
+        {"title": "Bulk bread", "body": "Import pipelines should validate every record before writing it.", "author": "Bulk Author"},
+    ]
+
+    response = client.post(f"{URL}/bulk", json={"articles": articles})
+    assert response.status_code == 200
+    data = response.json()
+    assert [item["title"] for item in data["created"]] == ["Bulk ring one", "Bulk bread"]
+    assert [(item["index"], item["reason"]) for item in data["rejected"]] == [(1, "duplicate"), (2, "near_duplicate")]
+    assert data["rejected"][1]["near_duplicates"][0]["id"] == data["created"][0]["id"]
+
+    assert client.get(f"{URL}/{data['created'][0]['id']}").status_code == 200
+    assert client.post(f"{URL}/bulk", json={"articles": []}).status_code == 422
@@ -0,0 +1,104 @@
+from fastapi.testclient import TestClient
+
+from app.db.models import ArticleFacetCount
+from app.repositories.article_repository import ArticleRepository
+from app.repositories.facet_repository import FacetRepository
+
+URL = "/api/v1/articles/facets"
+
+
+def _create(client: TestClient, title: str, author: str, tags):
+    response = client.post(
+        "/api/v1/articles/",
+        json={"title": title, "body": "This is a valid test body.", "author": author, "tags": tags},
+    )
+    assert response.status_code == 201, response.text
+    return response.json()
+
+
+def test_facets_follow_creates_updates_and_deletes(client: TestClient):
+    """
+    Prueba que las facetas filtradas por autor se sirven de los contadores y
+    se mantienen al crear, actualizar los tags y eliminar artículos.
+    """
+    first = _create(client, "Facet One", "Facet Author", ["python", "fastapi"])
+    _create(client, "Facet Two", "Facet Author", ["python"])
+
+    response = client.get(URL, params={"author": "Facet Author"})
+    assert response.status_code == 200
+    data = response.json()
+    assert data["source"] == "counters"
+    assert data["total"] == 2
+    assert data["facets"] == {"tags": {"python": 2, "fastapi": 1}, "author": {"Facet Author": 2}}
+
+    client.put(f"/api/v1/articles/{first['id']}", json={"tags": ["redis"]})
+    data = client.get(URL, params={"author": "Facet Author", "fields": "tags"}).json()
+    assert data["facets"] == {"tags": {"python": 1, "redis": 1}}
+
+    client.delete(f"/api/v1/articles/{first['id']}")
+    data = client.get(URL, params={"author": "Facet Author"}).json()
+    assert data["total"] == 1
+    assert data["facets"]["tags"] == {"python": 1}
+
+
+def test_counters_match_aggregation_and_recount(client: TestClient, db_session):
+    """
+    Prueba que los contadores globales coinciden con la agregación sobre la
+    tabla, y que el recuento completo repara contadores corrompidos y borra
+    los que quedan a cero.
+    """
+    _create(client, "Facet Global", "Facet Global Author", ["python", "sql"])
+    repo = ArticleRepository()
+
+    def from_query():
+        return repo.facets.query_facets(db_session, repo.list_query(db_session), ["tags", "author"], size=1000)
+
+    total, facets, source = repo.facet_counts(db_session, ["tags", "author"], size=1000)
+    assert source == "counters"
+    assert (total, facets) == from_query()
+
+    db_session.query(ArticleFacetCount).filter(ArticleFacetCount.field == "tags").update({"count": 99})
+    db_session.add(ArticleFacetCount(scope="", field="tags", value="stale", count=3))
+    db_session.commit()
+    assert FacetRepository().recount(db_session) > 0
+    assert repo.facet_counts(db_session, ["tags", "author"], size=1000)[:2] == from_query()
+    assert db_session.query(ArticleFacetCount).filter(ArticleFacetCount.value == "stale").count() == 0
+    assert FacetRepository().recount(db_session) == 0
+
+
+def test_facets_with_other_filters_use_the_query(client: TestClient):
+    """
+    Prueba que los filtros sin contadores (tag, fechas) se agregan sobre la
+    consulta de listado y respetan los mismos filtros que el listado.
+    """
+    _create(client, "Facet Filtered", "Facet Filter Author", ["facetfilter", "python"])
+    response = client.get(URL, params={"tag": "facetfilter"})
+    data = response.json()
+    assert data["source"] == "query"
+    assert data["total"] == 1
+    assert data["facets"] == {"tags": {"facetfilter": 1, "python": 1}, "author": {"Facet Filter Author": 1}}
+
+
+def test_facets_reject_unknown_fields(client: TestClient):
+    """
+    Prueba que pedir un campo de faceta desconocido devuelve 422.
+    """
+    response = client.get(URL, params={"fields": "tags,body"})
+    assert response.status_code == 422
+    assert "body" in response.json()["detail"]
+
+
+def test_tags_longer_than_the_counter_column_are_rejected(client: TestClient):
+    """
+    Prueba que un tag más largo que la columna de los contadores se rechaza
+    con 422 al crear y al actualizar, en vez de fallar en la base de datos.
+    """
+    long_tag = "t" * 256
+    response = client.post(
+        "/api/v1/articles/",
+        json={"title": "Facet Long Tag", "body": "This is a valid test body.", "author": "Facet Long", "tags": [long_tag]},
+    )
+    assert response.status_code == 422
+
+    article = _create(client, "Facet Long Tag", "Facet Long", ["t" * 255])
+    assert client.put(f"/api/v1/articles/{article['id']}", json={"tags": [long_tag]}).status_code == 422
@@ -0,0 +1,53 @@
+from fastapi.testclient import TestClient
+from sqlalchemy import event
+
+from app.core.config import settings
+from app.db.session import engine, engine_options
+
+
+def test_health_served_from_snapshot(client: TestClient):
+    """
+    Prueba que /health responde desde el snapshot del monitor en segundo plano,
+    sin ejecutar SQL por cada sonda, e incluye las estadísticas del pool.
+    """
+    statements = []
+
+    def _count(conn, cursor, statement, parameters, context, executemany):
+        statements.append(statement)
+
+    client.get("/health")  # asegura que exista un snapshot
+    event.listen(engine, "before_cursor_execute", _count)
+    try:
+        for _ in range(5):
+            response = client.get("/health")
+            assert response.status_code == 200
+    finally:
+        event.remove(engine, "before_cursor_execute", _count)
+
+    data = response.json()
+    assert data["database"] == "ok"
+    assert "checked_at" in data
+    assert "checkedout" in data["pool"]
+    assert "SELECT 1" not in statements
+
+
+def test_engine_options_pool_settings(monkeypatch):
+    """
+    Prueba que las opciones del engine respetan la configuración del pool y el
+    modo PgBouncer.
+    """
+    url = "postgresql+psycopg2://user:pass@db:5432/articles"
+    monkeypatch.setattr(settings, "DB_POOL_SIZE", 7)
+    monkeypatch.setattr(settings, "DB_PGBOUNCER_MODE", False)
+    options = engine_options(url)
+    assert options["pool_size"] == 7
+    assert options["pool_pre_ping"] is settings.DB_POOL_PRE_PING
+    assert options["pool_recycle"] == settings.DB_POOL_RECYCLE
+
+    monkeypatch.setattr(settings, "DB_PGBOUNCER_MODE", True)
+    options = engine_options(url)
+    assert options["poolclass"].__name__ == "NullPool"
+    assert "pool_size" not in options
+
+    options = engine_options("postgresql+psycopg://user:pass@db:5432/articles")
+    assert options["connect_args"] == {"prepare_threshold": None}
@@ -0,0 +1,24 @@
+from fastapi.testclient import TestClient
+
+
+def test_metrics_endpoint_exposes_route_and_db_metrics(client: TestClient):
+    """
+    Prueba que /metrics expone la latencia por ruta (con la plantilla de la ruta,
+    no el path crudo) y los contadores de consultas SQL.
+    """
+    response = client.post(
+        "/api/v1/articles/",
+        json={"title": "Metrics Test Title", "body": "This is a valid test body.", "author": "Metrics"},
+    )
+    assert response.status_code == 201, f"Expected 201, got {response.status_code}: {response.text}"
+    client.get(f"/api/v1/articles/{response.json()['id']}")
+
+    response = client.get("/metrics")
+    assert response.status_code == 200
+    body = response.text
+    assert 'http_request_duration_seconds_bucket{le="0.005",method="GET",route="/api/v1/articles/{article_id}",status="200"}' in body
+    assert "http_requests_in_progress" in body
+    assert 'db_queries_total{operation="INSERT"}' in body
+    assert "db_query_duration_seconds_count" in body
+    assert "cache_errors_total" in body
+    assert "rate_limit_rejections_total" in body
@@ -0,0 +1,141 @@
+from contextlib import contextmanager
+from unittest.mock import MagicMock
+
+import pytest
+from alembic.migration import MigrationContext
+from alembic.operations import Operations
+from sqlalchemy import create_engine, inspect, select, text
+
+from app.db.migrations import (
+    apply_timeouts,
+    backfill,
+    create_index_concurrently,
+    drop_index_concurrently,
+    progress_table,
+    reset_backfill,
+)
+
+
+@contextmanager
+def _migration(engine):
+    with engine.connect() as conn:
+        context = MigrationContext.configure(conn)
+        with Operations.context(context), context.begin_transaction():
+            yield
+
+
+def _engine(tmp_path):
+    engine = create_engine(f"sqlite:///{tmp_path / 'migrations.db'}")
+    with engine.begin() as conn:
+        conn.execute(text("CREATE TABLE items (id INTEGER PRIMARY KEY, value INTEGER, doubled INTEGER)"))
+        conn.execute(text("INSERT INTO items (id, value) VALUES " + ", ".join(f"({i}, {i})" for i in range(1, 11))))
+    return engine
+
+
+STATEMENT = "UPDATE items SET doubled = value * 2 WHERE id >= :start AND id < :end AND doubled IS NULL"
+
+
+def test_backfill_runs_in_batches_and_records_progress(tmp_path):
+    """
+    Prueba que el backfill recorre la tabla por rangos de id, registra su
+    progreso y no se repite una vez completado.
+    """
+    engine = _engine(tmp_path)
+
+    with _migration(engine):
+        assert backfill("items_doubled", "items", STATEMENT, batch_size=3, sleep_seconds=0) == 10
+    with _migration(engine):
+        assert backfill("items_doubled", "items", STATEMENT, batch_size=3, sleep_seconds=0) == 0
+
+    with engine.connect() as conn:
+        assert conn.execute(text("SELECT count(*) FROM items WHERE doubled = value * 2")).scalar() == 10
+        progress = conn.execute(select(progress_table)).one()
+    assert (progress.name, progress.last_key, progress.done) == ("items_doubled", 10, True)
+
+
+def test_backfill_resumes_after_last_committed_batch(tmp_path):
+    """
+    Prueba que un backfill interrumpido continúa tras el último rango
+    confirmado en lugar de empezar de nuevo.
+    """
+    engine = _engine(tmp_path)
+    with engine.begin() as conn:
+        progress_table.create(conn)
+        conn.execute(progress_table.insert().values(name="items_doubled", last_key=6, done=False))
+
+    with _migration(engine):
+        assert backfill("items_doubled", "items", STATEMENT, batch_size=3, sleep_seconds=0) == 4
+
+    with engine.connect() as conn:
+        filled = conn.execute(text("SELECT id FROM items WHERE doubled IS NOT NULL ORDER BY id")).scalars().all()
+    assert filled == [7, 8, 9, 10]
+
+
+def test_reset_backfill_runs_it_again(tmp_path):
+    """
+    Prueba que, tras `reset_backfill` (como en un downgrade), el backfill
+    completado vuelve a ejecutarse en la siguiente subida.
+    """
+    engine = _engine(tmp_path)
+    with _migration(engine):
+        assert backfill("items_doubled", "items", STATEMENT, batch_size=3, sleep_seconds=0) == 10
+
+    with _migration(engine):
+        reset_backfill("items_doubled")
+    with engine.begin() as conn:
+        conn.execute(text("UPDATE items SET doubled = NULL"))
+    with _migration(engine):
+        assert backfill("items_doubled", "items", STATEMENT, batch_size=3, sleep_seconds=0) == 10
+
+
+def test_backfill_rejects_unsupported_dialect(tmp_path):
+    """
+    Prueba que un backfill escrito para otro motor falla con un error claro,
+    salvo si la tabla está vacía y no hay nada que cargar.
+    """
+    engine = _engine(tmp_path)
+    with _migration(engine):
+        with pytest.raises(RuntimeError, match="only supports postgresql, not sqlite"):
+            backfill("items_doubled", "items", STATEMENT, sleep_seconds=0, dialects=["postgresql"])
+
+    with engine.begin() as conn:
+        conn.execute(text("DELETE FROM items"))
+    with _migration(engine):
+        assert backfill("items_doubled", "items", STATEMENT, sleep_seconds=0, dialects=["postgresql"]) == 0
+
+
+def test_concurrent_index_helpers_are_idempotent(tmp_path):
+    """
+    Prueba que los helpers de índices se pueden repetir sin fallar (IF NOT
+    EXISTS / IF EXISTS), como ocurre al reanudar una migración.
+    """
+    engine = _engine(tmp_path)
+
+    for _ in range(2):
+        with _migration(engine):
+            create_index_concurrently("ix_items_value", "items", ["value"])
+    assert "ix_items_value" in {index["name"] for index in inspect(engine).get_indexes("items")}
+
+    for _ in range(2):
+        with _migration(engine):
+            drop_index_concurrently("ix_items_value", "items")
+    assert inspect(engine).get_indexes("items") == []
+
+
+def test_timeouts_only_applied_on_postgresql():
+    """
+    Prueba que los timeouts de sesión se aplican en PostgreSQL y se omiten en
+    otros motores.
+    """
+    conn = MagicMock()
+    conn.dialect.name = "postgresql"
+    apply_timeouts(conn, lock_timeout_ms=3000, statement_timeout_ms=0)
+    assert [str(call.args[0]) for call in conn.execute.call_args_list] == [
+        "SET lock_timeout = 3000",
+        "SET statement_timeout = 0",
+    ]
+
+    conn = MagicMock()
+    conn.dialect.name = "sqlite"
+    apply_timeouts(conn)
+    conn.execute.assert_not_called()
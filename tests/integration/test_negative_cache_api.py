@@ -0,0 +1,119 @@
+import fakeredis
+import pytest
+from fastapi.testclient import TestClient
+
+from app.cache import redis_wrapper
+from app.cache.bloom import ArticleBloomFilter, BloomFilterRefresher
+from app.cache.redis_wrapper import CacheWrapper
+from app.core.config import settings
+
+URL = "/api/v1/articles"
+
+
+@pytest.fixture
+def fake_redis(monkeypatch):
+    fake = fakeredis.FakeRedis(decode_responses=True)
+    monkeypatch.setattr(redis_wrapper, "redis_client", fake)
+    monkeypatch.setattr(settings, "PROFILING_HEADER_ENABLED", True)
+    return fake
+
+
+def _create(client: TestClient, title: str):
+    response = client.post(
+        f"{URL}/", json={"title": title, "body": f"Body of {title.lower()}.", "author": "Negative Cache"}
+    )
+    assert response.status_code == 201, response.text
+    return response.json()
+
+
+def _get(client: TestClient, article_id: int):
+    return client.get(f"{URL}/{article_id}", headers={"X-Profile": "1"})
+
+
+def test_nonexistent_ids_rejected_by_bloom_filter(client: TestClient, db_session, fake_redis):
+    """
+    Prueba que, con el filtro de Bloom construido, un id inexistente menor que
+    el último cargado responde 404 sin consultar la base de datos, que uno
+    mayor sí la consulta y que los artículos creados después se siguen
+    encontrando.
+    """
+    deleted = _create(client, "Bloom Deleted")
+    existing = _create(client, "Bloom Existing")
+    assert client.delete(f"{URL}/{deleted['id']}").status_code == 204
+    assert ArticleBloomFilter().rebuild(db_session) is not None
+    fake_redis.delete(f"article:{deleted['id']}")
+
+    response = _get(client, deleted["id"])
+    assert response.status_code == 404
+    assert '"0 queries"' in response.headers["Server-Timing"]
+    response = _get(client, 987_654_321)
+    assert response.status_code == 404
+    assert '"1 queries"' in response.headers["Server-Timing"]
+    assert _get(client, existing["id"]).status_code == 200
+
+    created = _create(client, "Bloom Created After Rebuild")
+    assert _get(client, created["id"]).status_code == 200
+
+
+def test_negative_cache_for_deleted_and_missing_ids(client: TestClient, fake_redis, monkeypatch):
+    """
+    Prueba que, sin filtro de Bloom, un id inexistente consulta la base de
+    datos una sola vez, que crear el artículo elimina la entrada negativa de
+    su id y que borrarlo deja una nueva.
+    """
+    monkeypatch.setattr(settings, "BLOOM_FILTER_ENABLED", False)
+    article = _create(client, "Negative Existing")
+    next_id = article["id"] + 1
+    response = _get(client, next_id)
+    assert response.status_code == 404
+    assert '"1 queries"' in response.headers["Server-Timing"]
+    response = _get(client, next_id)
+    assert response.status_code == 404
+    assert '"0 queries"' in response.headers["Server-Timing"]
+
+    created = _create(client, "Negative Created")
+    assert created["id"] == next_id
+    assert _get(client, next_id).status_code == 200
+
+    assert client.delete(f"{URL}/{next_id}").status_code == 204
+    assert fake_redis.get(f"article:{next_id}") == "null"
+    response = _get(client, next_id)
+    assert response.status_code == 404
+    assert '"0 queries"' in response.headers["Server-Timing"]
+
+
+def test_nonexistent_ids_are_not_ranked_as_hot(client: TestClient, db_session, fake_redis, monkeypatch):
+    """
+    Prueba que las lecturas de ids inexistentes (descartados por el filtro de
+    Bloom, servidos por la caché negativa o no encontrados en la base de
+    datos) no entran en el ranking de artículos calientes.
+    """
+    monkeypatch.setattr(settings, "HOT_KEY_SAMPLE_RATE", 1.0)
+    deleted = _create(client, "Hot Deleted")
+    existing = _create(client, "Hot Existing")
+    assert client.delete(f"{URL}/{deleted['id']}").status_code == 204
+    assert ArticleBloomFilter().rebuild(db_session) is not None
+    fake_redis.delete(f"article:{deleted['id']}")
+
+    assert _get(client, deleted["id"]).status_code == 404
+    assert _get(client, 987_654_321).status_code == 404
+    assert _get(client, 987_654_321).status_code == 404
+    assert _get(client, existing["id"]).status_code == 200
+    assert _get(client, existing["id"]).status_code == 200
+
+    assert fake_redis.zrange(CacheWrapper.HOT_KEYS_KEY, 0, -1) == [str(existing["id"])]
+
+
+def test_refresher_respects_the_rebuild_lock_when_the_filter_is_missing(db_session, fake_redis):
+    """
+    Prueba que, sin filtro construido, el refresco periódico no reconstruye
+    si otro worker tiene el lock; solo lo hace quien lo consigue.
+    """
+    bloom = ArticleBloomFilter()
+    fake_redis.set(bloom.rebuild_lock, 1)
+    assert BloomFilterRefresher(interval=60).refresh() is None
+    assert not bloom.is_built()
+
+    fake_redis.delete(bloom.rebuild_lock)
+    assert BloomFilterRefresher(interval=60).refresh() is not None
+    assert bloom.is_built()
@@ -0,0 +1,119 @@
+from datetime import date, datetime
+
+import pytest
+from alembic.migration import MigrationContext
+from alembic.operations import Operations
+from sqlalchemy import text
+from sqlalchemy.exc import IntegrityError
+
+from app.db.migrations import create_index_concurrently, drop_index_concurrently
+from app.db.partitioning import DEFAULT_PARTITION, archive, convert, ensure, existing_partitions, partition_ranges
+from app.db.session import engine
+
+pytestmark = pytest.mark.skipif(
+    engine.dialect.name != "postgresql", reason="El particionado solo existe en PostgreSQL"
+)
+
+TODAY = date(2026, 3, 15)
+
+
+def _insert_article(conn, article_id, title, published_at, tags="python;sql"):
+    conn.execute(
+        text(
+            "INSERT INTO articles (id, title, author, body, tags, published_at) "
+            "VALUES (:id, :title, 'Partitioned', 'Body of a partitioned article.', :tags, :published_at)"
+        ),
+        {"id": article_id, "title": title, "tags": tags, "published_at": published_at},
+    )
+
+
+def test_convert_ensure_and_archive():
+    """
+    Prueba, dentro de una transacción que se deshace al final, que la
+    conversión reparte las filas por particiones y mantiene la unicidad de id
+    y de (title, author), que `ensure` crea las particiones siguientes y que
+    `archive` elimina los artículos archivados de las tablas derivadas.
+    """
+    with engine.connect() as conn:
+        transaction = conn.begin()
+        try:
+            conn.execute(text(
+                "TRUNCATE articles, article_facet_counts, article_tags, article_related, "
+                "article_minhash, article_lsh_buckets"
+            ))
+            _insert_article(conn, 900_001, "Old Partitioned", datetime(2023, 5, 1))
+            _insert_article(conn, 900_002, "New Partitioned", datetime(2026, 3, 1))
+            conn.execute(text(
+                "INSERT INTO article_facet_counts (scope, field, value, count) VALUES "
+                "('', 'author', 'Partitioned', 2), ('', 'tags', 'python', 2), ('', 'tags', 'sql', 2)"
+            ))
+            conn.execute(text("INSERT INTO article_tags (tag, article_id) VALUES ('python', 900001), ('python', 900002)"))
+            conn.execute(text(
+                "INSERT INTO article_related (article_id, related_id, score) VALUES (900001, 900002, 1), (900002, 900001, 1)"
+            ))
+            conn.execute(text("INSERT INTO article_minhash (article_id, signature) VALUES (900001, '\\x00')"))
+            conn.execute(text("INSERT INTO article_lsh_buckets (band, bucket, article_id) VALUES (0, 1, 900001)"))
+
+            convert(conn, "month", premake=1, today=TODAY)
+            partitions = existing_partitions(conn)
+            assert {"articles_p2023_05", "articles_p2026_03", "articles_p2026_04", DEFAULT_PARTITION} <= set(partitions)
+            assert conn.execute(text("SELECT count(*) FROM articles_p2023_05")).scalar() == 1
+
+            for duplicate in [(900_002, "Other Title"), (900_003, "New Partitioned")]:
+                savepoint = conn.begin_nested()
+                with pytest.raises(IntegrityError):
+                    _insert_article(conn, *duplicate, datetime(2026, 3, 2))
+                savepoint.rollback()
+
+            assert ensure(conn, "month", premake=2, today=TODAY) == ["articles_p2026_05"]
+
+            expired = archive(conn, retention_months=24, mode="drop", today=TODAY)
+            assert expired == [p.name for p in partition_ranges(date(2023, 5, 1), date(2024, 2, 1), "month")]
+            assert conn.execute(text("SELECT array_agg(id) FROM articles")).scalar() == [900_002]
+            counts = dict(conn.execute(text(
+                "SELECT field || ':' || value, count FROM article_facet_counts WHERE scope = ''"
+            )).all())
+            assert counts["author:Partitioned"] == counts["tags:python"] == counts["tags:sql"] == 1
+            for table, column in [
+                ("article_tags", "article_id"), ("article_related", "related_id"),
+                ("article_minhash", "article_id"), ("article_lsh_buckets", "article_id"),
+            ]:
+                assert not conn.execute(text(f"SELECT 1 FROM {table} WHERE {column} = 900001")).scalar()
+        finally:
+            transaction.rollback()
+
+
+def test_concurrent_index_on_partitioned_table():
+    """
+    Prueba que los helpers de índices concurrentes funcionan sobre una tabla
+    particionada: el índice del padre queda válido y adjunta el de cada partición.
+    """
+    with engine.connect() as conn:
+        conn = conn.execution_options(isolation_level="AUTOCOMMIT")
+        conn.execute(text(
+            "CREATE TABLE migration_parts (id INTEGER, day DATE) PARTITION BY RANGE (day)"
+        ))
+        try:
+            conn.execute(text(
+                "CREATE TABLE migration_parts_2026 PARTITION OF migration_parts "
+                "FOR VALUES FROM ('2026-01-01') TO ('2027-01-01')"
+            ))
+            conn.execute(text("CREATE TABLE migration_parts_default PARTITION OF migration_parts DEFAULT"))
+            for _ in range(2):
+                with Operations.context(MigrationContext.configure(conn)):
+                    create_index_concurrently("ix_migration_parts_id", "migration_parts", ["id"])
+            attached = conn.execute(text(
+                "SELECT count(*) FROM pg_inherits i JOIN pg_class p ON p.oid = i.inhparent "
+                "WHERE p.relname = 'ix_migration_parts_id'"
+            )).scalar()
+            valid = conn.execute(text(
+                "SELECT i.indisvalid FROM pg_index i JOIN pg_class c ON c.oid = i.indexrelid "
+                "WHERE c.relname = 'ix_migration_parts_id'"
+            )).scalar()
+            assert (attached, valid) == (2, True)
+
+            with Operations.context(MigrationContext.configure(conn)):
+                drop_index_concurrently("ix_migration_parts_id", "migration_parts")
+            assert not conn.execute(text("SELECT to_regclass('ix_migration_parts_id')")).scalar()
+        finally:
+            conn.execute(text("DROP TABLE migration_parts"))
@@ -0,0 +1,76 @@
+import pytest
+from fastapi.testclient import TestClient
+
+from app.core.config import settings
+from app.schemas.article_schema import ArticleCreate, ArticleUpdate
+from app.services.article_service import ArticleService
+from tests.query_budget import assert_query_budget
+
+
+def test_article_service_query_budget(db_session):
+    """
+    Prueba que las operaciones de ArticleService no superan su presupuesto de
+    consultas SQL (comprobación de duplicado + INSERT + contadores de facetas
+    + refresh + índices de relacionados y de casi duplicados, etc.).
+    """
+    service = ArticleService(db_session)
+
+    with assert_query_budget(11):
+        created = service.create_article(
+            ArticleCreate(title="Budget Title", body="This is a valid test body.", author="Budget")
+        )
+
+    with assert_query_budget(1):
+        service.get_article(created.id)
+
+    with assert_query_budget(8):
+        service.update_article(created.id, ArticleUpdate(title="Budget Title Updated"))
+
+    with assert_query_budget(8):
+        service.delete_article(created.id)
+
+
+def test_query_budget_detects_regression(db_session):
+    """
+    Prueba que el helper falla cuando se excede el presupuesto.
+    """
+    service = ArticleService(db_session)
+    created = service.create_article(
+        ArticleCreate(title="Budget Regression", body="This is a valid test body.", author="Budget")
+    )
+
+    with pytest.raises(AssertionError, match="Query budget exceeded"):
+        with assert_query_budget(0):
+            service.get_article(created.id)
+
+
+def test_server_timing_header_when_profiling_requested(client: TestClient, monkeypatch):
+    """
+    Prueba que una petición con la cabecera X-Profile devuelve Server-Timing
+    con el número de consultas SQL y los tiempos de cada capa.
+    """
+    monkeypatch.setattr(settings, "PROFILING_HEADER_ENABLED", True)
+
+    response = client.get("/api/v1/articles/9999", headers={"X-Profile": "1"})
+    assert response.status_code == 404
+    server_timing = response.headers["Server-Timing"]
+    assert 'db;dur=' in server_timing
+    assert '"1 queries"' in server_timing
+    assert "redis;dur=" in server_timing
+    assert "serialize;dur=" in server_timing
+
+    response = client.get("/api/v1/articles/9999")
+    assert "Server-Timing" not in response.headers
+
+
+def test_profile_written_to_output_dir(client: TestClient, monkeypatch, tmp_path):
+    """
+    Prueba que con PROFILING_OUTPUT_DIR el perfil de muestras de pila se
+    escribe (fuera del event loop) y su id se devuelve en X-Profile-Id.
+    """
+    monkeypatch.setattr(settings, "PROFILING_HEADER_ENABLED", True)
+    monkeypatch.setattr(settings, "PROFILING_OUTPUT_DIR", str(tmp_path / "profiles"))
+
+    response = client.get("/api/v1/articles/9999", headers={"X-Profile": "1"})
+    assert response.status_code == 404
+    assert (tmp_path / "profiles" / f"{response.headers['X-Profile-Id']}.folded").exists()
@@ -0,0 +1,94 @@
+import pytest
+from fastapi.testclient import TestClient
+from sqlalchemy import create_engine
+from sqlalchemy.orm import Session, sessionmaker
+
+from app.core.config import settings
+from app.db import session as db_session
+from app.db.base import Base
+from app.db.routing import CONSISTENCY_TOKEN_NAME
+
+
+@pytest.fixture
+def replica(monkeypatch, tmp_path):
+    """
+    Usa una segunda base SQLite como réplica. Nunca recibe las escrituras del
+    primario, lo que permite distinguir de qué base se sirvió cada lectura.
+    """
+    replica_engine = create_engine(
+        f"sqlite:///{tmp_path / 'replica.db'}", connect_args={"check_same_thread": False}
+    )
+    Base.metadata.create_all(bind=replica_engine)
+    monkeypatch.setattr(db_session, "replica_engine", replica_engine)
+    monkeypatch.setattr(
+        db_session, "ReaderSessionLocal", sessionmaker(autocommit=False, autoflush=False, bind=replica_engine)
+    )
+    yield replica_engine
+    replica_engine.dispose()
+
+
+def test_reads_pinned_to_primary_after_write(client: TestClient, replica):
+    """
+    Prueba read-your-writes: tras escribir, el cliente recibe un token y sus
+    lecturas van al primario; un cliente sin token lee de la réplica.
+    """
+    response = client.post(
+        "/api/v1/articles/",
+        json={"title": "Replica Test Title", "body": "This is a valid test body.", "author": "Replica"},
+    )
+    assert response.status_code == 201, f"Expected 201, got {response.status_code}: {response.text}"
+    assert response.headers[CONSISTENCY_TOKEN_NAME].startswith("ts:")
+
+    # Con la cookie emitida tras la escritura: se lee del primario
+    response = client.get("/api/v1/articles/", params={"author": "Replica"})
+    assert [a["title"] for a in response.json()] == ["Replica Test Title"]
+
+    # Sin token: se lee de la réplica, que aún no tiene el artículo
+    client.cookies.clear()
+    response = client.get("/api/v1/articles/", params={"author": "Replica"})
+    assert response.json() == []
+
+
+def test_reads_without_replica_do_not_issue_tokens(client: TestClient):
+    """
+    Prueba que sin réplica configurada no se emiten tokens de consistencia.
+    """
+    response = client.post(
+        "/api/v1/articles/",
+        json={"title": "No Replica Title", "body": "This is a valid test body.", "author": "Replica"},
+    )
+    assert response.status_code == 201
+    assert CONSISTENCY_TOKEN_NAME not in response.headers
+
+
+def test_lagging_replica_read_does_not_refill_cache(client: TestClient, replica, monkeypatch):
+    """
+    Prueba que tras una actualización la clave queda protegida durante el lag
+    de la réplica: una lectura sin token sirve la versión atrasada de la
+    réplica, pero no la vuelve a escribir en caché para los demás clientes.
+    """
+    import fakeredis
+    from app.cache import redis_wrapper
+    from app.db.models import Article
+
+    fake = fakeredis.FakeRedis(decode_responses=True)
+    monkeypatch.setattr(redis_wrapper, "redis_client", fake)
+    monkeypatch.setattr(settings, "BLOOM_FILTER_ENABLED", False)
+
+    created = client.post(
+        "/api/v1/articles/",
+        json={"title": "Replica Lag Old", "body": "This is a valid test body.", "author": "Replica Lag"},
+    ).json()
+    # La réplica solo ha replicado la versión inicial del artículo
+    with Session(replica) as replica_session:
+        replica_session.add(Article(id=created["id"], title="Replica Lag Old", author="Replica Lag", body="This is the old replicated body."))
+        replica_session.commit()
+
+    response = client.put(f"/api/v1/articles/{created['id']}", json={"title": "Replica Lag New"})
+    assert response.status_code == 200
+    assert fake.get(f"article:{created['id']}") == "fence"
+
+    client.cookies.clear()
+    response = client.get(f"/api/v1/articles/{created['id']}")
+    assert response.json()["title"] == "Replica Lag Old"
+    assert fake.get(f"article:{created['id']}") == "fence"
@@ -0,0 +1,127 @@
+from fastapi.testclient import TestClient
+
+from app.core.config import settings
+from app.db.models import ArticleRelated, ArticleTag
+from app.repositories.related_repository import RelatedRepository
+
+URL = "/api/v1/articles"
+
+
+def _create(client: TestClient, title: str, author: str, tags):
+    response = client.post(
+        f"{URL}/",
+        json={"title": title, "body": "This is a valid test body.", "author": author, "tags": tags},
+    )
+    assert response.status_code == 201, response.text
+    return response.json()
+
+
+def _related_ids(client: TestClient, article_id: int, k: int = 5):
+    response = client.get(f"{URL}/{article_id}/related", params={"k": k})
+    assert response.status_code == 200, response.text
+    return [item["id"] for item in response.json()]
+
+
+def test_related_ranked_by_tag_overlap_and_author(client: TestClient):
+    """
+    Prueba que los relacionados se ordenan por solapamiento de tags más el
+    bonus de mismo autor, y que `k` limita el número de resultados.
+    """
+    base = _create(client, "Related Base", "Related Author", ["rel-python", "rel-sql", "rel-redis"])
+    close = _create(client, "Related Close", "Related Other", ["rel-python", "rel-sql", "rel-redis"])
+    same_author = _create(client, "Related Same Author", "Related Author", ["rel-python"])
+    far = _create(client, "Related Far", "Related Other", ["rel-redis", "rel-docker"])
+    _create(client, "Related Unrelated", "Related Nobody", ["rel-cooking"])
+
+    assert _related_ids(client, base["id"]) == [close["id"], same_author["id"], far["id"]]
+    assert _related_ids(client, base["id"], k=1) == [close["id"]]
+
+    data = client.get(f"{URL}/{base['id']}/related").json()
+    assert data[0]["score"] == 1.0
+    assert data[1]["score"] == round(1 / 3 + settings.RELATED_AUTHOR_BOOST, 6)
+    assert data[0]["tags"] == ["rel-python", "rel-sql", "rel-redis"]
+
+    # La relación es simétrica: el nuevo artículo también aparece en las listas de los demás
+    assert base["id"] in _related_ids(client, far["id"])
+
+
+def test_related_index_follows_updates_and_deletes(client: TestClient, monkeypatch):
+    """
+    Prueba que el índice y las listas en caché se actualizan al cambiar los
+    tags, el título o al eliminar un artículo.
+    """
+    import fakeredis
+    from app.cache import redis_wrapper
+
+    monkeypatch.setattr(redis_wrapper, "redis_client", fakeredis.FakeRedis(decode_responses=True))
+
+    first = _create(client, "Related Update One", "Related Update A", ["upd-alpha"])
+    second = _create(client, "Related Update Two", "Related Update B", ["upd-alpha"])
+    assert _related_ids(client, first["id"]) == [second["id"]]
+
+    client.put(f"{URL}/{second['id']}", json={"title": "Related Update Renamed"})
+    assert client.get(f"{URL}/{first['id']}/related").json()[0]["title"] == "Related Update Renamed"
+
+    client.put(f"{URL}/{second['id']}", json={"tags": ["upd-beta"]})
+    assert _related_ids(client, first["id"]) == []
+
+    client.put(f"{URL}/{second['id']}", json={"tags": ["upd-alpha", "upd-beta"]})
+    assert _related_ids(client, first["id"]) == [second["id"]]
+
+    client.delete(f"{URL}/{second['id']}")
+    assert _related_ids(client, first["id"]) == []
+
+
+def test_related_not_found_and_k_validation(client: TestClient):
+    """
+    Prueba que un artículo inexistente devuelve 404 y que `k` fuera de rango
+    devuelve 422.
+    """
+    assert client.get(f"{URL}/999999/related").status_code == 404
+
+    article = _create(client, "Related Lonely", "Related Lonely Author", ["lonely-tag"])
+    assert client.get(f"{URL}/{article['id']}/related").json() == []
+    assert client.get(f"{URL}/{article['id']}/related", params={"k": 0}).status_code == 422
+    assert client.get(
+        f"{URL}/{article['id']}/related", params={"k": settings.RELATED_INDEX_SIZE + 1}
+    ).status_code == 422
+
+
+def test_rebuild_matches_incremental_index(client: TestClient, db_session):
+    """
+    Prueba que la reconstrucción completa, por lotes de ids, produce las
+    mismas listas que el mantenimiento incremental y borra las filas de
+    artículos que ya no existen.
+    """
+    first = _create(client, "Related Rebuild One", "Related Rebuild", ["rb-one", "rb-two"])
+    second = _create(client, "Related Rebuild Two", "Related Rebuild Other", ["rb-two"])
+    repo = RelatedRepository()
+    before = repo.related(db_session, first["id"], settings.RELATED_INDEX_SIZE)
+    orphan = second["id"] + 100
+    db_session.add(ArticleTag(tag="rb-two", article_id=orphan))
+    db_session.add(ArticleRelated(article_id=orphan, related_id=first["id"], score=1.0))
+    db_session.commit()
+
+    repo.rebuild(db_session, batch_size=1)
+
+    assert repo.related(db_session, first["id"], settings.RELATED_INDEX_SIZE) == before
+    assert [row["id"] for row in before] == [second["id"]]
+    assert db_session.query(ArticleTag).filter(ArticleTag.article_id == orphan).count() == 0
+    assert db_session.query(ArticleRelated).filter(ArticleRelated.article_id == orphan).count() == 0
+
+
+def test_bulk_import_indexes_related_articles(client: TestClient):
+    """
+    Prueba que la importación masiva indexa los artículos relacionados entre
+    sí dentro del mismo lote.
+    """
+    articles = [
+        {"title": f"Bulk related {n}", "body": "This is a valid test body.", "author": "Bulk Related", "tags": ["bulkrel"]}
+        for n in range(3)
+    ]
+    response = client.post(f"{URL}/bulk", json={"articles": articles})
+    assert response.status_code == 200, response.text
+    ids = [item["id"] for item in response.json()["created"]]
+
+    for article_id in ids:
+        assert sorted(_related_ids(client, article_id)) == sorted(set(ids) - {article_id})
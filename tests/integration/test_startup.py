@@ -0,0 +1,43 @@
+import json
+import subprocess
+import sys
+
+# Presupuestos holgados respecto a lo medido (~0.6 s de import, lifespan en ms)
+# para no depender de la máquina; una regresión de arranque en frío los supera.
+IMPORT_BUDGET_SECONDS = 1.5
+STARTUP_BUDGET_SECONDS = 2.0
+
+_PROBE = """
+import json, time
+start = time.perf_counter()
+import app.main
+imported = time.perf_counter() - start
+from app.cache import redis_wrapper
+from app.db import session
+report = {"import": imported, "engines": len(session._engines), "redis": redis_wrapper.redis_client is not None}
+
+from fastapi.testclient import TestClient
+start = time.perf_counter()
+with TestClient(app.main.app) as client:
+    report["startup"] = time.perf_counter() - start
+    report["engines_after_startup"] = len(session._engines)
+print(json.dumps(report))
+"""
+
+
+def test_cold_start_within_budget():
+    """
+    Prueba que importar `app.main` no crea engines, clientes ni conexiones, y
+    que la importación y el lifespan de arranque caben en el presupuesto.
+    Se mide en un proceso nuevo para reflejar un arranque en frío real.
+    """
+    result = subprocess.run(
+        [sys.executable, "-c", _PROBE], capture_output=True, text=True, timeout=60, check=True
+    )
+    report = json.loads(result.stdout.strip().splitlines()[-1])
+
+    assert report["engines"] == 0
+    assert report["redis"] is False
+    assert report["engines_after_startup"] == 2
+    assert report["import"] < IMPORT_BUDGET_SECONDS, report
+    assert report["startup"] < STARTUP_BUDGET_SECONDS, report
@@ -0,0 +1,104 @@
+import fakeredis
+import pytest
+from fastapi.testclient import TestClient
+
+from app.cache import redis_wrapper
+from app.core.config import settings
+from app.core.tracing import InMemorySpanExporter, TailSampler, TracedRedis, parse_traceparent, tracer
+
+
+@pytest.fixture
+def fake_redis(monkeypatch):
+    fake = fakeredis.FakeRedis(decode_responses=True)
+    monkeypatch.setattr(redis_wrapper, "redis_client", TracedRedis(connection_pool=fake.connection_pool))
+    return fake
+
+
+@pytest.fixture
+def exporter(monkeypatch, fake_redis):
+    exporter = InMemorySpanExporter()
+    monkeypatch.setattr(settings, "TRACING_ENABLED", True)
+    monkeypatch.setattr(tracer, "exporter", exporter)
+    monkeypatch.setattr(tracer, "sampler", TailSampler(slow_threshold_ms=0, sample_rate=0.0))
+    return exporter
+
+
+def test_request_trace_covers_every_layer(client: TestClient, exporter, fake_redis):
+    """
+    Prueba que una petición genera spans de ruta, servicio, repositorio,
+    caché, SQL y Redis, todos en la misma traza y enlazados con su padre.
+    """
+    created = client.post("/api/v1/articles/", json={
+        "title": "Traced article", "body": "Body of a traced article.", "author": "Tracer",
+    }).json()
+    exporter.clear()
+
+    response = client.get(f"/api/v1/articles/{created['id']}")
+    assert response.status_code == 200
+    trace_id, server_span_id, sampled = parse_traceparent(response.headers["traceparent"])
+    assert sampled
+
+    spans = exporter.trace(trace_id)
+    by_name = {span.name: span for span in spans}
+    server = by_name["GET /api/v1/articles/{article_id}"]
+    assert server.span_id == server_span_id
+    assert server.attributes["http.status_code"] == 200
+    assert by_name["ArticleService.get_article"].parent_span_id == server.span_id
+    assert by_name["CacheWrapper.get"].attributes["layer"] == "cache"
+    assert "redis GET" in by_name
+    assert {span.attributes.get("layer") for span in spans} >= {"route", "service", "cache", "redis"}
+
+    # Con la caché vacía la lectura baja al repositorio y a la BD
+    fake_redis.flushall()
+    exporter.clear()
+    client.get(f"/api/v1/articles/{created['id']}")
+    layers = {span.attributes.get("layer") for span in exporter.spans}
+    assert {"repository", "db"} <= layers
+    sql = next(span for span in exporter.spans if span.name == "SQL SELECT")
+    assert sql.kind == "client" and "FROM articles" in sql.attributes["db.statement"]
+
+
+def test_incoming_traceparent_is_continued(client: TestClient, exporter, monkeypatch):
+    """
+    Prueba que una cabecera `traceparent` entrante continúa la traza del
+    llamante y que, si se confía en él, su flag de muestreo fuerza a
+    conservarla; una petición rápida y sin errores se descarta.
+    """
+    monkeypatch.setattr(tracer, "sampler", TailSampler(slow_threshold_ms=10_000, sample_rate=0.0, trust_upstream=True))
+    parent = "00-0af7651916cd43dd8448eb211c80319c-b7ad6b7169203331-01"
+
+    response = client.get("/api/v1/articles/999999", headers={"traceparent": parent})
+    assert response.status_code == 404
+    trace_id, _, sampled = parse_traceparent(response.headers["traceparent"])
+    assert trace_id == "0af7651916cd43dd8448eb211c80319c" and sampled
+    server = next(span for span in exporter.spans if span.kind == "server")
+    assert server.parent_span_id == "b7ad6b7169203331"
+    assert server.status == "unset"
+
+    exporter.clear()
+    response = client.get("/api/v1/articles/999999")
+    assert not parse_traceparent(response.headers["traceparent"])[2]
+    assert not exporter.spans
+
+
+def test_upstream_sampled_flag_is_ignored_by_default(client: TestClient, exporter, monkeypatch):
+    """
+    Prueba que, sin confiar en el llamante, el flag de muestreo del
+    `traceparent` entrante no basta para conservar la traza.
+    """
+    monkeypatch.setattr(tracer, "sampler", TailSampler(slow_threshold_ms=10_000, sample_rate=0.0))
+    parent = "00-0af7651916cd43dd8448eb211c80319c-b7ad6b7169203331-01"
+
+    response = client.get("/api/v1/articles/999999", headers={"traceparent": parent})
+    assert response.status_code == 404
+    assert not exporter.spans
+
+
+def test_tracing_disabled_records_nothing(client: TestClient, exporter, monkeypatch):
+    """
+    Prueba que con el tracing desactivado no se generan spans ni cabecera.
+    """
+    monkeypatch.setattr(settings, "TRACING_ENABLED", False)
+    response = client.get("/api/v1/articles/999999")
+    assert "traceparent" not in response.headers
+    assert not exporter.spans
@@ -0,0 +1,23 @@
+from contextlib import contextmanager
+
+from app.core.profiling import profile_block
+
+
+@contextmanager
+def assert_query_budget(max_queries: int):
+    """
+    Falla el test si el bloque ejecuta más de `max_queries` sentencias SQL.
+
+    Sirve para detectar regresiones como consultas N+1 o `refresh` extra en
+    `ArticleService`. Cuenta las sentencias enviadas al cursor por cualquier
+    sesión creada a partir del engine de la aplicación.
+
+    Ejemplo:
+        >>> with assert_query_budget(1):
+        ...     service.get_article(article_id)
+    """
+    with profile_block() as profile:
+        yield profile
+    assert profile.sql_count <= max_queries, (
+        f"Query budget exceeded: {profile.sql_count} statements executed, budget is {max_queries}"
+    )
@@ -0,0 +1,127 @@
+import asyncio
+
+import fakeredis
+from starlette.requests import Request
+
+from app.cache import redis_wrapper
+from app.cache.redis_wrapper import CacheWrapper
+from app.core.admission import AdaptiveLimiter, _served_from_cache
+from app.core.config import settings
+
+
+def _limiter(**overrides):
+    options = dict(
+        name="/test", initial_limit=2, min_limit=1, max_limit=4,
+        queue_size=1, queue_timeout=0.05, target_latency=0.1, backoff_ratio=0.5,
+    )
+    options.update(overrides)
+    return AdaptiveLimiter(**options)
+
+
+def test_limiter_sheds_when_queue_full():
+    """
+    PRUEBA UNITARIA: Verifica que, con el límite y la cola llenos, las
+    peticiones se rechazan de inmediato sin esperar.
+    """
+    async def scenario():
+        limiter = _limiter()
+        assert await limiter.acquire() is None
+        assert await limiter.acquire() is None
+        queued = asyncio.ensure_future(limiter.acquire())
+        await asyncio.sleep(0)
+        assert await limiter.acquire() == "queue_full"
+        limiter.release(0.01)
+        assert await queued is None
+        assert limiter.in_flight == 2
+
+    asyncio.run(scenario())
+
+
+def test_limiter_rejects_after_queue_deadline():
+    """
+    PRUEBA UNITARIA: Verifica que una petición en cola se rechaza al vencer
+    el plazo y no ocupa un slot.
+    """
+    async def scenario():
+        limiter = _limiter(initial_limit=1)
+        assert await limiter.acquire() is None
+        assert await limiter.acquire() == "timeout"
+        assert limiter.in_flight == 1
+        limiter.release(0.01)
+        assert limiter.in_flight == 0
+
+    asyncio.run(scenario())
+
+
+def test_limiter_aimd():
+    """
+    PRUEBA UNITARIA: Verifica el control AIMD: incremento aditivo con latencia
+    baja y reducción multiplicativa con latencia alta, dentro de los límites.
+    """
+    async def scenario():
+        limiter = _limiter(initial_limit=2)
+        await limiter.acquire()
+        limiter.release(0.01)
+        assert limiter.limit == 2.5
+
+        await limiter.acquire()
+        limiter.release(1.0)
+        assert limiter.limit == 1.25
+
+        for _ in range(3):
+            await limiter.acquire()
+            limiter.release(1.0)
+        assert limiter.limit == 1
+
+    asyncio.run(scenario())
+
+
+def test_limiter_returns_slot_when_waiter_cancelled():
+    """
+    PRUEBA UNITARIA: Verifica que si el cliente se desconecta justo después de
+    recibir un slot de la cola, el slot se devuelve y la capacidad no se pierde.
+    """
+    async def scenario():
+        limiter = _limiter(initial_limit=1, queue_timeout=1.0)
+        assert await limiter.acquire() is None
+        queued = asyncio.ensure_future(limiter.acquire())
+        await asyncio.sleep(0)
+
+        # Desconexión y slot concedido en el mismo ciclo del event loop
+        queued.cancel()
+        limiter.release(0.01)
+        assert limiter.in_flight == 1
+        try:
+            await queued
+        except asyncio.CancelledError:
+            pass
+        else:
+            raise AssertionError("the queued request was not cancelled")
+        assert limiter.in_flight == 0
+
+    asyncio.run(scenario())
+
+
+def test_fenced_reads_do_not_bypass_the_limiter(monkeypatch):
+    """
+    PRUEBA UNITARIA: Verifica que solo se saltan el limitador las lecturas que
+    la caché responde (artículo o entrada negativa), no las vallas de escritura,
+    y que la comprobación no envía PING.
+    """
+    fake = fakeredis.FakeRedis(decode_responses=True)
+    monkeypatch.setattr(redis_wrapper, "redis_client", fake)
+
+    def no_ping():
+        raise AssertionError("unexpected PING")
+
+    monkeypatch.setattr(fake, "ping", no_ping)
+    fake.set("article:1", '{"id": 1}')
+    fake.set("article:2", CacheWrapper.NEGATIVE_ENTRY)
+    fake.set("article:3", CacheWrapper.FENCE_ENTRY)
+    route = f"{settings.API_V1_STR}/articles/{{article_id}}"
+    request = Request({"type": "http", "method": "GET", "path": "/", "headers": []})
+
+    async def served(article_id):
+        return await _served_from_cache(request, route, {"article_id": str(article_id)})
+
+    assert [asyncio.run(served(article_id)) for article_id in (1, 2, 3, 4)] == [True, True, False, False]
@@ -0,0 +1,39 @@
+from benchmarks.datagen import ArticleGenerator
+from benchmarks.run import percentile, summarize
+from benchmarks.scaling import speedups
+
+
+def test_generator_is_deterministic():
+    """
+    PRUEBA UNITARIA: Verifica que la misma semilla genera exactamente los
+    mismos artículos y que respetan las restricciones del modelo.
+    """
+    first = list(ArticleGenerator(seed=7, total=1000).rows(50))
+    second = list(ArticleGenerator(seed=7, total=1000).rows(50))
+    assert first == second
+    assert len({(row["title"], row["author"]) for row in first}) == 50
+    assert all(len(row["title"]) <= 255 and len(row["body"]) >= 10 for row in first)
+    assert any(row["published_at"] is None for row in ArticleGenerator(seed=7, total=1000).rows(200))
+
+
+def test_percentiles():
+    """
+    PRUEBA UNITARIA: Verifica el cálculo de percentiles y el resumen de latencias.
+    """
+    values = [i / 1000 for i in range(1, 101)]
+    assert percentile(values, 50) == 0.05
+    assert percentile(values, 99) == 0.099
+    summary = summarize(values, errors=2, wall_time=2.0)
+    assert summary["throughput_rps"] == 50.0
+    assert summary["latency_ms"]["max"] == 100.0
+    assert summary["errors"] == 2
+
+
+def test_scaling_speedups():
+    """
+    PRUEBA UNITARIA: Verifica que el speedup se calcula respecto al primer
+    número de workers medido.
+    """
+    results = {"1": {"throughput_rps": 100.0}, "2": {"throughput_rps": 190.0}, "4": {"throughput_rps": 350.0}}
+    assert speedups(results) == {"1": 1.0, "2": 1.9, "4": 3.5}
+    assert speedups({}) == {}
@@ -0,0 +1,158 @@
+import fakeredis
+import pytest
+from redis import ConnectionError as RedisConnectionError, Redis
+
+from app.cache import redis_wrapper
+from app.cache.bloom import ArticleBloomFilter, bit_positions, bloom_parameters
+from app.cache.redis_wrapper import MISSING, CacheWrapper
+from app.core.config import settings
+from app.db.models import Article
+from app.schemas.article_schema import ArticleCreate
+from app.services.article_service import ArticleService
+
+
+@pytest.fixture
+def fake_redis(monkeypatch):
+    fake = fakeredis.FakeRedis(decode_responses=True)
+    monkeypatch.setattr(redis_wrapper, "redis_client", fake)
+    return fake
+
+
+def test_bloom_parameters_and_positions():
+    """
+    PRUEBA UNITARIA: Verifica el tamaño del filtro para la capacidad y la tasa
+    de falsos positivos pedidas, y que las posiciones de un id son estables.
+    """
+    bits, hashes = bloom_parameters(1_000_000, 0.01)
+    assert 9_500_000 < bits < 9_700_000
+    assert hashes == 7
+
+    positions = bit_positions(42, bits, hashes)
+    assert positions == bit_positions(42, bits, hashes)
+    assert len(positions) == hashes
+    assert all(0 <= position < bits for position in positions)
+
+
+def test_unbuilt_filter_never_rejects(fake_redis):
+    """
+    PRUEBA UNITARIA: Verifica que sin reconstrucción completa (solo altas
+    sueltas, sin el bit de construido) el filtro no descarta ningún id.
+    """
+    bloom = ArticleBloomFilter(capacity=1000, error_rate=0.01)
+    bloom.add([1])
+
+    assert not bloom.is_built()
+    assert bloom.might_contain(123456)
+
+
+def test_filter_unavailable_fails_open(monkeypatch):
+    """
+    PRUEBA UNITARIA: Verifica que con Redis caído el filtro deja pasar todas
+    las consultas a la base de datos.
+    """
+    monkeypatch.setattr(redis_wrapper, "redis_client", Redis(port=1, socket_connect_timeout=0.1))
+
+    assert ArticleBloomFilter(capacity=1000, error_rate=0.01).might_contain(7)
+
+
+def test_rebuild_and_add(db_session, fake_redis):
+    """
+    PRUEBA UNITARIA: Verifica que la reconstrucción carga todos los ids de
+    `articles` con el mismo orden de bits que SETBIT, descarta ids inexistentes
+    por debajo del mayor id cargado y que las altas posteriores se añaden al
+    filtro.
+    """
+    service = ArticleService(db_session)
+    created = service.create_article(
+        ArticleCreate(title="Bloom Rebuild", body="Body of the bloom rebuild test.", author="Bloom")
+    )
+    # Alta fuera del servicio con un id alto: deja un hueco de ids inexistentes por debajo
+    outside = Article(id=created.id + 1000, title="Bloom Outside", body="Inserted outside the service.", author="Bloom")
+    db_session.add(outside)
+    db_session.commit()
+    bloom = ArticleBloomFilter(capacity=1000, error_rate=0.001)
+    try:
+        assert bloom.rebuild(db_session) >= 2
+        assert bloom.is_built()
+        assert all(fake_redis.getbit(bloom.key, position) for position in bit_positions(created.id, bloom.bits, bloom.hashes))
+        assert bloom.might_contain(created.id) and bloom.might_contain(outside.id)
+        unknown = range(created.id + 1, created.id + 21)
+        assert sum(not bloom.might_contain(article_id) for article_id in unknown) >= 19
+
+        bloom.add([created.id + 1])
+        assert bloom.might_contain(created.id + 1)
+    finally:
+        db_session.delete(outside)
+        db_session.commit()
+
+
+def test_ids_above_rebuild_are_possibly_present(db_session, fake_redis):
+    """
+    PRUEBA UNITARIA: Verifica que los ids mayores que el último cargado en la
+    reconstrucción (altas por datagen, SQL masivo o backfills que no pasan por
+    el servicio) nunca se descartan.
+    """
+    bloom = ArticleBloomFilter(capacity=1000, error_rate=0.001)
+    bloom.rebuild(db_session)
+    max_id = int(fake_redis.get(bloom.max_id_key))
+
+    assert all(bloom.might_contain(article_id) for article_id in range(max_id + 1, max_id + 50))
+
+
+def test_failed_add_drops_the_filter(db_session, fake_redis, monkeypatch):
+    """
+    PRUEBA UNITARIA: Verifica que si no se puede añadir un alta el filtro se
+    elimina y deja de descartar ids hasta la siguiente reconstrucción.
+    """
+    bloom = ArticleBloomFilter(capacity=1000, error_rate=0.01)
+    bloom.rebuild(db_session)
+    assert bloom.is_built()
+
+    def broken_pipeline(*args, **kwargs):
+        raise RedisConnectionError("connection lost")
+
+    with monkeypatch.context() as patch:
+        patch.setattr(fake_redis, "pipeline", broken_pipeline)
+        bloom.add([1])
+
+    assert not fake_redis.exists(bloom.key)
+    assert bloom.might_contain(0)
+
+
+def test_keys_are_versioned_by_size(db_session, fake_redis):
+    """
+    PRUEBA UNITARIA: Verifica que cambiar la capacidad o la tasa de error usa
+    otras claves, de modo que no se lee un filtro construido con otro tamaño.
+    """
+    built = ArticleBloomFilter(capacity=1000, error_rate=0.01)
+    built.rebuild(db_session)
+    resized = ArticleBloomFilter(capacity=5000, error_rate=0.01)
+
+    assert resized.key != built.key
+    assert built.is_built() and not resized.is_built()
+
+
+def test_rebuild_skipped_while_locked(db_session, fake_redis):
+    """
+    PRUEBA UNITARIA: Verifica que una reconstrucción periódica no se repite
+    mientras otro worker tiene el lock del intervalo, salvo si se fuerza.
+    """
+    bloom = ArticleBloomFilter(capacity=1000, error_rate=0.01)
+    fake_redis.set(bloom.rebuild_lock, 1)
+
+    assert bloom.rebuild(db_session, force=False) is None
+    assert bloom.rebuild(db_session) is not None
+
+
+def test_negative_cache_entry(fake_redis, monkeypatch):
+    """
+    PRUEBA UNITARIA: Verifica que la entrada negativa se guarda en la clave del
+    artículo con su propio TTL y que `get` la distingue de un fallo de caché.
+    """
+    monkeypatch.setattr(settings, "NEGATIVE_CACHE_TTL_SECONDS", 15)
+    cache = CacheWrapper()
+    cache.set_missing(5)
+
+    assert cache.get(5) is MISSING
+    assert cache.get(6) is None
+    assert 0 < fake_redis.ttl("article:5") <= 15
@@ -0,0 +1,54 @@
+import logging
+import multiprocessing
+
+import pytest
+
+from app.cache import redis_wrapper
+from app.core import logging_config
+from app.db import session as db_session
+
+
+def _inspect_child(results, parent_listener):
+    app_logger = logging.getLogger("app")
+    listener = logging_config._listener
+    report = {
+        "pool": id(db_session.get_engine().pool),
+        "redis_pid": redis_wrapper.client().connection_pool.pid,
+        "new_listener": id(listener) != parent_listener,
+        "log_queue_shared": any(
+            getattr(handler, "queue", None) is listener.queue for handler in app_logger.handlers
+        ),
+    }
+    app_logger.warning("Log record written by a forked worker")
+    # `stop` procesa los registros pendientes: si el listener no funcionara, quedarían en la cola
+    listener.stop()
+    report["log_queue_drained"] = listener.queue.empty()
+    results.put(report)
+
+
+@pytest.mark.skipif("fork" not in multiprocessing.get_all_start_methods(), reason="requires fork")
+def test_singletons_are_reset_after_fork():
+    """
+    PRUEBA UNITARIA: Verifica que un proceso hijo creado con fork (como un
+    worker de Gunicorn con `preload_app`) no reutiliza el pool de conexiones de
+    la base de datos ni el de Redis del padre, y que tiene su propio listener de
+    logging que escribe los registros encolados.
+    """
+    with db_session.get_engine().connect():
+        pass
+    parent_pool = id(db_session.get_engine().pool)
+    redis_wrapper.client()
+    logging_config.setup_logging()
+
+    context = multiprocessing.get_context("fork")
+    results = context.Queue()
+    child = context.Process(target=_inspect_child, args=(results, id(logging_config._listener)))
+    child.start()
+    report = results.get(timeout=10)
+    child.join(timeout=10)
+
+    assert report["pool"] != parent_pool
+    assert report["redis_pid"] == child.pid
+    assert report["new_listener"]
+    assert report["log_queue_shared"]
+    assert report["log_queue_drained"]
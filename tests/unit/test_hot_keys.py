@@ -0,0 +1,122 @@
+import fakeredis
+import pytest
+from unittest.mock import MagicMock
+from datetime import datetime
+from app.cache import redis_wrapper
+from app.cache.redis_wrapper import CacheWrapper
+from app.core.config import settings
+from app.services.article_service import ArticleService
+
+
+@pytest.fixture
+def fake_redis(monkeypatch):
+    fake = fakeredis.FakeRedis(decode_responses=True)
+    monkeypatch.setattr(redis_wrapper, "redis_client", fake)
+    monkeypatch.setattr(settings, "HOT_KEY_SAMPLE_RATE", 1.0)
+    return fake
+
+
+def _article(article_id):
+    article = MagicMock()
+    article.id = article_id
+    article.title = f"Title {article_id}"
+    article.body = "This is a valid body."
+    article.author = "Author"
+    article.tags = ["test"]
+    article.published_at = None
+    article.created_at = datetime(2025, 1, 1)
+    article.updated_at = datetime(2025, 1, 1)
+    return article
+
+
+def test_track_access_ranks_hot_keys(fake_redis):
+    """
+    PRUEBA UNITARIA: Verifica que los accesos muestreados se acumulan en el
+    sorted set y que `top_hot` devuelve los artículos más leídos primero.
+    """
+    cache = CacheWrapper()
+    for article_id, hits in ((1, 1), (2, 3), (3, 2)):
+        for _ in range(hits):
+            cache.track_access(article_id)
+
+    assert cache.top_hot(2) == [2, 3]
+    assert cache.is_hot(1)
+
+
+def test_track_access_decays_scores(fake_redis, monkeypatch):
+    """
+    PRUEBA UNITARIA: Verifica que al vencer el intervalo de decaimiento las
+    puntuaciones se multiplican por el factor y las despreciables se eliminan.
+    """
+    monkeypatch.setattr(settings, "HOT_KEY_DECAY_FACTOR", 0.5)
+    monkeypatch.setattr(settings, "HOT_KEY_MIN_SCORE", 1.0)
+    cache = CacheWrapper()
+    fake_redis.set(CacheWrapper.HOT_KEYS_DECAY_MARKER, 1)
+    for _ in range(4):
+        cache.track_access(1)
+    cache.track_access(2)
+    assert fake_redis.zscore(CacheWrapper.HOT_KEYS_KEY, "1") == 4.0
+
+    fake_redis.delete(CacheWrapper.HOT_KEYS_DECAY_MARKER)
+    cache.track_access(3)
+
+    assert fake_redis.zscore(CacheWrapper.HOT_KEYS_KEY, "1") == 2.0
+    assert fake_redis.zscore(CacheWrapper.HOT_KEYS_KEY, "2") is None
+    assert fake_redis.zscore(CacheWrapper.HOT_KEYS_KEY, "3") is None
+    assert fake_redis.ttl(CacheWrapper.HOT_KEYS_DECAY_MARKER) > 0
+
+
+def test_track_access_is_sampled(fake_redis, monkeypatch):
+    """
+    PRUEBA UNITARIA: Verifica que con una tasa de muestreo nula no se escribe
+    nada en Redis.
+    """
+    monkeypatch.setattr(settings, "HOT_KEY_SAMPLE_RATE", 0.0)
+    CacheWrapper().track_access(1)
+    assert not fake_redis.exists(CacheWrapper.HOT_KEYS_KEY)
+
+
+def test_warm_cache_uses_one_query_and_one_pipeline(fake_redis, monkeypatch):
+    """
+    PRUEBA UNITARIA: Verifica que el precalentamiento carga los artículos
+    calientes con una sola consulta y una sola pipeline de Redis.
+    """
+    fake_redis.zadd(CacheWrapper.HOT_KEYS_KEY, {"1": 5, "2": 3, "3": 1})
+    service = ArticleService(db=MagicMock())
+    service.repo = MagicMock()
+    service.repo.get_many.return_value = [_article(1), _article(2)]
+    pipelines = []
+    original_pipeline = fake_redis.pipeline
+
+    def counting_pipeline(*args, **kwargs):
+        pipelines.append(kwargs)
+        return original_pipeline(*args, **kwargs)
+
+    monkeypatch.setattr(fake_redis, "pipeline", counting_pipeline)
+
+    assert service.warm_cache(2) == 2
+
+    service.repo.get_many.assert_called_once_with(service.db, [1, 2])
+    assert len(pipelines) == 1
+    assert service.cache.get(1)["title"] == "Title 1"
+    assert service.cache.get(2)["title"] == "Title 2"
+    assert not service.cache.exists(3)
+
+
+def test_warm_cache_keeps_fences_and_fresher_entries(fake_redis):
+    """
+    PRUEBA UNITARIA: Verifica que el precalentamiento, que puede leer de una
+    réplica atrasada, no sobrescribe vallas de escritura ni entradas existentes.
+    """
+    fake_redis.zadd(CacheWrapper.HOT_KEYS_KEY, {"1": 5, "2": 3, "3": 1})
+    fake_redis.set("article:1", CacheWrapper.FENCE_ENTRY)
+    fake_redis.set("article:2", '{"id": 2, "title": "Fresher"}')
+    service = ArticleService(db=MagicMock())
+    service.repo = MagicMock()
+    service.repo.get_many.return_value = [_article(1), _article(2), _article(3)]
+
+    service.warm_cache(3)
+
+    assert fake_redis.get("article:1") == CacheWrapper.FENCE_ENTRY
+    assert service.cache.get(2)["title"] == "Fresher"
+    assert service.cache.get(3)["title"] == "Title 3"
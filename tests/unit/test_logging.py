@@ -0,0 +1,66 @@
+import json
+import logging
+
+from app.core import logging_config
+from app.core.config import settings
+from app.db.session import engine
+from sqlalchemy import text
+
+
+class _ListHandler(logging.Handler):
+    def __init__(self):
+        super().__init__()
+        self.records = []
+
+    def emit(self, record):
+        self.records.append(record)
+
+
+def test_json_formatter_includes_request_id_and_extra():
+    """
+    PRUEBA UNITARIA: Verifica que el formateador JSON incluye el request id
+    del contexto y los campos pasados en `extra`.
+    """
+    token = logging_config.request_id.set("req-123")
+    try:
+        record = logging.LogRecord("app.test", logging.INFO, __file__, 1, "hello %s", ("world",), None)
+        logging_config.RequestIdFilter().filter(record)
+        record.duration_ms = 12.5
+    finally:
+        logging_config.request_id.reset(token)
+
+    payload = json.loads(logging_config.JsonFormatter().format(record))
+    assert payload["message"] == "hello world"
+    assert payload["request_id"] == "req-123"
+    assert payload["duration_ms"] == 12.5
+    assert payload["level"] == "INFO"
+
+
+def test_slow_query_log_respects_threshold(monkeypatch):
+    """
+    PRUEBA UNITARIA: Verifica que el slow-query log solo registra sentencias
+    por encima del umbral configurado.
+    """
+    handler = _ListHandler()
+    logging_config.slow_query_logger.addHandler(handler)
+    try:
+        monkeypatch.setattr(settings, "SLOW_QUERY_THRESHOLD_MS", 10_000.0)
+        with engine.connect() as conn:
+            conn.execute(text("SELECT 1"))
+        assert handler.records == []
+
+        monkeypatch.setattr(settings, "SLOW_QUERY_THRESHOLD_MS", 0.0)
+        with engine.connect() as conn:
+            conn.execute(text("SELECT 1"))
+        assert handler.records[-1].statement == "SELECT 1"
+        assert handler.records[-1].duration_ms >= 0
+    finally:
+        logging_config.slow_query_logger.removeHandler(handler)
+
+
+def test_sampled_bounds():
+    """
+    PRUEBA UNITARIA: Verifica los casos límite del muestreo.
+    """
+    assert logging_config.sampled(1.0) is True
+    assert logging_config.sampled(0.0) is False
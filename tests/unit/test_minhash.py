@@ -0,0 +1,58 @@
+import pytest
+from pydantic import ValidationError
+
+from app.core.config import Settings
+from app.repositories.duplicate_repository import (
+    band_buckets,
+    estimated_similarity,
+    minhash_signature,
+    pack_signature,
+    shingles,
+    unpack_signature,
+)
+
+
+def _jaccard(a, b):
+    a, b = set(a), set(b)
+    return len(a & b) / len(a | b)
+
+
+def test_signature_similarity_estimates_jaccard():
+    """
+    PRUEBA UNITARIA: Verifica que la similitud estimada por MinHash se acerca
+    al índice de Jaccard real de los shingles.
+    """
+    words = [f"word{i}" for i in range(120)]
+    text = " ".join(words)
+    edited = " ".join(words[:90] + [f"other{i}" for i in range(30)])
+
+    expected = _jaccard(shingles(f"Title {text}"), shingles(f"Title {edited}"))
+    estimate = estimated_similarity(
+        minhash_signature("Title", text, permutations=256), minhash_signature("Title", edited, permutations=256)
+    )
+    assert abs(estimate - expected) < 0.1
+    assert estimated_similarity(minhash_signature("Title", text), minhash_signature("Title", text)) == 1.0
+
+
+def test_signatures_are_stable_and_roundtrip():
+    """
+    PRUEBA UNITARIA: Verifica que la firma es determinista (no depende del
+    hash aleatorio de Python), se serializa sin pérdidas y que firmas iguales
+    comparten todos los buckets.
+    """
+    signature = minhash_signature("Stable title", "Some body text that is long enough.")
+    assert signature == minhash_signature("Stable title", "Some body text that is long enough.")
+    assert unpack_signature(pack_signature(signature)) == signature
+    assert band_buckets(signature) == band_buckets(tuple(signature))
+    assert len({band for band, _ in band_buckets(signature, bands=16)}) == 16
+    assert shingles("Short text") == ["short text"]
+
+
+def test_bands_must_divide_permutations():
+    """
+    PRUEBA UNITARIA: Verifica que la configuración rechaza un número de bandas
+    que no divide el de permutaciones.
+    """
+    assert Settings(MINHASH_PERMUTATIONS=64, MINHASH_BANDS=16).MINHASH_BANDS == 16
+    with pytest.raises(ValidationError, match="MINHASH_BANDS"):
+        Settings(MINHASH_PERMUTATIONS=64, MINHASH_BANDS=10)
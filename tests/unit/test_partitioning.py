@@ -0,0 +1,58 @@
+from datetime import date
+
+import pytest
+
+from app.db.partitioning import (
+    DEFAULT_PARTITION,
+    conversion_statements,
+    expired_partitions,
+    partition_for,
+    partition_ranges,
+)
+
+
+def test_monthly_partition_ranges_cross_year():
+    """
+    PRUEBA UNITARIA: Verifica que los rangos mensuales son consecutivos,
+    semiabiertos y cruzan correctamente el cambio de año.
+    """
+    ranges = partition_ranges(date(2025, 11, 15), date(2026, 2, 1), "month")
+    assert [r.name for r in ranges] == [
+        "articles_p2025_11", "articles_p2025_12", "articles_p2026_01", "articles_p2026_02",
+    ]
+    assert ranges[1].start == date(2025, 12, 1) and ranges[1].end == date(2026, 1, 1)
+    assert all(a.end == b.start for a, b in zip(ranges, ranges[1:]))
+
+
+def test_yearly_partition_and_invalid_interval():
+    """
+    PRUEBA UNITARIA: Verifica las particiones anuales y rechaza intervalos desconocidos.
+    """
+    partition = partition_for(date(2024, 6, 30), "year")
+    assert (partition.name, partition.start, partition.end) == ("articles_p2024", date(2024, 1, 1), date(2025, 1, 1))
+    with pytest.raises(ValueError):
+        partition_for(date(2024, 6, 30), "week")
+
+
+def test_expired_partitions_never_include_default():
+    """
+    PRUEBA UNITARIA: Verifica la selección de particiones a archivar según la retención.
+    """
+    names = ["articles_p2023", "articles_p2024_01", "articles_p2024_02", "articles_p2026_01", DEFAULT_PARTITION]
+    assert expired_partitions(names, retention_months=24, today=date(2026, 2, 10)) == [
+        "articles_p2023", "articles_p2024_01",
+    ]
+
+
+def test_conversion_preserves_title_author_uniqueness():
+    """
+    PRUEBA UNITARIA: Verifica que la conversión crea la partición por defecto
+    y mantiene la unicidad de id y de (title, author) mediante la tabla de claves.
+    """
+    sql = "\n".join(conversion_statements(partition_ranges(date(2026, 1, 1), date(2026, 1, 1), "month")))
+    assert "PARTITION BY RANGE (published_at)" in sql
+    assert f"CREATE TABLE {DEFAULT_PARTITION} PARTITION OF articles_partitioned DEFAULT" in sql
+    assert "FOR VALUES FROM ('2026-01-01') TO ('2026-02-01')" in sql
+    assert "CONSTRAINT uix_title_author PRIMARY KEY (title, author)" in sql
+    assert "UNIQUE (article_id)" in sql
+    assert "AFTER INSERT OR UPDATE OF id, title, author OR DELETE" in sql
@@ -0,0 +1,35 @@
+from unittest.mock import MagicMock, patch
+
+from app.core.config import settings
+from app.repositories.related_repository import similarity
+from app.services.article_service import ArticleService
+
+
+def test_similarity_jaccard_and_author_boost():
+    """
+    PRUEBA UNITARIA: Verifica que la similitud es el índice de Jaccard de los
+    tags más el bonus cuando el autor coincide.
+    """
+    assert similarity({"a", "b"}, "x", {"a", "b"}, "y") == 1.0
+    assert similarity({"a", "b"}, "x", {"b", "c"}, "y") == round(1 / 3, 6)
+    assert similarity({"a"}, "x", {"b"}, "y") == 0.0
+    assert similarity(set(), "x", set(), "x") == settings.RELATED_AUTHOR_BOOST
+
+
+def test_get_related_served_from_cache():
+    """
+    PRUEBA UNITARIA: Verifica que la lista en caché se recorta a `k` sin
+    consultar el índice.
+    """
+    cached = [
+        {"id": i, "title": f"Title {i}", "author": "Author", "tags": ["t"], "published_at": None, "score": 1.0}
+        for i in range(1, 6)
+    ]
+    with patch('app.services.article_service.CacheWrapper') as MockCache, \
+         patch('app.services.article_service.RelatedRepository') as MockRelated:
+        MockCache.return_value.get_related.return_value = cached
+
+        result = ArticleService(db=MagicMock()).get_related(article_id=7, k=2)
+
+        assert [item.id for item in result] == [1, 2]
+        MockRelated.return_value.related.assert_not_called()
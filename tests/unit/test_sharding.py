@@ -0,0 +1,98 @@
+import fakeredis
+import pytest
+from app.cache import redis_wrapper
+from app.cache.hash_ring import HashRing, hash_slot_key
+from app.cache.redis_wrapper import CacheWrapper
+from app.core.config import settings
+
+
+@pytest.fixture
+def nodes(monkeypatch):
+    """Tres nodos fakeredis independientes detrás del anillo."""
+    servers = {f"redis://node-{i}:6379/0": fakeredis.FakeServer() for i in range(3)}
+    clients = {url: fakeredis.FakeRedis(server=server, decode_responses=True) for url, server in servers.items()}
+    monkeypatch.setattr(redis_wrapper, "redis_ring", HashRing(clients, vnodes=160))
+    return servers, clients
+
+
+def test_ring_balances_and_moves_few_keys():
+    """
+    PRUEBA UNITARIA: Verifica que los nodos virtuales reparten las claves de
+    forma equilibrada y que añadir un nodo solo mueve ~1/N de ellas.
+    """
+    keys = [f"article:{i}" for i in range(20000)]
+    ring = HashRing({name: name for name in ("a", "b", "c")}, vnodes=160)
+    shares = {name: len(group) for name, group in ring.group(keys).items()}
+    assert all(abs(share / len(keys) - 1 / 3) < 0.05 for share in shares.values())
+
+    grown = HashRing({name: name for name in ("a", "b", "c", "d")}, vnodes=160)
+    moved = [key for key in keys if ring.node_name(key) != grown.node_name(key)]
+    assert all(grown.node_name(key) == "d" for key in moved)
+    assert 0.15 < len(moved) / len(keys) < 0.35
+
+
+def test_hash_tags_colocate_keys():
+    """
+    PRUEBA UNITARIA: Verifica que las claves con la misma hash tag van al mismo nodo.
+    """
+    ring = HashRing({name: name for name in ("a", "b", "c")})
+    assert hash_slot_key("{article:hot}:decay") == "article:hot"
+    assert ring.node_name("{article:hot}") == ring.node_name("{article:hot}:decay")
+
+
+def test_cache_spreads_keys_and_batches_per_node(nodes):
+    """
+    PRUEBA UNITARIA: Verifica que la caché reparte los artículos entre nodos y
+    que `set_many` ejecuta una única pipeline por nodo.
+    """
+    _, clients = nodes
+    pipelines = []
+    for client in clients.values():
+        original = client.pipeline
+
+        def counting_pipeline(*args, _original=original, **kwargs):
+            pipelines.append(1)
+            return _original(*args, **kwargs)
+
+        client.pipeline = counting_pipeline
+
+    cache = CacheWrapper()
+    cache.set_many({i: {"id": i} for i in range(60)})
+
+    assert len(pipelines) == 3
+    assert all(client.dbsize() > 0 for client in clients.values())
+    assert sum(client.dbsize() for client in clients.values()) == 60
+    assert all(cache.get(i) == {"id": i} for i in range(60))
+
+
+def test_node_failure_only_affects_its_keys(nodes):
+    """
+    PRUEBA UNITARIA: Verifica que si un nodo cae solo sus claves fallan (como
+    misses) y el resto de la caché sigue funcionando.
+    """
+    servers, _ = nodes
+    cache = CacheWrapper()
+    cache.set_many({i: {"id": i} for i in range(60)})
+
+    down = "redis://node-1:6379/0"
+    servers[down].connected = False
+    ring = redis_wrapper.redis_ring
+    for i in range(60):
+        on_down_node = ring.node_name(cache._get_article_key(i)) == down
+        assert (cache.get(i) is None) == on_down_node
+
+    cache.set_many({i: {"id": i, "v": 2} for i in range(60)})
+    assert cache.get(next(i for i in range(60) if ring.node_name(cache._get_article_key(i)) != down))["v"] == 2
+
+
+def test_rate_limit_keys_follow_the_ring(nodes, client, monkeypatch):
+    """
+    PRUEBA UNITARIA: Verifica que el contador del rate limiter vive en el nodo
+    que le asigna el anillo.
+    """
+    _, clients = nodes
+    monkeypatch.setattr(settings, "RATE_LIMIT_MAX_REQUESTS", 1000)
+    client.get(f"{settings.API_V1_STR}/articles/")
+    owner = redis_wrapper.redis_ring.get("ratelimit:testclient")
+    assert owner.get("ratelimit:testclient") == "1"
+    assert sum(1 for c in clients.values() if c.exists("ratelimit:testclient")) == 1
@@ -0,0 +1,163 @@
+import json
+
+import fakeredis
+import pytest
+from fastapi import HTTPException
+
+from app.core import tracing
+from app.core.tracing import (
+    FileSpanExporter,
+    InMemorySpanExporter,
+    NoopSpanExporter,
+    TailSampler,
+    Tracer,
+    TracedRedis,
+    TraceRecord,
+    current_trace,
+    format_traceparent,
+    parse_traceparent,
+    start_span,
+    traced,
+)
+
+
+@pytest.fixture
+def trace():
+    record = TraceRecord(trace_id="4bf92f3577b34da6a3ce929d0e0e4736")
+    token = current_trace.set(record)
+    yield record
+    current_trace.reset(token)
+
+
+def test_traceparent_parse_and_format():
+    """
+    PRUEBA UNITARIA: Verifica el parseo y formato de la cabecera W3C
+    `traceparent`, rechazando valores inválidos.
+    """
+    header = "00-4bf92f3577b34da6a3ce929d0e0e4736-00f067aa0ba902b7-01"
+    assert parse_traceparent(header) == ("4bf92f3577b34da6a3ce929d0e0e4736", "00f067aa0ba902b7", True)
+    assert parse_traceparent(header[:-2] + "00")[2] is False
+    assert format_traceparent("4bf92f3577b34da6a3ce929d0e0e4736", "00f067aa0ba902b7", True) == header
+    for invalid in (None, "", "garbage", "00-" + "0" * 32 + "-00f067aa0ba902b7-01", header.replace("00-", "ff-", 1)):
+        assert parse_traceparent(invalid) is None
+
+
+def test_spans_nest_and_record_errors(trace):
+    """
+    PRUEBA UNITARIA: Verifica que los spans anidados enlazan con su padre y
+    que solo los errores no-4xx marcan el span como fallido.
+    """
+    @traced("inner")
+    def inner(fail):
+        if fail == "client":
+            raise HTTPException(status_code=404)
+        if fail == "server":
+            raise RuntimeError("boom")
+
+    with start_span("outer") as outer:
+        inner(None)
+        with pytest.raises(HTTPException):
+            inner("client")
+        with pytest.raises(RuntimeError):
+            inner("server")
+
+    spans = {(span.name, span.status) for span in trace.spans}
+    assert spans == {("outer", "unset"), ("inner", "unset"), ("inner", "error")}
+    assert all(span.parent_span_id == outer.span_id for span in trace.spans[1:])
+    assert all(span.end_ns is not None for span in trace.spans)
+
+
+def test_no_spans_without_trace():
+    """
+    PRUEBA UNITARIA: Verifica que sin traza activa no se registra nada.
+    """
+    with start_span("ignored") as span:
+        assert span is None
+    assert traced()(lambda: 42)() == 42
+
+
+def test_tail_sampler_keeps_slow_errored_and_upstream_sampled():
+    """
+    PRUEBA UNITARIA: Verifica que el muestreo de cola conserva las trazas
+    lentas o con error, y las muestreadas aguas arriba solo si se confía en
+    el llamante; descarta el resto.
+    """
+    sampler = TailSampler(slow_threshold_ms=100, sample_rate=0.0)
+
+    def record(duration_ms, status="unset", remote_sampled=False):
+        trace = TraceRecord(trace_id="a" * 32, remote_sampled=remote_sampled)
+        trace.spans.append(tracing.Span("root", trace.trace_id, "b" * 16, start_ns=0, end_ns=int(duration_ms * 1e6), status=status))
+        return trace
+
+    assert not sampler.should_keep(record(5))
+    assert sampler.should_keep(record(150))
+    assert sampler.should_keep(record(5, status="error"))
+    assert not sampler.should_keep(record(5, remote_sampled=True))
+    assert TailSampler(slow_threshold_ms=100, sample_rate=0.0, trust_upstream=True).should_keep(record(5, remote_sampled=True))
+    assert TailSampler(slow_threshold_ms=100, sample_rate=1.0).should_keep(record(5))
+
+
+def test_redis_commands_and_pipelines_are_traced(trace):
+    """
+    PRUEBA UNITARIA: Verifica que cada comando Redis y cada pipeline generan
+    un span de cliente.
+    """
+    client = TracedRedis(connection_pool=fakeredis.FakeRedis(decode_responses=True).connection_pool)
+    client.set("key", "value")
+    pipe = client.pipeline()
+    pipe.get("key")
+    pipe.delete("key")
+    assert pipe.execute() == ["value", 1]
+
+    assert [span.name for span in trace.spans] == ["redis SET", "redis PIPELINE"]
+    assert trace.spans[1].attributes["db.redis.command_count"] == 2
+
+
+def test_file_exporter_writes_json_lines(tmp_path, trace):
+    """
+    PRUEBA UNITARIA: Verifica que el exportador a fichero escribe un span
+    por línea en JSON.
+    """
+    with start_span("exported", attributes={"layer": "test"}):
+        pass
+    path = tmp_path / "traces" / "spans.jsonl"
+    exporter = FileSpanExporter(str(path))
+    exporter.export(trace.spans)
+    exporter.flush()
+
+    [line] = path.read_text().splitlines()
+    data = json.loads(line)
+    assert data["name"] == "exported"
+    assert data["trace_id"] == trace.trace_id
+    assert data["attributes"] == {"layer": "test"}
+
+
+def test_file_exporter_drops_traces_when_the_queue_is_full(tmp_path, trace, monkeypatch):
+    """
+    PRUEBA UNITARIA: Verifica que con la cola del escritor llena la traza se
+    descarta y se cuenta, sin bloquear al llamante.
+    """
+    with start_span("dropped"):
+        pass
+    exporter = FileSpanExporter(str(tmp_path / "spans.jsonl"), max_queue=1)
+    # Sin hilo escritor la cola no se vacía
+    monkeypatch.setattr(tracing.threading.Thread, "start", lambda self: None)
+    exporter.export(trace.spans)
+    exporter.export(trace.spans)
+
+    assert exporter.dropped == 1
+
+
+def test_memory_exporter_is_bounded_and_not_the_default(trace):
+    """
+    PRUEBA UNITARIA: Verifica que el exportador en memoria solo conserva los
+    últimos spans y que, por defecto, las trazas se descartan.
+    """
+    for name in ["first", "second", "third"]:
+        with start_span(name):
+            pass
+    exporter = InMemorySpanExporter(max_spans=2)
+    exporter.export(trace.spans)
+
+    assert [span.name for span in exporter.trace(trace.trace_id)] == ["second", "third"]
+    assert isinstance(Tracer().exporter, NoopSpanExporter)